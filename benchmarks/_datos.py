@@ -0,0 +1,35 @@
+import os  # Rutas
+import random  # Datos sintéticos reproducibles
+import sys  # Para poder importar "modulos" al correr el script directamente
+from typing import List, Dict, Any  # Tipos para claridad
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Raíz del proyecto en el path
+
+from modulos.validaciones import CATEGORIAS  # Categorías válidas
+
+_PALABRAS = ("puerta", "manzana", "tornillo", "jabón", "cloro", "arroz", "martillo", "clavo", "pera", "detergente", "terciado", "mdf")  # Vocabulario para nombres
+
+
+def generar_productos(n: int, semilla: int = 42) -> List[Dict[str, Any]]:  # Catálogo sintético de n productos válidos
+    rnd = random.Random(semilla)  # Generador con semilla (mismos datos en cada corrida)
+    return [  # Lista de dicts con la misma forma que productos.json
+        {
+            "sku": f"SKU{i:07d}",  # SKU único
+            "nombre": f"{rnd.choice(_PALABRAS)} {rnd.choice(_PALABRAS)} {i}",  # Nombre de 3 palabras
+            "categoria": rnd.choice(CATEGORIAS),  # Categoría válida
+            "precio": float(rnd.randint(100, 100000)),  # Precio
+            "stock": rnd.randint(0, 500),  # Stock
+            "activo": rnd.random() < 0.9,  # 90% activos
+            "creado_en": f"2026-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} 10:00:00",  # Fecha de creación
+        }
+        for i in range(n)
+    ]
+
+
+def medir(nombre: str, funcion, *args, **kwargs):  # Ejecuta una función, imprime el tiempo y retorna su resultado
+    import time  # Reloj de alta resolución
+    t0 = time.perf_counter()  # Inicio
+    resultado = funcion(*args, **kwargs)  # Ejecutamos
+    seg = time.perf_counter() - t0  # Duración
+    print(f"{nombre:<40} {seg * 1000:10.1f} ms")  # Mostramos en ms
+    return resultado  # Resultado de la función
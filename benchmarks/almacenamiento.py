@@ -0,0 +1,43 @@
+import argparse  # Parámetros de línea de comandos
+import os  # Rutas y tamaños
+import tempfile  # Carpeta temporal para no tocar datos reales
+
+from _datos import generar_productos, medir  # Datos sintéticos y cronómetro
+
+from modulos import persistencia_json, persistencia_sqlite, reportes  # Almacenamientos y reportes en memoria
+from modulos.gestion_datos import buscar  # Búsqueda en memoria
+from modulos.funciones_utiles import valor_inventario  # Valorización en memoria
+
+
+def main():  # Compara JSON (todo en memoria) contra SQLite (consultas en SQL)
+    ap = argparse.ArgumentParser(description="Benchmark JSON vs SQLite")  # Parser
+    ap.add_argument("-n", type=int, default=200000, help="cantidad de productos")  # Tamaño del catálogo
+    args = ap.parse_args()  # Leemos argumentos
+
+    productos = generar_productos(args.n)  # Catálogo sintético
+    carpeta = tempfile.mkdtemp(prefix="sgp_bench_")  # Carpeta temporal
+    ruta_json = os.path.join(carpeta, "productos.json")  # Archivo JSON
+    ruta_db = os.path.join(carpeta, "productos.db")  # Archivo SQLite
+    print(f"{args.n} productos en {carpeta}\n")  # Encabezado
+
+    print("--- JSON ---")  # Sección JSON
+    medir("guardar_productos", persistencia_json.guardar_productos, productos, ruta_json)  # Escritura completa
+    cargados = medir("cargar_productos", persistencia_json.cargar_productos, ruta_json)  # Lectura completa
+    medir("buscar('torn')", buscar, cargados, "torn")  # Búsqueda lineal
+    medir("productos_bajo_stock(5)", reportes.productos_bajo_stock, cargados, 5)  # Filtro lineal
+    medir("conteo_por_categoria", reportes.conteo_por_categoria, cargados)  # Conteo lineal
+    medir("valor_inventario", valor_inventario, cargados)  # Suma lineal
+    print(f"{'tamaño archivo':<40} {os.path.getsize(ruta_json) / 1e6:10.1f} MB\n")  # Tamaño en disco
+
+    print("--- SQLite ---")  # Sección SQLite
+    medir("migrar_desde_json", persistencia_sqlite.migrar_desde_json, ruta_json, ruta_db)  # Migración única
+    medir("cargar_productos", persistencia_sqlite.cargar_productos, ruta_db)  # Lectura completa
+    medir("buscar('torn')", persistencia_sqlite.buscar, ruta_db, "torn")  # Búsqueda en SQL
+    medir("productos_bajo_stock(5)", persistencia_sqlite.productos_bajo_stock, ruta_db, 5)  # Rango con índice
+    medir("conteo_por_categoria", persistencia_sqlite.conteo_por_categoria, ruta_db)  # GROUP BY
+    medir("valor_inventario", persistencia_sqlite.valor_inventario, ruta_db)  # SUM en SQL
+    print(f"{'tamaño archivo':<40} {os.path.getsize(ruta_db) / 1e6:10.1f} MB")  # Tamaño en disco
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente
+    main()  # Ejecutamos
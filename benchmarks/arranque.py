@@ -0,0 +1,62 @@
+import argparse  # Parámetros de línea de comandos
+import json  # Tiempos que imprime main.py
+import os  # Rutas y variables de entorno
+import statistics  # Mediana de varias corridas
+import subprocess  # Cada medición en un proceso nuevo (arranque en frío de Python)
+import sys  # Intérprete actual
+import tempfile  # Carpeta temporal para no tocar datos reales
+import time  # Cronómetro externo
+
+from _datos import generar_productos  # Datos sintéticos
+
+from modulos.persistencia_json import guardar_productos  # Para escribir el catálogo de prueba
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Carpeta del proyecto
+_IMPORTAR = (  # Script que mide solo el import de la interfaz (no necesita pantalla)
+    "import sys, time; t = time.perf_counter(); import modulos.ui_tkinter; "
+    "print((time.perf_counter() - t) * 1000, 'openpyxl' in sys.modules, 'reportlab' in sys.modules)"
+)
+
+
+def medir_imports():  # (ms del import de modulos.ui_tkinter, ¿cargó openpyxl?, ¿cargó reportlab?)
+    salida = subprocess.run([sys.executable, "-c", _IMPORTAR], cwd=RAIZ, capture_output=True, text=True, check=True).stdout.split()  # Proceso nuevo
+    return float(salida[0]), salida[1] == "True", salida[2] == "True"  # Valores
+
+
+def medir_ventana(carpeta):  # Corre main.py con SGP_MEDIR_ARRANQUE=1 (necesita pantalla); retorna sus tiempos + el total del proceso
+    entorno = dict(os.environ, SGP_MEDIR_ARRANQUE="1")  # Activa la medición en main.py
+    t0 = time.perf_counter()  # Incluye el arranque del intérprete
+    r = subprocess.run([sys.executable, os.path.join(RAIZ, "main.py")], cwd=carpeta, env=entorno, capture_output=True, text=True)  # La app se cierra sola al cargar
+    total = (time.perf_counter() - t0) * 1000  # ms del proceso completo
+    if r.returncode != 0 or not r.stdout.strip():  # Sin pantalla, Tk no puede abrir la ventana
+        raise RuntimeError((r.stderr.strip().splitlines() or ["sin salida"])[-1])  # Último renglón del error
+    tiempos = json.loads(r.stdout.strip().splitlines()[-1])  # Línea JSON de main.py
+    tiempos["proceso_ms"] = round(total, 1)  # Total visto desde afuera
+    return tiempos  # Tiempos de la corrida
+
+
+def main():  # Tiempo de arranque: imports de la interfaz, primera pintura y carga del catálogo
+    ap = argparse.ArgumentParser(description="Benchmark de arranque de la interfaz")  # Parser
+    ap.add_argument("-n", type=int, default=100000, help="productos en el catálogo de prueba")  # Tamaño
+    ap.add_argument("--repeticiones", type=int, default=5, help="corridas (se informa la mediana)")  # Repeticiones
+    args = ap.parse_args()  # Leemos argumentos
+
+    imports = [medir_imports() for _ in range(args.repeticiones)]  # Solo imports (funciona sin pantalla)
+    print(f"import modulos.ui_tkinter     {statistics.median(i[0] for i in imports):8.1f} ms"
+          f"  (openpyxl cargado: {imports[0][1]}, reportlab cargado: {imports[0][2]})")  # Mediana
+
+    carpeta = tempfile.mkdtemp(prefix="sgp_bench_")  # Carpeta de trabajo de la app
+    os.makedirs(os.path.join(carpeta, "data"))  # La app usa data/productos.json relativo a la carpeta actual
+    guardar_productos(generar_productos(args.n), os.path.join(carpeta, "data", "productos.json"))  # Catálogo de prueba
+    try:  # La ventana necesita pantalla
+        corridas = [medir_ventana(carpeta) for _ in range(args.repeticiones)]  # Arranques completos
+    except RuntimeError as e:  # Sin pantalla (servidor, CI)
+        print(f"ventana: no se pudo medir ({e})")  # Aviso
+        return  # Solo quedó la medición de imports
+    for clave in ("imports_ms", "primera_pintura_ms", "catalogo_ms", "proceso_ms"):  # Cada tiempo
+        print(f"{clave:<30}{statistics.median(c[clave] for c in corridas):8.1f} ms")  # Mediana
+    print(f"({corridas[0]['productos']} productos, mediana de {args.repeticiones} corridas)")  # Contexto
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente
+    main()  # Ejecutamos
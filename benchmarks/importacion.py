@@ -0,0 +1,74 @@
+import argparse  # Parámetros de línea de comandos
+import os  # Rutas
+import tempfile  # Carpeta temporal para no tocar datos reales
+import tracemalloc  # Pico de memoria de Python durante cada importación
+
+from _datos import generar_productos, medir  # Datos sintéticos y cronómetro
+
+from openpyxl import load_workbook  # Lectura completa (como antes)
+from modulos.exportaciones import exportar_excel  # Para generar el Excel de prueba
+from modulos.gestion_datos import CatalogoProductos, actualizar_producto  # Catálogo destino
+from modulos.importacion import importar_excel_en_catalogo  # Flujo en streaming por lotes
+from modulos.datos_basicos import to_bool_seguro  # Conversión de "activo"
+from modulos.validaciones import validar_producto  # Validación fila a fila (como antes)
+
+
+def importacion_anterior(ruta, catalogo):  # Referencia: libro completo en memoria + lista de dicts + validación/alta fila a fila
+    ws = load_workbook(ruta).active  # Carga todo el libro
+    headers = [str(c.value).strip().lower() if c.value else "" for c in ws[1]]  # Encabezados
+    registros = [dict(zip(headers, row)) for row in ws.iter_rows(min_row=2, values_only=True)]  # Todas las filas como dicts
+    skus = set(catalogo.skus)  # SKUs actuales
+    razones = []  # Motivos de rechazo
+    for fila_excel, r in enumerate(registros, start=2):  # Fila a fila
+        r = {c: "" if r.get(c) is None else str(r.get(c)).strip() for c in ("sku", "nombre", "categoria", "precio", "stock")} | {"activo": to_bool_seguro(r.get("activo", True))}  # Texto limpio por celda
+        existe = r["sku"] in skus  # Ya existe
+        ok, producto, errores = validar_producto(  # Validación
+            sku=r["sku"], nombre=r["nombre"], categoria=r["categoria"], precio=r["precio"], stock=r["stock"],
+            activo=r["activo"], skus_existentes=skus, modo="editar" if existe else "crear", sku_original=r["sku"] if existe else None
+        )
+        if not ok:  # Inválido
+            razones.append(f"Fila {fila_excel}: " + "; ".join(errores))  # Motivo
+            continue  # Sigue
+        if existe:  # Sobrescribir
+            actualizar_producto(catalogo, r["sku"], producto)  # Actualiza
+        else:  # Nuevo
+            catalogo.agregar(producto)  # Agrega
+        skus.add(r["sku"])  # Ya existe
+    return len(razones)  # Rechazados
+
+
+def medir_memoria(nombre, funcion, *args, **kwargs):  # Pico de memoria (tracemalloc hace todo más lento: se mide aparte del tiempo)
+    tracemalloc.start()  # Empezamos a contar
+    resultado = funcion(*args, **kwargs)  # Ejecutamos
+    pico = tracemalloc.get_traced_memory()[1]  # Pico en bytes
+    tracemalloc.stop()  # Dejamos de contar
+    print(f"{nombre:<40} {pico / 1e6:10.1f} MB")  # Mostramos
+    return resultado  # Resultado de la función
+
+
+def main():  # Compara la importación anterior con el flujo en streaming por lotes
+    ap = argparse.ArgumentParser(description="Benchmark de importación Excel")  # Parser
+    ap.add_argument("-n", type=int, default=200000, help="cantidad de filas")  # Tamaño del Excel
+    ap.add_argument("--memoria", action="store_true", help="medir también el pico de memoria (corrida extra)")  # Opcional
+    args = ap.parse_args()  # Leemos argumentos
+
+    productos = generar_productos(args.n)  # Filas sintéticas
+    for p in productos[::100]:  # 1% de filas inválidas (para que haya informe de errores)
+        p["precio"] = "abc"  # Precio no numérico
+    carpeta = tempfile.mkdtemp(prefix="sgp_bench_")  # Carpeta temporal
+    ruta = os.path.join(carpeta, "productos.xlsx")  # Archivo Excel
+    print(f"{args.n} filas en {carpeta}\n")  # Encabezado
+    medir("generar Excel", exportar_excel, productos, ruta)  # Archivo de prueba
+    del productos  # No contamos esta lista en la memoria medida
+
+    rechazados = medir("anterior (libro completo, fila a fila)", importacion_anterior, ruta, CatalogoProductos())  # Referencia
+    resumen = medir("streaming + lotes", importar_excel_en_catalogo, ruta, CatalogoProductos(), True)  # Nuevo flujo
+    if args.memoria:  # Pico de memoria (corrida aparte)
+        print()  # Separador
+        medir_memoria("memoria anterior", importacion_anterior, ruta, CatalogoProductos())  # Referencia
+        medir_memoria("memoria streaming + lotes", importar_excel_en_catalogo, ruta, CatalogoProductos(), True)  # Nuevo flujo
+    print(f"\nrechazados: anterior={rechazados} streaming={resumen['rechazados']} (informe: {resumen['informe']})")  # Mismo resultado
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente
+    main()  # Ejecutamos
@@ -0,0 +1,35 @@
+import argparse  # Parámetros de línea de comandos
+import random  # Cambios al azar (reproducibles)
+from datetime import datetime  # "Hoy" fijo para la consulta de fechas
+
+from _datos import generar_productos, medir  # Datos sintéticos y cronómetro
+
+from modulos.gestion_datos import CatalogoProductos  # Catálogo indexado
+from modulos.indices_ordenados import hace_dias  # Límite "últimos N días"
+
+
+def main():  # Ordenar y consultar por rango: sort/recorrido completo vs índices ordenados
+    ap = argparse.ArgumentParser(description="Benchmark de índices ordenados")  # Parser
+    ap.add_argument("-n", type=int, default=200000, help="productos en el catálogo")  # Tamaño
+    args = ap.parse_args()  # Leemos argumentos
+
+    lista = generar_productos(args.n)  # Lista de dicts
+    catalogo = CatalogoProductos(lista)  # Catálogo
+    desde = hace_dias(7, ahora=datetime(2026, 12, 28))  # Fechas sintéticas: todo 2026
+    print(f"{args.n} productos\n")  # Encabezado
+
+    medir("crear índices precio/stock/creado_en", lambda: [catalogo.indice_ordenado(c) for c in ("precio", "stock", "creado_en")])  # Una vez
+    medir("ordenar por precio desc, sorted()", sorted, lista, key=lambda p: p["precio"], reverse=True)  # Referencia (cada clic)
+    medir("ordenar por precio desc, índice", catalogo.indice_ordenado("precio").productos, True)  # Solo recorre
+    medir("precio entre 1000 y 2000, recorrido", lambda: [p for p in lista if 1000 <= p["precio"] <= 2000])  # Referencia
+    medir("precio entre 1000 y 2000, índice", catalogo.indice_ordenado("precio").rango, 1000, 2000)  # Búsqueda binaria
+    medir("creados últimos 7 días, recorrido", lambda: [p for p in lista if p["creado_en"] >= desde])  # Referencia
+    medir("creados últimos 7 días, índice", catalogo.indice_ordenado("creado_en").rango, desde)  # Búsqueda binaria
+
+    rnd = random.Random(1)  # Cambios reproducibles
+    cambios = [(p["sku"], dict(p, stock=rnd.randint(0, 500), precio=float(rnd.randint(100, 100000)))) for p in rnd.sample(lista, min(10000, len(lista)))]  # Hasta 10.000 cambios (menos si el catálogo es chico)
+    medir(f"{len(cambios)} cambios (3 índices al día)", lambda: [catalogo.actualizar(s, p) for s, p in cambios])  # Costo de mantenerlos
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente
+    main()  # Ejecutamos
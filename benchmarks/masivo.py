@@ -0,0 +1,47 @@
+import argparse  # Parámetros de línea de comandos
+import gc  # Limpieza entre mediciones
+
+from _datos import generar_productos, medir  # Datos sintéticos y cronómetro
+
+from modulos.gestion_datos import CatalogoProductos, ajustar_precios, eliminar_productos  # Catálogo y cambios masivos
+from modulos.funciones_utiles import ValorizacionInventario  # Observador de la valorización (igual que la interfaz)
+
+
+def catalogo_completo(n):  # Catálogo con todos los observadores que tiene la interfaz (búsqueda, índices, agregados, valorización)
+    catalogo = CatalogoProductos(generar_productos(n))  # Catálogo
+    catalogo.suscribir(ValorizacionInventario(catalogo))  # Valor de inventario incremental
+    catalogo.buscar("zz")  # Crea el índice de búsqueda
+    catalogo.agregados  # Crea agregados (y el índice por stock)
+    for campo in ("precio", "creado_en"):  # Resto de índices ordenados
+        catalogo.indice_ordenado(campo)  # Se crea y se suscribe
+    return catalogo  # Listo
+
+
+def uno_por_uno(catalogo, skus):  # Referencia: +10% de precio con actualizar() por producto
+    for sku in skus:  # Cada producto
+        p = dict(catalogo.obtener(sku))  # Copia
+        p["precio"] = round(p["precio"] * 1.1, 2)  # +10%
+        catalogo.actualizar(sku, p)  # Un aviso por producto
+
+
+def main():  # Cambios a muchas filas: uno por uno vs en lote (un solo aviso a los observadores)
+    ap = argparse.ArgumentParser(description="Benchmark de cambios masivos")  # Parser
+    ap.add_argument("-n", type=int, default=200000, help="productos en el catálogo")  # Tamaño
+    ap.add_argument("-k", type=int, default=100000, help="productos seleccionados")  # Selección
+    args = ap.parse_args()  # Leemos argumentos
+    print(f"{args.n} productos, {args.k} seleccionados\n")  # Encabezado
+
+    catalogo = catalogo_completo(args.n)  # Primer catálogo
+    skus = [p["sku"] for p in catalogo.como_lista()[::2]][:args.k]  # Mitad del catálogo, salteado
+    medir("precio +10%, uno por uno", uno_por_uno, catalogo, skus)  # Referencia
+    medir("eliminar, uno por uno", lambda: [catalogo.eliminar(s) for s in skus])  # Referencia
+
+    del catalogo  # Liberamos el primero antes de crear el segundo (mismo tamaño de memoria en ambas mediciones)
+    gc.collect()  # Sin basura pendiente del primero
+    catalogo = catalogo_completo(args.n)  # Catálogo nuevo (mismos datos)
+    medir("precio +10%, ajustar_precios", ajustar_precios, catalogo, skus, 10)  # En lote
+    medir("eliminar, eliminar_productos", eliminar_productos, catalogo, skus)  # En lote
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente
+    main()  # Ejecutamos
@@ -0,0 +1,38 @@
+import argparse  # Parámetros de línea de comandos
+import gc  # Limpieza entre mediciones
+import time  # Tiempo de construcción
+import tracemalloc  # Memoria que queda ocupada por cada estructura
+
+from _datos import generar_productos  # Datos sintéticos
+
+from modulos.modelo_compacto import Producto, ColumnasProductos  # Representaciones compactas
+
+
+def medir_estructura(nombre, construir, n):  # Construye una estructura desde cero y mide la memoria que queda en uso
+    gc.collect()  # Partimos limpios
+    tracemalloc.start()  # Empezamos a contar (incluye los textos creados por generar_productos que sigan vivos)
+    t0 = time.perf_counter()  # Inicio
+    estructura = construir(generar_productos(n))  # La lista de dicts de origen se libera al terminar (salvo en el caso "dicts")
+    seg = time.perf_counter() - t0  # Duración
+    gc.collect()  # Quitamos basura pendiente
+    actual = tracemalloc.get_traced_memory()[0]  # Bytes en uso
+    tracemalloc.stop()  # Dejamos de contar
+    print(f"{nombre:<34} {actual / 1e6:9.1f} MB {actual / n:8.0f} B/producto {seg:7.1f} s")  # Resultado
+    del estructura  # Liberamos
+    return actual  # Bytes
+
+
+def main():  # Memoria de 1M productos en cada representación
+    ap = argparse.ArgumentParser(description="Benchmark de memoria del modelo de producto")  # Parser
+    ap.add_argument("-n", type=int, default=1000000, help="cantidad de productos")  # Tamaño
+    args = ap.parse_args()  # Leemos argumentos
+
+    print(f"{args.n} productos\n")  # Encabezado
+    base = medir_estructura("lista de dicts (actual)", lambda ps: ps, args.n)  # Referencia
+    slots = medir_estructura("lista de Producto (__slots__)", lambda ps: [Producto.desde_dict(p) for p in ps], args.n)  # Registros
+    columnas = medir_estructura("ColumnasProductos", ColumnasProductos, args.n)  # Columnas
+    print(f"\n__slots__: {base / slots:.1f}x menos memoria | columnas: {base / columnas:.1f}x menos memoria")  # Resumen
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente
+    main()  # Ejecutamos
@@ -0,0 +1,51 @@
+import argparse  # Parámetros de línea de comandos
+import os  # Rutas y núcleos
+import tempfile  # Carpeta temporal para no tocar datos reales
+import time  # Cronómetro (aquí interesa filas/segundo, no solo ms)
+
+from _datos import generar_productos  # Datos sintéticos
+
+from reportlab.lib import colors  # Estilo de la tabla (motor anterior)
+from reportlab.lib.pagesizes import letter  # Tamaño carta
+from reportlab.lib.styles import getSampleStyleSheet  # Estilo del título
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer  # Motor anterior (una sola tabla)
+from modulos.exportaciones import CAMPOS, exportar_pdf  # Motor por páginas
+
+
+def pdf_anterior(registros, ruta):  # Referencia: todo el catálogo en una sola Table que reportlab parte en páginas
+    data = [[c.upper() for c in CAMPOS]] + [[str(r.get(c, "")) for c in CAMPOS] for r in registros]  # Todas las filas
+    tabla = Table(data, repeatRows=1)  # Una sola tabla
+    tabla.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.grey), ("FONTSIZE", (0, 0), (-1, -1), 8)]))  # Estilo
+    SimpleDocTemplate(ruta, pagesize=letter).build([Paragraph("Reporte de Productos", getSampleStyleSheet()["Title"]), Spacer(1, 12), tabla])  # Construye
+
+
+def filas_por_segundo(nombre, n, funcion, *args, **kwargs):  # Ejecuta, imprime tiempo y filas/segundo
+    t0 = time.perf_counter()  # Inicio
+    funcion(*args, **kwargs)  # Ejecutamos
+    seg = time.perf_counter() - t0  # Duración
+    print(f"{nombre:<34} {n:>8} filas {seg:8.1f} s {n / seg:10,.0f} filas/s")  # Resultado
+
+
+def main():  # Filas/segundo del motor de PDF a distintos tamaños
+    ap = argparse.ArgumentParser(description="Benchmark de exportación PDF")  # Parser
+    ap.add_argument("--tamanos", default="10000,100000,500000", help="cantidades de filas separadas por coma")  # Tamaños
+    ap.add_argument("--procesos", type=int, default=os.cpu_count() or 1, help="procesos del modo paralelo")  # Procesos
+    ap.add_argument("--anterior-hasta", type=int, default=10000, help="tamaño máximo para medir el motor anterior (es superlineal)")  # Límite
+    args = ap.parse_args()  # Leemos argumentos
+
+    carpeta = tempfile.mkdtemp(prefix="sgp_bench_")  # Carpeta temporal
+    print(f"PDFs en {carpeta} ({args.procesos} procesos)\n")  # Encabezado
+    for n in (int(x) for x in args.tamanos.split(",")):  # Cada tamaño
+        productos = generar_productos(n)  # Filas sintéticas
+        ruta = os.path.join(carpeta, f"productos_{n}.pdf")  # Archivo de salida
+        if n <= args.anterior_hasta:  # El motor anterior solo a tamaños chicos
+            filas_por_segundo("anterior (una sola tabla)", n, pdf_anterior, productos, ruta)  # Referencia
+        filas_por_segundo("por páginas", n, exportar_pdf, productos, ruta)  # Secuencial
+        filas_por_segundo("por páginas, agrupado", n, exportar_pdf, productos, ruta, agrupar_por_categoria=True)  # Agrupado
+        if args.procesos > 1:  # Paralelo solo si hay más de un proceso
+            filas_por_segundo(f"por páginas, {args.procesos} procesos", n, exportar_pdf, productos, ruta, procesos=args.procesos)  # Paralelo
+        print()  # Separador
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente (y necesario para los procesos hijos)
+    main()  # Ejecutamos
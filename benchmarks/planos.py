@@ -0,0 +1,55 @@
+import argparse  # Parámetros de línea de comandos
+import os  # Rutas y tamaños
+import tempfile  # Carpeta temporal para no tocar datos reales
+import time  # Cronómetro
+
+from _datos import generar_productos  # Datos sintéticos
+
+from modulos.exportaciones import exportar_excel, exportar_csv, exportar_ndjson  # Exportadores
+from modulos.importacion import lotes_validados, InformeErrores  # Lectura + validación por lotes (igual que la importación real)
+
+FORMATOS = (  # (nombre, extensión, exportador)
+    ("Excel", ".xlsx", exportar_excel),
+    ("CSV", ".csv", exportar_csv),
+    ("CSV gzip", ".csv.gz", exportar_csv),
+    ("NDJSON", ".ndjson", exportar_ndjson),
+    ("NDJSON gzip", ".ndjson.gz", exportar_ndjson),
+)
+
+
+def importar(ruta, carpeta):  # Lee y valida todo el archivo; retorna filas válidas
+    validas = 0  # Contador
+    with InformeErrores(os.path.join(carpeta, "errores.csv")) as informe:  # Rechazos (no debería haber)
+        for lote in lotes_validados(ruta, set(), False, informe):  # Lote a lote
+            validas += len(lote)  # Contamos
+    return validas  # Filas válidas
+
+
+def mostrar(nombre, filas, segundos, ruta):  # Una línea: tiempo, filas/segundo y tamaño del archivo
+    print(f"{nombre:<28} {segundos * 1000:10.1f} ms {filas / segundos:12.0f} filas/s {os.path.getsize(ruta) / 1e6:8.1f} MB")  # Resultado
+
+
+def main():  # Exportar e importar el mismo catálogo en Excel, CSV y NDJSON (con y sin gzip)
+    ap = argparse.ArgumentParser(description="Benchmark de archivos planos vs Excel")  # Parser
+    ap.add_argument("-n", type=int, default=200000, help="cantidad de filas")  # Tamaño
+    args = ap.parse_args()  # Leemos argumentos
+
+    productos = generar_productos(args.n)  # Filas sintéticas
+    carpeta = tempfile.mkdtemp(prefix="sgp_bench_")  # Carpeta temporal
+    print(f"{args.n} filas en {carpeta}\n")  # Encabezado
+
+    for nombre, extension, exportador in FORMATOS:  # Exportación
+        ruta = os.path.join(carpeta, "productos" + extension)  # Archivo
+        t0 = time.perf_counter()  # Inicio
+        exportador(iter(productos), ruta)  # Desde un generador (como desde un catálogo grande)
+        mostrar(f"exportar {nombre}", args.n, time.perf_counter() - t0, ruta)  # Resultado
+    print()  # Separador
+    for nombre, extension, _ in FORMATOS:  # Importación (lectura + validación)
+        ruta = os.path.join(carpeta, "productos" + extension)  # Archivo
+        t0 = time.perf_counter()  # Inicio
+        validas = importar(ruta, carpeta)  # Flujo completo
+        mostrar(f"importar {nombre}", validas, time.perf_counter() - t0, ruta)  # Resultado
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente
+    main()  # Ejecutamos
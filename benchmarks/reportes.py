@@ -0,0 +1,40 @@
+import argparse  # Parámetros de línea de comandos
+import random  # Cambios al azar (reproducibles)
+
+from _datos import generar_productos, medir  # Datos sintéticos y cronómetro
+
+from modulos.gestion_datos import CatalogoProductos  # Catálogo indexado
+from modulos.reportes import productos_bajo_stock, conteo_por_categoria  # Reportes (lista: recorrido; catálogo: agregados)
+
+
+def repetir(veces, funcion, *args):  # Llama varias veces (simula un tablero que consulta seguido)
+    for _ in range(veces):  # Repeticiones
+        funcion(*args)  # Consulta
+
+
+def main():  # Reportes por recorrido completo vs agregados mantenidos al día
+    ap = argparse.ArgumentParser(description="Benchmark de reportes")  # Parser
+    ap.add_argument("-n", type=int, default=200000, help="productos en el catálogo")  # Tamaño
+    ap.add_argument("--consultas", type=int, default=100, help="consultas de cada reporte")  # Repeticiones
+    args = ap.parse_args()  # Leemos argumentos
+
+    lista = generar_productos(args.n)  # Lista de dicts (recorrido completo)
+    for p in lista[::50]:  # 2% con stock muy bajo (el caso de reposición)
+        p["stock"] = p["stock"] % 3  # 0, 1 o 2
+    catalogo = CatalogoProductos(lista)  # Catálogo con agregados
+    print(f"{args.n} productos, {args.consultas} consultas por reporte\n")  # Encabezado
+
+    medir("crear agregados (una vez)", lambda: catalogo.agregados)  # Primer reporte: un recorrido + un sort
+    medir("bajo stock (<= 2), recorrido", repetir, args.consultas, productos_bajo_stock, lista, 2)  # Referencia
+    medir("bajo stock (<= 2), agregados", repetir, args.consultas, productos_bajo_stock, catalogo, 2)  # Índice por stock
+    medir("top 20 menor stock, agregados", repetir, args.consultas, catalogo.agregados.menor_stock, 20)  # Primeras k
+    medir("conteo por categoría, recorrido", repetir, args.consultas, conteo_por_categoria, lista)  # Referencia
+    medir("conteo por categoría, agregados", repetir, args.consultas, conteo_por_categoria, catalogo)  # Conteo al día
+
+    rnd = random.Random(1)  # Cambios reproducibles
+    cambios = [(p["sku"], dict(p, stock=rnd.randint(0, 500))) for p in rnd.sample(lista, min(10000, len(lista)))]  # Hasta 10.000 cambios de stock (menos si el catálogo es chico)
+    medir(f"{len(cambios)} cambios de stock (con agregados)", lambda: [catalogo.actualizar(s, p) for s, p in cambios])  # Costo de mantenerlos
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente
+    main()  # Ejecutamos
@@ -0,0 +1,135 @@
+import argparse  # Parámetros de línea de comandos
+import asyncio  # Clientes concurrentes sin hilos
+import os  # Rutas
+import random  # SKUs al azar (reproducibles)
+import socket  # Puerto libre y espera del arranque
+import subprocess  # El servidor corre en otro proceso (como en producción)
+import sys  # Intérprete actual
+import tempfile  # Carpeta temporal para no tocar datos reales
+import time  # Cronómetro
+
+from _datos import generar_productos  # Datos sintéticos
+
+from modulos.persistencia_json import guardar_productos  # Para escribir el catálogo de prueba
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Carpeta del proyecto
+
+
+async def leer_respuesta(reader):  # (estado, cabeceras, bytes del cuerpo) de una respuesta HTTP/1.1
+    cabecera = await reader.readuntil(b"\r\n\r\n")  # Hasta la línea en blanco
+    lineas = cabecera.decode("latin-1").split("\r\n")  # Líneas
+    estado = int(lineas[0].split(" ")[1])  # "HTTP/1.1 200 OK"
+    cabeceras = {n.strip().lower(): v.strip() for n, _, v in (l.partition(":") for l in lineas[1:] if ":" in l)}  # Nombre → valor
+    if estado == 304:  # Sin cuerpo
+        return estado, cabeceras, 0  # Listo
+    if cabeceras.get("transfer-encoding") == "chunked":  # Streaming
+        total = 0  # Bytes recibidos
+        while True:  # Trozo a trozo
+            largo = int((await reader.readline()).strip(), 16)  # Largo en hexadecimal
+            await reader.readexactly(largo + 2)  # Datos + \r\n
+            total += largo  # Acumulamos
+            if largo == 0:  # Último trozo
+                return estado, cabeceras, total  # Listo
+    largo = int(cabeceras.get("content-length", 0))  # Cuerpo de largo conocido
+    await reader.readexactly(largo)  # Lo leemos
+    return estado, cabeceras, largo  # Listo
+
+
+async def cliente(puerto, destinos, keep_alive, etags):  # Un cliente que hace sus pedidos en orden; retorna bytes recibidos
+    recibidos = 0  # Bytes de cuerpo
+    conexion = None  # (reader, writer)
+    for destino in destinos:  # Un pedido por destino
+        if conexion is None:  # Conexión nueva
+            conexion = await asyncio.open_connection("127.0.0.1", puerto)  # TCP
+        reader, writer = conexion  # Flujo
+        extra = f"If-None-Match: {etags[destino]}\r\n" if destino in etags else ""  # Revalidación
+        cierre = "" if keep_alive else "Connection: close\r\n"  # Sin keep-alive: una conexión por pedido
+        writer.write(f"GET {destino} HTTP/1.1\r\nHost: localhost\r\n{extra}{cierre}\r\n".encode())  # Pedido
+        _, _, largo = await leer_respuesta(reader)  # Respuesta
+        recibidos += largo  # Acumulamos
+        if not keep_alive:  # Cerramos
+            writer.close()  # Socket
+            await writer.wait_closed()  # Esperamos
+            conexion = None  # La próxima abre otra
+    if conexion is not None:  # Cierre final
+        conexion[1].close()  # Socket
+        await conexion[1].wait_closed()  # Esperamos
+    return recibidos  # Total
+
+
+async def escenario(nombre, puerto, destinos, conexiones, keep_alive=True, etags=None):  # Reparte los pedidos entre clientes concurrentes e imprime pedidos/seg
+    await cliente(puerto, list(dict.fromkeys(destinos))[:10], True, {})  # Calentamiento: índices que se crean en la primera consulta
+    partes = [destinos[i::conexiones] for i in range(conexiones)]  # Un tramo por cliente
+    t0 = time.perf_counter()  # Inicio
+    recibidos = sum(await asyncio.gather(*(cliente(puerto, p, keep_alive, etags or {}) for p in partes)))  # Todos a la vez
+    seg = time.perf_counter() - t0  # Duración
+    print(f"{nombre:<44} {len(destinos) / seg:10.0f} ped/s {recibidos / seg / 1e6:8.1f} MB/s")  # Resultado
+
+
+async def etags_de(puerto, destinos):  # ETag actual de cada destino (un pedido por destino distinto)
+    reader, writer = await asyncio.open_connection("127.0.0.1", puerto)  # Una conexión
+    etags = {}  # Destino → ETag
+    for destino in set(destinos):  # Distintos
+        writer.write(f"GET {destino} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())  # Pedido
+        _, cabeceras, _ = await leer_respuesta(reader)  # Respuesta
+        etags[destino] = cabeceras["etag"]  # Guardamos
+    writer.close()  # Cierre
+    await writer.wait_closed()  # Esperamos
+    return etags  # ETags
+
+
+async def medir(puerto, n, pedidos, conexiones):  # Todos los escenarios
+    rnd = random.Random(1)  # Reproducible
+    skus = [f"/productos/SKU{rnd.randrange(n):07d}" for _ in range(pedidos)]  # SKUs al azar
+    await escenario("SKU, keep-alive", puerto, skus, conexiones)  # Caso de la caja
+    await escenario("SKU, una conexión por pedido", puerto, skus[:pedidos // 4], conexiones, keep_alive=False)  # Referencia sin keep-alive
+    await escenario("SKU, If-None-Match (304)", puerto, skus, conexiones, etags=await etags_de(puerto, skus))  # Nada cambió
+    busquedas = [f"/productos?q={p}&por_pagina=50" for p in ("puerta", "arroz", "clavo", "mdf", "pera") for _ in range(pedidos // 5)]  # Búsquedas repetidas
+    await escenario("búsqueda, página de 50", puerto, busquedas, conexiones)  # Resultado guardado por versión
+    paginas = [f"/productos?pagina={1 + i % 200}&por_pagina=100" for i in range(pedidos)]  # Recorrido del catálogo por páginas
+    await escenario("catálogo por páginas de 100", puerto, paginas, conexiones)  # Etiquetadora sincronizando
+    await escenario("bajo stock (<= 5), página de 100", puerto, ["/reportes/bajo-stock?umbral=5"] * pedidos, conexiones)  # Reposición
+    await escenario("conteo y valor por categoría", puerto, ["/reportes/categorias"] * pedidos, conexiones)  # Tablero
+    await escenario("catálogo completo (streaming)", puerto, ["/productos?por_pagina=0"] * 4, 2)  # Pocas descargas grandes
+
+
+def puerto_libre():  # Puerto TCP libre en localhost
+    with socket.socket() as s:  # Socket temporal
+        s.bind(("127.0.0.1", 0))  # El sistema elige
+        return s.getsockname()[1]  # Puerto
+
+
+def esperar_puerto(puerto, proceso, espera=60.0):  # Espera a que el servidor acepte conexiones
+    limite = time.monotonic() + espera  # Hasta cuándo
+    while time.monotonic() < limite and proceso.poll() is None:  # Mientras el servidor siga vivo
+        try:  # ¿Ya escucha?
+            socket.create_connection(("127.0.0.1", puerto), timeout=0.5).close()  # Conexión de prueba
+            return  # Listo
+        except OSError:  # Todavía no
+            time.sleep(0.1)  # Reintentamos
+    raise RuntimeError("El servidor no arrancó.")  # Falló
+
+
+def main():  # Pedidos por segundo contra una instancia local de "cli.py servir"
+    ap = argparse.ArgumentParser(description="Prueba de carga del servidor HTTP")  # Parser
+    ap.add_argument("-n", type=int, default=100000, help="productos en el catálogo de prueba")  # Tamaño
+    ap.add_argument("--pedidos", type=int, default=5000, help="pedidos por escenario")  # Carga
+    ap.add_argument("--conexiones", type=int, default=20, help="clientes concurrentes")  # Concurrencia
+    args = ap.parse_args()  # Leemos argumentos
+
+    carpeta = tempfile.mkdtemp(prefix="sgp_bench_")  # Datos de prueba
+    ruta = os.path.join(carpeta, "productos.json")  # Archivo
+    guardar_productos(generar_productos(args.n), ruta)  # Catálogo de prueba
+    puerto = puerto_libre()  # Puerto
+    servidor = subprocess.Popen([sys.executable, os.path.join(RAIZ, "cli.py"), "servir", "--datos", ruta, "--puerto", str(puerto)], cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)  # Otro proceso
+    try:  # Siempre detenemos el servidor
+        esperar_puerto(puerto, servidor)  # Carga del catálogo
+        print(f"{args.n} productos, {args.pedidos} pedidos por escenario, {args.conexiones} conexiones\n")  # Encabezado
+        asyncio.run(medir(puerto, args.n, args.pedidos, args.conexiones))  # Escenarios
+    finally:  # Fin
+        servidor.terminate()  # Detenemos
+        servidor.wait()  # Esperamos
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente
+    main()  # Ejecutamos
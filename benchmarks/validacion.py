@@ -0,0 +1,54 @@
+import argparse  # Parámetros de línea de comandos
+
+from _datos import generar_productos, medir  # Datos sintéticos y cronómetro
+
+from modulos.validaciones import validar_producto, validar_lote  # Validación por fila y por lote
+
+
+def por_fila(filas, skus_existentes):  # Referencia: el bucle que usaba la importación (una llamada por fila, con textos)
+    skus = set(skus_existentes)  # Copia (se completa con los nuevos)
+    validos, errores = [], []  # Resultados
+    for i, r in enumerate(filas):  # Fila a fila
+        sku = str(r.get("sku", "")).strip()  # Lee SKU
+        existe = sku in skus  # Ya existe
+        ok, producto, e = validar_producto(  # Validación
+            sku=sku, nombre=str(r.get("nombre", "")).strip(), categoria=str(r.get("categoria", "")).strip(),
+            precio=str(r.get("precio", "")).strip(), stock=str(r.get("stock", "")).strip(), activo=bool(r.get("activo", True)),
+            skus_existentes=skus, modo="editar" if existe else "crear", sku_original=sku if existe else None,
+        )
+        if ok:  # Válido
+            validos.append((i, producto))  # Guardamos
+            skus.add(sku)  # Ya existe
+        else:  # Inválido
+            errores.append((i, e))  # Guardamos
+    return validos, errores  # Resultados
+
+
+def main():  # Compara validar_producto fila a fila con validar_lote
+    ap = argparse.ArgumentParser(description="Benchmark de validación")  # Parser
+    ap.add_argument("-n", type=int, default=100000, help="cantidad de filas")  # Tamaño
+    ap.add_argument("--lote", type=int, default=2000, help="filas por lote (como la importación)")  # Tamaño de lote
+    args = ap.parse_args()  # Leemos argumentos
+
+    filas = generar_productos(args.n)  # Filas sintéticas
+    for r in filas[::100]:  # 1% inválidas
+        r["precio"] = "abc"  # Precio no numérico
+    existentes = {r["sku"] for r in filas[::10]}  # 10% ya está en el catálogo
+    print(f"{args.n} filas\n")  # Encabezado
+
+    medir("validar_producto fila a fila", por_fila, filas, existentes)  # Referencia
+
+    def por_lotes():  # validar_lote en lotes (como importacion.preparar_lote)
+        vistos = {}  # Repetidos entre lotes
+        for i in range(0, len(filas), args.lote):  # Lote a lote
+            lote = filas[i:i + args.lote]  # Filas del lote
+            columnas = {c: [r.get(c) for r in lote] for c in ("sku", "nombre", "categoria", "precio", "stock", "activo")}  # A columnas
+            validar_lote(columnas, existentes, permitir_existentes=True, filas=range(i, i + len(lote)), vistos=vistos)  # Validamos
+
+    medir(f"validar_lote (lotes de {args.lote})", por_lotes)  # Por lotes (incluye pasar a columnas)
+    columnas = {c: [r.get(c) for r in filas] for c in ("sku", "nombre", "categoria", "precio", "stock", "activo")}  # Todo en columnas
+    medir("validar_lote (un solo lote)", validar_lote, columnas, existentes, True)  # Un solo lote
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente
+    main()  # Ejecutamos
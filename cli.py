@@ -0,0 +1,195 @@
+import argparse  # Línea de comandos
+import json  # Estadísticas legibles por máquina
+import multiprocessing  # freeze_support (ejecutable de PyInstaller)
+import os  # Rutas y núcleos
+import sys  # Salida y código de salida
+import time  # Cronómetro
+from concurrent.futures import ProcessPoolExecutor  # Un proceso por archivo
+from typing import List, Dict, Any, Callable, Tuple  # Tipos para claridad
+
+from modulos.persistencia_json import cargar_productos, cargar_con_version, guardar_productos, preparar_ruta_datos  # Carga y guardado (JSON o SQLite)
+from modulos.gestion_datos import CatalogoProductos  # Catálogo indexado
+from modulos.importacion import validar_en_disco, aplicar_lote, InformeErrores, ruta_informe, rechazos_carga, ruta_informe_carga  # Importación por lotes (y SKUs repetidos en los datos)
+from modulos.exportaciones import exportar_excel, exportar_pdf, exportar_csv, exportar_ndjson  # Exportación
+from modulos.modelo_compacto import ColumnasProductos  # Catálogo de solo lectura por columnas (reportes y exportaciones)
+
+RUTA_POR_DEFECTO = os.path.join("data", "productos.json")  # Misma ruta que usa la interfaz
+
+
+# ------------------------- TRABAJO POR ARCHIVO (corre en procesos hijos) -------------------------
+
+def _por_segundo(filas: int, segundos: float) -> float:  # Filas por segundo (redondeado)
+    return round(filas / segundos, 1) if segundos > 0 else 0.0  # Evita dividir por cero
+
+def _validar_archivo(ruta: str, skus: set, sobrescribir: bool) -> Tuple[Any, Dict[str, Any]]:  # Lee y valida un Excel, CSV o NDJSON (sin tocar el catálogo)
+    t0 = time.perf_counter()  # Inicio
+    with InformeErrores(ruta_informe(ruta)) as informe:  # Rechazos a un CSV junto al Excel
+        lotes = validar_en_disco(ruta, skus, sobrescribir, informe)  # Operaciones válidas a un temporal (el proceso padre las relee y aplica en orden)
+    segundos = time.perf_counter() - t0  # Duración
+    filas = lotes.cantidad + informe.cantidad  # Filas leídas (no vacías)
+    return lotes, {  # Lotes en disco + estadísticas
+        "archivo": ruta, "filas": filas, "rechazados": informe.cantidad,
+        "informe": informe.ruta if informe.cantidad else None,
+        "segundos": round(segundos, 3), "filas_por_segundo": _por_segundo(filas, segundos),
+    }
+
+EXTENSIONES = {"excel": ".xlsx", "pdf": ".pdf", "csv": ".csv", "ndjson": ".ndjson"}  # Formato → extensión del archivo de salida
+
+def _exportar_archivo(datos: str, formato: str, carpeta: str, agrupar: bool, procesos_pdf: int, comprimir: bool = False) -> Dict[str, Any]:  # Exporta un archivo de datos
+    t0 = time.perf_counter()  # Inicio
+    productos = ColumnasProductos(cargar_productos(datos))  # Por columnas: la lista de dicts se libera antes de exportar
+    extension = EXTENSIONES[formato] + (".gz" if comprimir and formato in ("csv", "ndjson") else "")  # .csv.gz / .ndjson.gz con --gzip
+    salida = os.path.join(carpeta, os.path.splitext(os.path.basename(datos))[0] + extension)  # Archivo de salida
+    if formato == "excel":  # Excel
+        exportar_excel(productos, salida)  # En streaming
+    elif formato == "csv":  # CSV plano
+        exportar_csv(productos, salida)  # Bloques grandes
+    elif formato == "ndjson":  # Un JSON por línea
+        exportar_ndjson(productos, salida)  # Bloques grandes
+    else:  # PDF
+        exportar_pdf(productos, salida, agrupar_por_categoria=agrupar, procesos=procesos_pdf)  # Por páginas
+    segundos = time.perf_counter() - t0  # Duración (incluye la carga)
+    return {"archivo": datos, "salida": salida, "filas": len(productos), "segundos": round(segundos, 3), "filas_por_segundo": _por_segundo(len(productos), segundos)}  # Estadísticas
+
+def _reporte_archivo(datos: str, tipo: str, umbral: int) -> Dict[str, Any]:  # Calcula un reporte sobre un archivo de datos
+    t0 = time.perf_counter()  # Inicio
+    productos = ColumnasProductos(cargar_productos(datos))  # Por columnas: los reportes recorren arrays, sin crear dicts
+    if tipo == "bajo-stock":  # Stock bajo
+        resultado: Any = productos.bajo_stock(umbral)  # SKUs con stock <= umbral
+    elif tipo == "categorias":  # Conteo por categoría
+        resultado = productos.conteo_por_categoria()  # Categoría → cantidad
+    else:  # Valorización
+        resultado = {"total": productos.valor_inventario(), "por_categoria": productos.valor_por_categoria()}  # Sumas exactas sobre las columnas
+    segundos = time.perf_counter() - t0  # Duración (incluye la carga)
+    return {"archivo": datos, "filas": len(productos), "segundos": round(segundos, 3), "filas_por_segundo": _por_segundo(len(productos), segundos), "resultado": resultado}  # Estadísticas
+
+
+# ------------------------- EJECUCIÓN EN PARALELO -------------------------
+
+def _en_paralelo(funcion: Callable, tareas: List[tuple], procesos: int) -> List[Any]:  # Ejecuta funcion(*args) por cada tarea; resultados en el mismo orden
+    if procesos <= 1 or len(tareas) <= 1:  # Un solo archivo (o sin paralelo): sin costo de crear procesos
+        return [_capturar(funcion, args) for args in tareas]  # En este proceso
+    with ProcessPoolExecutor(max_workers=min(procesos, len(tareas))) as pool:  # Un proceso por archivo (hasta "procesos")
+        futuros = [pool.submit(_capturar, funcion, args) for args in tareas]  # Enviamos todo
+        return [f.result() for f in futuros]  # En orden
+
+def _capturar(funcion: Callable, args: tuple) -> Any:  # Ejecuta y convierte un error en un resultado (un archivo malo no frena a los demás)
+    try:  # Intentamos
+        return funcion(*args)  # Resultado normal
+    except Exception as e:  # Archivo ilegible, ruta inválida, etc.
+        return {"archivo": args[0], "error": f"{type(e).__name__}: {e}"}  # Error como dato
+
+
+# ------------------------- COMANDOS -------------------------
+
+def cmd_importar(args) -> Dict[str, Any]:  # Importa uno o más Excel al catálogo y guarda una sola vez
+    ruta_datos = preparar_ruta_datos(os.path.abspath(args.datos))  # JSON o SQLite según SGP_BACKEND (ruta absoluta: "productos.json" solo también sirve)
+    lista, version = cargar_con_version(ruta_datos)  # Catálogo actual y su versión (otra instancia puede guardar mientras importamos)
+    catalogo = CatalogoProductos(lista)  # Catálogo indexado
+    cargado = catalogo.version  # Versión tras la carga (si no cambia, no hay nada que guardar)
+    skus = set(catalogo.skus)  # Foto de los SKUs (cada proceso valida contra ella)
+    resultados = _en_paralelo(_validar_archivo, [(r, skus, args.sobrescribir) for r in args.archivos], args.procesos)  # Lectura y validación en paralelo
+
+    archivos = []  # Estadísticas por archivo
+    try:  # Los temporales se borran pase lo que pase
+        for resultado in resultados:  # En el orden de la línea de comandos (el último archivo gana)
+            if isinstance(resultado, dict):  # Falló la lectura
+                archivos.append(resultado)  # Error
+                continue  # Siguiente
+            lotes, stats = resultado  # Lotes en disco y estadísticas
+            nuevos = actualizados = sin_cambios = 0  # Contadores del archivo
+            fallidos = []  # SKU repetido entre archivos sin sobrescribir
+            for operaciones in lotes:  # Lote a lote (memoria acotada al lote)
+                if args.sobrescribir:  # Un SKU pudo llegar desde un archivo anterior: pasa a ser actualización
+                    operaciones = [(f, s, p, s not in catalogo) for f, s, p, _ in operaciones]  # Recalculamos alta/cambio
+                n, a, iguales, fallas = aplicar_lote(catalogo, operaciones)  # Aplicamos en el proceso padre (un solo escritor; las filas iguales al catálogo se saltan)
+                nuevos, actualizados, sin_cambios = nuevos + n, actualizados + a, sin_cambios + iguales  # Acumulamos
+                fallidos.extend(fallas)  # Casi nunca
+            if fallidos:  # SKU repetido entre archivos sin sobrescribir
+                with InformeErrores(ruta_informe(stats["archivo"]), stats["rechazados"]) as informe:  # Continuamos el informe del archivo
+                    informe.agregar(fallidos)  # Agregamos
+                stats["rechazados"] = informe.cantidad  # Total de rechazados
+                stats["informe"] = informe.ruta  # Ruta del informe
+            stats.update(nuevos=nuevos, actualizados=actualizados, sin_cambios=sin_cambios)  # Resultado del archivo
+            archivos.append(stats)  # Guardamos
+    finally:  # Aplicados o no
+        for resultado in resultados:  # Cada archivo validado
+            if not isinstance(resultado, dict):  # Tiene temporal
+                resultado[0].borrar()  # Lo borramos
+
+    resumen = {"datos": ruta_datos, "productos": len(catalogo), "archivos": archivos, "guardado": False}  # Resumen
+    if catalogo.duplicados:  # SKUs repetidos en los datos: el catálogo conservó la primera aparición
+        with InformeErrores(ruta_informe_carga(ruta_datos)) as informe:  # Los descartados quedan completos en un CSV
+            informe.agregar(rechazos_carga(catalogo))  # Una fila por producto descartado
+        resumen.update(duplicados=informe.cantidad, informe_duplicados=informe.ruta)  # Se informan (el guardado ya no los incluye)
+    if catalogo.version == cargado:  # Nada cambió (filas iguales al catálogo, rechazadas o con error): el archivo no se reescribe
+        pass  # Sin guardar
+    elif guardar_productos(catalogo, ruta_datos, version_esperada=version):  # Un solo guardado al final (solo si nadie guardó entretanto)
+        resumen["guardado"] = True  # Escrito
+    else:  # Otra instancia guardó antes
+        resumen["error"] = "Otra instancia modificó los datos durante la importación; no se guardó nada (vuelve a ejecutar)."  # Sin pisar cambios ajenos
+    return resumen  # Resumen
+
+def cmd_exportar(args) -> Dict[str, Any]:  # Exporta uno o más archivos de datos a Excel o PDF
+    os.makedirs(args.carpeta, exist_ok=True)  # Carpeta de salida
+    procesos_pdf = args.procesos if len(args.datos) == 1 else 1  # Con un solo archivo, el PDF usa los procesos; con varios, un proceso por archivo
+    tareas = [(preparar_ruta_datos(os.path.abspath(d)), args.formato, args.carpeta, args.agrupar, procesos_pdf, args.gzip) for d in args.datos]  # Una tarea por archivo
+    return {"formato": args.formato, "archivos": _en_paralelo(_exportar_archivo, tareas, args.procesos)}  # Resumen
+
+def cmd_reporte(args) -> Dict[str, Any]:  # Reporte sobre uno o más archivos de datos
+    tareas = [(preparar_ruta_datos(os.path.abspath(d)), args.tipo, args.umbral) for d in args.datos]  # Una tarea por archivo
+    return {"reporte": args.tipo, "archivos": _en_paralelo(_reporte_archivo, tareas, args.procesos)}  # Resumen
+
+def cmd_servir(args) -> Dict[str, Any]:  # API HTTP de solo lectura hasta Ctrl+C (cajas y etiquetadoras consultan precios y stock)
+    from modulos.servidor_http import servir  # Import local: solo este comando usa asyncio
+    avisar = lambda direccion: print(f"Sirviendo en http://{direccion[0]}:{direccion[1]} (Ctrl+C para detener)", file=sys.stderr, flush=True)  # La salida JSON queda para el resumen
+    return servir(preparar_ruta_datos(os.path.abspath(args.datos)), args.host, args.puerto, al_iniciar=avisar)  # Estadísticas al terminar
+
+
+def crear_parser() -> argparse.ArgumentParser:  # Define comandos y opciones
+    ap = argparse.ArgumentParser(prog="cli.py", description="SGP sin interfaz: importación, exportación, reportes y API HTTP (salida JSON)")  # Parser principal
+    ap.add_argument("--procesos", type=int, default=os.cpu_count() or 1, help="procesos en paralelo (uno por archivo)")  # Paralelismo
+    sub = ap.add_subparsers(dest="comando", required=True)  # Subcomandos
+
+    imp = sub.add_parser("importar", help="importa uno o más archivos (.xlsx, .csv, .ndjson; CSV/NDJSON también .gz) al catálogo")  # importar
+    imp.add_argument("archivos", nargs="+", help="archivos .xlsx, .csv o .ndjson (con o sin .gz)")  # Entradas
+    imp.add_argument("--datos", default=RUTA_POR_DEFECTO, help="archivo de datos destino")  # Destino
+    imp.add_argument("--sobrescribir", action="store_true", help="actualiza los SKUs que ya existen")  # Política
+    imp.set_defaults(funcion=cmd_importar)  # Manejador
+
+    exp = sub.add_parser("exportar", help="exporta uno o más archivos de datos a Excel, PDF, CSV o NDJSON")  # exportar
+    exp.add_argument("formato", choices=tuple(EXTENSIONES), help="formato de salida")  # Formato
+    exp.add_argument("datos", nargs="*", default=[RUTA_POR_DEFECTO], help="archivos de datos (por defecto el de la aplicación)")  # Entradas
+    exp.add_argument("--carpeta", default="exports", help="carpeta de salida")  # Salida
+    exp.add_argument("--agrupar", action="store_true", help="PDF agrupado por categoría")  # Diseño PDF
+    exp.add_argument("--gzip", action="store_true", help="CSV/NDJSON comprimido (.gz)")  # Compresión
+    exp.set_defaults(funcion=cmd_exportar)  # Manejador
+
+    rep = sub.add_parser("reporte", help="reportes: bajo-stock, categorias, valor")  # reporte
+    rep.add_argument("tipo", choices=("bajo-stock", "categorias", "valor"), help="tipo de reporte")  # Tipo
+    rep.add_argument("datos", nargs="*", default=[RUTA_POR_DEFECTO], help="archivos de datos (por defecto el de la aplicación)")  # Entradas
+    rep.add_argument("--umbral", type=int, default=5, help="umbral de stock bajo")  # Umbral
+    rep.set_defaults(funcion=cmd_reporte)  # Manejador
+
+    srv = sub.add_parser("servir", help="API HTTP de solo lectura: SKU, búsqueda, bajo stock y categorías")  # servir
+    srv.add_argument("--datos", default=RUTA_POR_DEFECTO, help="archivo de datos (sigue los cambios de la aplicación)")  # Origen
+    srv.add_argument("--host", default="127.0.0.1", help="dirección (0.0.0.0 = toda la red local)")  # Interfaz
+    srv.add_argument("--puerto", type=int, default=8080, help="puerto TCP (0 = uno libre)")  # Puerto
+    srv.set_defaults(funcion=cmd_servir)  # Manejador
+    return ap  # Parser listo
+
+
+def main(argv=None) -> int:  # Punto de entrada: imprime un JSON y retorna el código de salida (0 = ok, 1 = algún archivo falló)
+    args = crear_parser().parse_args(argv)  # Leemos argumentos
+    t0 = time.perf_counter()  # Inicio
+    resumen = args.funcion(args)  # Ejecutamos el comando
+    resumen["comando"] = args.comando  # Comando ejecutado
+    resumen["segundos"] = round(time.perf_counter() - t0, 3)  # Duración total
+    json.dump(resumen, sys.stdout, ensure_ascii=False, indent=2)  # Estadísticas legibles por máquina
+    sys.stdout.write("\n")  # Fin de línea
+    return 1 if "error" in resumen or any("error" in a for a in resumen.get("archivos", [])) else 0  # Código de salida
+
+
+if __name__ == "__main__":  # Solo al correr el script directamente (y necesario para los procesos hijos)
+    multiprocessing.freeze_support()  # Ejecutable de PyInstaller
+    sys.exit(main())  # Salimos con el código del comando
@@ -1,8 +1,34 @@
+import time  # Medición del arranque (antes de cualquier otro import)
+T_INICIO = time.perf_counter()  # Momento en que empieza a correr main.py
+
+import json  # Tiempos de arranque legibles por máquina
+import multiprocessing  # Procesos auxiliares (PDF en paralelo)
+import os  # Variable de entorno SGP_MEDIR_ARRANQUE
 from modulos.ui_tkinter import App  # Importamos la clase principal de la interfaz (ventana Tkinter)
+T_IMPORTS = time.perf_counter()  # Fin de los imports de la interfaz
+
+def medir_arranque(app):  # Con SGP_MEDIR_ARRANQUE=1: imprime los tiempos de arranque (JSON) y cierra al terminar la carga
+    tiempos = {"imports_ms": round((T_IMPORTS - T_INICIO) * 1000, 1)}  # Imports de la interfaz
+
+    def primera_pintura():  # Primer momento libre del mainloop: la ventana ya se dibujó
+        app.update_idletasks()  # Termina de dibujar lo pendiente
+        tiempos["primera_pintura_ms"] = round((time.perf_counter() - T_INICIO) * 1000, 1)  # Desde el inicio
+
+    def catalogo_cargado(_evt):  # El catálogo ya está en la tabla
+        tiempos["catalogo_ms"] = round((time.perf_counter() - T_INICIO) * 1000, 1)  # Desde el inicio
+        tiempos["productos"] = len(app.productos)  # Tamaño del catálogo cargado
+        print(json.dumps(tiempos), flush=True)  # Una línea JSON (la lee benchmarks/arranque.py)
+        app.after_idle(app.on_cerrar)  # Cerramos sin dejar nada pendiente
+
+    app.after_idle(primera_pintura)  # Se ejecuta apenas arranca el mainloop
+    app.bind("<<CatalogoCargado>>", catalogo_cargado, add="+")  # Aviso de App al terminar la carga
 
 def main():  # Definimos la función principal (punto de inicio lógico del programa)
     app = App()  # Creamos la aplicación (ventana) usando nuestra clase App
+    if os.environ.get("SGP_MEDIR_ARRANQUE") == "1":  # Medición de arranque (entre versiones)
+        medir_arranque(app)  # Registra los tiempos
     app.mainloop()  # Iniciamos el “bucle” de Tkinter (mantiene la ventana funcionando)
 
 if __name__ == "__main__":  # Esto asegura que main() se ejecute solo si corremos este archivo directamente
+    multiprocessing.freeze_support()  # Necesario en el .exe de PyInstaller para que los procesos auxiliares no abran otra ventana
     main()  # Llamamos a la función principal
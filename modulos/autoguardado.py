@@ -0,0 +1,144 @@
+import time  # Reloj monotónico para medir la calma y la espera máxima
+from typing import Callable, Optional, List, Any  # Tipos para claridad
+
+from .tareas import PlanificadorTareas  # Hilo de escritura con entrega de resultados al hilo de Tk
+
+ESPERA_MS = 500  # Calma tras el último cambio antes de escribir (junta las ráfagas en una sola escritura)
+MAXIMO_MS = 3000  # Nunca se espera más que esto desde el primer cambio sin guardar (pérdida acotada si se corta la luz)
+
+
+class AutoGuardado:  # Escribe los cambios del catálogo en segundo plano, juntando ráfagas en una sola escritura
+    def __init__(  # Constructor
+        self,
+        raiz,  # Ventana Tk (para usar after)
+        diario,  # DiarioCambios o SincronizadorSQLite (se suscribe antes que nosotros)
+        catalogo,  # Catálogo (CatalogoProductos) que se persiste
+        espera_ms: int = ESPERA_MS,  # Calma antes de escribir
+        maximo_ms: int = MAXIMO_MS,  # Espera máxima desde el primer cambio
+        al_guardar: Optional[Callable[[List[Any], List[Any]], None]] = None,  # Hilo de Tk: (SKUs en conflicto, SKUs cambiados por otras instancias)
+    ):
+        self.raiz = raiz  # Para programar con after
+        self.diario = diario  # Persistencia
+        self.catalogo = catalogo  # Para la foto de compactación
+        self.espera_ms = espera_ms  # Calma
+        self.maximo_ms = maximo_ms  # Máximo
+        self.al_guardar = al_guardar  # Aviso a la interfaz
+        self.tareas = PlanificadorTareas(raiz, max_hilos=1)  # Un solo hilo: las escrituras salen en orden y no esperan detrás de exportaciones
+        self._primer_cambio: Optional[float] = None  # Momento del primer cambio sin escribir (None = nada pendiente)
+        self._ultimo_cambio = 0.0  # Momento del último cambio
+        self._programado = None  # after() en espera (None si no hay)
+        self._tarea = None  # Escritura o compactación en curso
+        self._lote: Optional[list] = None  # Lote que lleva la escritura en curso (para devolverlo si falla)
+        self.guardados = 0  # Escrituras terminadas (para medir cuánto se juntó)
+        catalogo.suscribir(self)  # Después del diario: cuando nos avisan, el cambio ya está anotado
+
+    # ------------------------- CAMBIOS DEL CATÁLOGO -------------------------
+
+    def al_agregar(self, p: dict) -> None:  # Alta
+        self._cambio()  # Programamos
+
+    def al_actualizar(self, anterior: dict, nuevo: dict) -> None:  # Cambio
+        self._cambio()  # Programamos
+
+    def al_eliminar(self, p: dict) -> None:  # Baja
+        self._cambio()  # Programamos
+
+    def _cambio(self) -> None:  # Solo los cambios propios (los de otras instancias no dejan nada pendiente)
+        if self.diario.hay_pendientes:  # Quedó algo anotado
+            self.marcar()  # Lo escribimos pronto
+
+    def marcar(self) -> None:  # Hay cambios sin escribir: programa la escritura (barato: se llama en cada cambio)
+        ahora = time.monotonic()  # Ahora
+        self._ultimo_cambio = ahora  # Reinicia la calma
+        if self._primer_cambio is None:  # Primer cambio de la ráfaga
+            self._primer_cambio = ahora  # Desde aquí corre la espera máxima
+        if self._programado is None and self._tarea is None:  # Sin after() ni escritura en curso (al terminar se reprograma)
+            self._programado = self.raiz.after(self.espera_ms, self._revisar_plazo)  # Una sola espera por ráfaga
+
+    def _revisar_plazo(self) -> None:  # Hilo de Tk: escribe si hubo calma o se cumplió el máximo; si no, espera lo que falta
+        self._programado = None  # Ya se ejecutó
+        if self._primer_cambio is None or self._tarea is not None:  # Nada pendiente, o se reprograma al terminar la escritura
+            return  # Salimos
+        ahora = time.monotonic()  # Ahora
+        falta_calma = self.espera_ms - (ahora - self._ultimo_cambio) * 1000  # ms de calma que faltan
+        falta_maximo = self.maximo_ms - (ahora - self._primer_cambio) * 1000  # ms hasta el máximo
+        if falta_calma <= 0 or falta_maximo <= 0:  # Listo para escribir
+            self._escribir()  # En segundo plano
+        else:  # Siguen llegando cambios
+            self._programado = self.raiz.after(int(min(falta_calma, falta_maximo)) + 1, self._revisar_plazo)  # Lo que falte
+
+    # ------------------------- ESCRITURA EN SEGUNDO PLANO -------------------------
+
+    def _escribir(self) -> None:  # Toma lo anotado (foto consistente) y lo escribe en el hilo de trabajo
+        self._primer_cambio = None  # Lo que llegue desde ahora es otra ráfaga
+        lote = self.diario.tomar_pendientes()  # Hilo de Tk: nadie modifica el catálogo mientras tanto
+        self._lanzar("Guardando cambios", lote, lambda _t: self.diario.escribir(lote), self._escrito)  # Bloqueo y disco, fuera de la interfaz
+
+    def revisar(self) -> None:  # Trae en segundo plano lo que escribieron otras instancias (se llama seguido)
+        if self._tarea is not None or self._programado is not None:  # La escritura en curso o programada ya trae lo remoto
+            return  # Salimos
+        if self.diario.hay_cambios_externos():  # Solo stat: casi siempre no
+            self._lanzar("Revisando cambios", [], lambda _t: self.diario.escribir([]), self._escrito)  # Lote vacío: solo lectura
+
+    def _lanzar(self, nombre: str, lote: list, funcion: Callable, al_terminar: Callable) -> None:  # Una tarea de persistencia a la vez
+        self._lote = lote  # Por si hay que devolverlo
+        self._tarea = self.tareas.lanzar(nombre, funcion, al_terminar=al_terminar, al_fallar=self._fallo)  # Al hilo de escritura
+
+    def _escrito(self, resultado) -> None:  # Hilo de Tk: aplica lo remoto y avisa
+        if self._tarea is None:  # cerrar() ya se ocupó
+            return  # Nada que hacer
+        self._tarea = self._lote = None  # Libre
+        self.guardados += 1  # Contador
+        cambiados = self.diario.aplicar(resultado)  # Cambios de otras instancias al catálogo (los nuestros posteriores se conservan)
+        if self.al_guardar and (resultado[1] or cambiados):  # Hay algo que mostrar
+            self.al_guardar(resultado[1], cambiados)  # Conflictos y refresco de la vista
+        self._siguiente()  # Más cambios o compactación
+
+    def _fallo(self, error: BaseException) -> None:  # Hilo de Tk: bloqueo ocupado o error de disco; nada se pierde
+        if self._tarea is None:  # cerrar() ya se ocupó
+            return  # Nada que hacer
+        if self._lote:  # Era una escritura
+            self.diario.devolver(self._lote)  # Vuelve a quedar pendiente
+        self._tarea = self._lote = None  # Libre
+        if self.diario.hay_pendientes:  # Hay que reintentar
+            self._primer_cambio = None  # Cuenta como una ráfaga nueva (si el bloqueo sigue ocupado no insistimos enseguida)
+            self.marcar()  # Reintento tras la calma
+
+    def _siguiente(self) -> None:  # Después de una escritura: la próxima ráfaga o, si no hay nada pendiente, compactar
+        if self._primer_cambio is not None:  # Llegaron cambios mientras se escribía
+            self._revisar_plazo()  # Escribe ya si corresponde o programa
+        elif self.diario.necesita_compactar() and not self.diario.hay_pendientes:  # Diario grande y catálogo igual al disco
+            foto, version = self.catalogo.como_lista(), self.diario.version  # Copia consistente (hilo de Tk; los dicts no se modifican en el lugar)
+            self._lanzar("Compactando datos", [], lambda _t: self.diario.compactar_foto(foto, version), self._compactado)  # Foto nueva en el hilo de escritura
+
+    def _compactado(self, _resultado) -> None:  # Hilo de Tk: fin de la compactación
+        if self._tarea is None:  # cerrar() ya se ocupó
+            return  # Nada que hacer
+        self._tarea = None  # Libre
+        self._siguiente()  # Cambios llegados mientras tanto
+
+    # ------------------------- CIERRE -------------------------
+
+    @property
+    def pendiente(self) -> bool:  # ¿Queda algo sin escribir (anotado o en camino)?
+        return self._tarea is not None or self.diario.hay_pendientes  # Escritura en curso o cambios anotados
+
+    def cerrar(self) -> None:  # Deja todo escrito (al cerrar la ventana): espera la escritura en curso y escribe lo que quede
+        if self._programado is not None:  # Escritura programada
+            self.raiz.after_cancel(self._programado)  # La hacemos ahora mismo
+            self._programado = None  # Sin after()
+        tarea, lote = self._tarea, self._lote  # Lo que esté en camino
+        self._tarea = self._lote = None  # Los avisos que lleguen después se ignoran
+        self._primer_cambio = None  # Lo pendiente se escribe abajo
+        if tarea is not None:  # Hay una escritura o compactación en camino (es la única: el hilo está libre para ella)
+            try:  # Esperamos que termine
+                tarea.futuro.result()  # Lo escrito ya está en disco
+            except Exception:  # Falló
+                self.diario.devolver(lote or [])  # Se reintenta abajo
+        try:  # Escritura final en este hilo
+            self.diario.cerrar()  # Escribe lo pendiente y espera una compactación en curso
+        except BaseException:  # Ej. bloqueo ocupado: la ventana sigue abierta
+            if self.diario.hay_pendientes:  # Sigue pendiente
+                self.marcar()  # El guardado automático sigue funcionando
+            raise  # La interfaz avisa
+        self.tareas.cerrar()  # Libera el hilo de escritura
@@ -0,0 +1,117 @@
+from collections import OrderedDict  # LRU: orden de uso + acceso O(1)
+from typing import Callable, Optional, List, Dict, Any  # Tipos para claridad
+
+from .indice_busqueda import normalizar_consulta  # Mismo criterio que CatalogoProductos.buscar
+
+ESPERA_MS = 150  # Pausa de teclado antes de buscar (mientras se escribe seguido no se busca)
+CAPACIDAD = 16  # Resultados recientes guardados (consultas distintas)
+BLOQUE = 20000  # Productos revisados por tramo al recorrer (entre tramos Tk atiende el teclado)
+
+
+class BuscadorIncremental:  # Búsqueda mientras se escribe: espera una pausa, reutiliza resultados recientes y abandona lo que quedó viejo
+    def __init__(  # Constructor
+        self,
+        raiz,  # Ventana Tk (para usar after)
+        catalogo,  # CatalogoProductos donde se busca
+        al_resultado: Callable[[str, Optional[List[Dict[str, Any]]]], None],  # Hilo de Tk: (consulta, resultado); None = sin filtro (todo el catálogo)
+        espera_ms: int = ESPERA_MS,  # Pausa de teclado
+        capacidad: int = CAPACIDAD,  # Tamaño del LRU
+        bloque: int = BLOQUE,  # Tramo de recorrido
+    ):
+        self.raiz = raiz  # Para programar con after
+        self.catalogo = catalogo  # Dónde buscar
+        self.al_resultado = al_resultado  # Entrega a la interfaz
+        self.espera_ms = espera_ms  # Pausa
+        self.capacidad = capacidad  # LRU
+        self.bloque = bloque  # Tramo
+        self._cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()  # Consulta normalizada → resultado (de la versión self._version)
+        self._version: Optional[int] = None  # Versión del catálogo a la que corresponde todo lo guardado
+        self._generacion = 0  # Sube con cada pedido: el trabajo de una generación anterior se abandona
+        self._programado = None  # after() en espera (pausa de teclado o próximo tramo)
+        self.estadisticas = {"cache": 0, "acotadas": 0, "indice": 0, "recorridas": 0, "abandonadas": 0}  # Cómo se resolvió cada búsqueda
+
+    # ------------------------- API -------------------------
+
+    def pedir(self, texto: str) -> None:  # Cada tecla: busca cuando el usuario hace una pausa
+        self.cancelar()  # Lo pedido antes ya no interesa
+        self._programado = self.raiz.after(self.espera_ms, self._buscar, self._generacion, texto)  # Tras la pausa
+
+    def buscar_ya(self, texto: str) -> None:  # Enter, botón "Aplicar" o refresco tras un cambio: sin esperar la pausa
+        self.cancelar()  # Lo pedido antes ya no interesa
+        self._buscar(self._generacion, texto)  # Ahora (puede terminar en tramos si hay que recorrer)
+
+    def cancelar(self) -> None:  # Abandona la búsqueda programada o en curso
+        if self._programado is not None:  # Hay un after() en espera
+            self.raiz.after_cancel(self._programado)  # Lo quitamos
+            self._programado = None  # Sin after()
+            self.estadisticas["abandonadas"] += 1  # Trabajo que no se hizo
+        self._generacion += 1  # Un tramo que ya estuviera en la cola de Tk se descarta solo
+
+    def limpiar(self) -> None:  # Olvida los resultados guardados (ej. al cambiar de catálogo)
+        self.cancelar()  # Nada en curso
+        self._cache.clear()  # Vacío
+        self._version = None  # Sin versión
+
+    # ------------------------- INTERNOS -------------------------
+
+    def _buscar(self, generacion: int, texto: str) -> None:  # Resuelve la consulta: LRU, acotar una anterior, índice o recorrido por tramos
+        self._programado = None  # Ya se ejecutó
+        if generacion != self._generacion:  # Llegó otra tecla entretanto
+            return  # Se abandona
+        q = normalizar_consulta(texto)  # Misma normalización que buscar()
+        if not q:  # Sin filtro
+            self.al_resultado(texto, None)  # Todo el catálogo (la interfaz tiene atajos para ese caso)
+            return  # Listo
+        version = self.catalogo.version  # Los resultados solo valen para esta versión
+        if version != self._version:  # El catálogo cambió: lo guardado ya no sirve
+            self._cache.clear()  # Liberamos de inmediato
+            self._version = version  # Nueva versión
+
+        guardado = self._cache.get(q)  # ¿Ya se buscó?
+        if guardado is not None:  # Sí, con esta versión
+            self._cache.move_to_end(q)  # Recién usado
+            self.estadisticas["cache"] += 1  # Contador
+            self.al_resultado(texto, guardado)  # Al instante
+            return  # Listo
+
+        base = self._base(q)  # Resultado de una consulta contenida en q (q agrega letras: solo puede achicarse)
+        if base is not None:  # Se acota lo anterior en vez de recorrer el catálogo
+            self.estadisticas["acotadas"] += 1  # Contador
+            fuente = base  # Lo que hay que revisar
+        else:  # Sin consulta anterior útil
+            resultado = self.catalogo.buscar_por_indice(q)  # Pocos candidatos: directo del índice
+            if resultado is not None:  # Resuelto
+                self.estadisticas["indice"] += 1  # Contador
+                self._terminar(texto, q, resultado)  # Entregamos
+                return  # Listo
+            self.estadisticas["recorridas"] += 1  # Contador
+            fuente = self.catalogo.como_lista()  # Copia de referencias (el catálogo puede cambiar entre tramos)
+        self._tramo(generacion, texto, q, version, fuente, 0, [])  # Primer tramo ahora mismo
+
+    def _base(self, q: str) -> Optional[List[Dict[str, Any]]]:  # El resultado guardado más chico de una consulta contenida en q
+        mejor = None  # Sin candidato
+        for anterior, resultado in self._cache.items():  # Pocas entradas
+            if anterior in q and (mejor is None or len(resultado) < len(mejor)):  # Si el texto contiene q, contiene lo anterior
+                mejor = resultado  # Más chico = menos trabajo
+        return mejor  # None si no hay
+
+    def _tramo(self, generacion: int, texto: str, q: str, version: int, fuente: List[Dict[str, Any]], desde: int, resultado: List[Dict[str, Any]]) -> None:  # Revisa un tramo y programa el siguiente
+        self._programado = None  # Ya se ejecutó
+        if generacion != self._generacion:  # Llegó otra tecla: esta consulta ya no se muestra
+            return  # Se abandona (sin revisar el resto)
+        if self.catalogo.version != version:  # El catálogo cambió entre tramos: lo revisado puede estar viejo
+            self._buscar(generacion, texto)  # Empezamos de nuevo con la versión actual
+            return  # Listo
+        hasta = desde + self.bloque  # Fin del tramo
+        resultado.extend(self.catalogo.filtrar(fuente[desde:hasta], q))  # Coincidencias del tramo
+        if hasta < len(fuente):  # Quedan tramos
+            self._programado = self.raiz.after(1, self._tramo, generacion, texto, q, version, fuente, hasta, resultado)  # Tk atiende el teclado entremedio
+        else:  # Último tramo
+            self._terminar(texto, q, resultado)  # Entregamos
+
+    def _terminar(self, texto: str, q: str, resultado: List[Dict[str, Any]]) -> None:  # Guarda en el LRU (versión actual) y entrega
+        self._cache[q] = resultado  # Nuevo o reemplazo
+        self._cache.move_to_end(q)  # Recién usado
+        while len(self._cache) > self.capacidad:  # Se pasó del tamaño
+            self._cache.popitem(last=False)  # Fuera el menos usado
+        self.al_resultado(texto, resultado)  # A la interfaz
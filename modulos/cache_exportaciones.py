@@ -0,0 +1,88 @@
+import os  # Tamaños y borrado de archivos
+import shutil  # Borrar la carpeta completa al cerrar
+import tempfile  # Carpeta propia de esta sesión (dos instancias no se pisan)
+from collections import OrderedDict  # LRU: orden de uso + acceso O(1)
+from itertools import count  # Nombres de archivo únicos
+from typing import Optional, Tuple, Hashable  # Tipos para claridad
+
+PRESUPUESTO_BYTES = 200 * 1024 * 1024  # Espacio máximo en disco para archivos guardados
+MAX_ENTRADAS = 16  # Exportaciones distintas guardadas
+
+
+class CacheExportaciones:  # Archivos ya exportados (Excel/PDF) de una vista: repetir la exportación es copiar un archivo
+    def __init__(self, presupuesto_bytes: int = PRESUPUESTO_BYTES, max_entradas: int = MAX_ENTRADAS):  # Constructor
+        self.presupuesto_bytes = presupuesto_bytes  # Límite de disco
+        self.max_entradas = max_entradas  # Límite de entradas
+        self.carpeta: Optional[str] = None  # Carpeta temporal (se crea con el primer archivo)
+        self._entradas: "OrderedDict[Hashable, Tuple[str, int]]" = OrderedDict()  # Clave → (archivo, bytes), de la versión self._version
+        self._version: Optional[int] = None  # Versión del catálogo a la que corresponde todo lo guardado
+        self._usado = 0  # Bytes ocupados
+        self._nombres = count()  # Contador para nombres de archivo
+        self.estadisticas = {"aciertos": 0, "fallos": 0, "descartadas": 0}  # Cómo se resolvió cada exportación
+
+    # ------------------------- API (hilo de Tk) -------------------------
+
+    def buscar(self, version: int, clave: Hashable) -> Optional[str]:  # Archivo ya exportado para (versión, clave) o None
+        self._al_dia(version)  # Si el catálogo cambió, nada de lo guardado sirve
+        entrada = self._entradas.get(clave)  # ¿Ya se exportó?
+        if entrada is None or not os.path.exists(entrada[0]):  # No (o alguien borró el archivo)
+            self._quitar(clave)  # Por si quedó la entrada
+            self.estadisticas["fallos"] += 1  # Contador
+            return None  # Hay que exportar
+        self._entradas.move_to_end(clave)  # Recién usado
+        self.estadisticas["aciertos"] += 1  # Contador
+        return entrada[0]  # Se copia este archivo
+
+    def ruta_nueva(self, extension: str) -> str:  # Dónde dejar la copia de una exportación nueva (el hilo de trabajo escribe ahí)
+        if self.carpeta is None:  # Primera exportación de la sesión
+            self.carpeta = tempfile.mkdtemp(prefix="sgp_exportaciones_")  # Carpeta propia
+        return os.path.join(self.carpeta, f"{next(self._nombres)}{extension}")  # Nombre único
+
+    def guardar(self, version: int, clave: Hashable, ruta: str) -> bool:  # Registra un archivo ya escrito en ruta_nueva(); False si no se guardó
+        tam = os.path.getsize(ruta)  # Tamaño en disco
+        if version != self._version or tam > self.presupuesto_bytes:  # El catálogo cambió mientras se exportaba, o no cabe nunca
+            _borrar(ruta)  # No sirve
+            return False  # No guardado
+        self._quitar(clave)  # Una entrada anterior con la misma clave
+        self._entradas[clave] = (ruta, tam)  # Nueva entrada (la más reciente)
+        self._usado += tam  # Espacio ocupado
+        while self._usado > self.presupuesto_bytes or len(self._entradas) > self.max_entradas:  # Se pasó del presupuesto
+            self._quitar(next(iter(self._entradas)))  # Fuera la menos usada
+            self.estadisticas["descartadas"] += 1  # Contador
+        return True  # Guardado
+
+    def vaciar(self) -> None:  # Borra todo lo guardado
+        for ruta, _ in self._entradas.values():  # Cada archivo
+            _borrar(ruta)  # Fuera del disco
+        self._entradas.clear()  # Sin entradas
+        self._usado = 0  # Sin espacio ocupado
+
+    def cerrar(self) -> None:  # Al cerrar la ventana: borra la carpeta completa (incluye copias a medio escribir)
+        self.vaciar()  # Entradas
+        if self.carpeta is not None:  # Si se llegó a crear
+            shutil.rmtree(self.carpeta, ignore_errors=True)  # Carpeta temporal
+            self.carpeta = None  # Sin carpeta
+
+    @property
+    def usado(self) -> int:  # Bytes ocupados en disco
+        return self._usado  # Contador mantenido
+
+    # ------------------------- INTERNOS -------------------------
+
+    def _al_dia(self, version: int) -> None:  # Cualquier cambio del catálogo invalida todo (la versión es parte de la clave)
+        if version != self._version:  # Cambió
+            self.vaciar()  # Liberamos el disco de inmediato
+            self._version = version  # Nueva versión
+
+    def _quitar(self, clave: Hashable) -> None:  # Saca una entrada y borra su archivo
+        entrada = self._entradas.pop(clave, None)  # Sacamos
+        if entrada is not None:  # Existía
+            _borrar(entrada[0])  # Fuera del disco
+            self._usado -= entrada[1]  # Espacio liberado
+
+
+def _borrar(ruta: str) -> None:  # Borra un archivo sin fallar (ej. ya no existe, o en Windows otro hilo lo tiene abierto)
+    try:  # Intentamos
+        os.remove(ruta)  # Borramos
+    except OSError:  # No se pudo
+        pass  # cerrar() borra la carpeta completa al final
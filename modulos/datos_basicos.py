@@ -15,3 +15,10 @@ def to_float_seguro(s: str) -> Optional[float]:  # Convierte un valor a float, o
         return float(txt)  # Convertimos a float
     except Exception:  # Si falla la conversión
         return None  # Devolvemos None
+
+VERDADEROS = ("1", "true", "si", "sí", "yes")  # Textos que cuentan como verdadero (ej. columna "activo" de un Excel)
+
+def to_bool_seguro(v) -> bool:  # Convierte texto ("sí", "true", "1"...) o número/bool a booleano
+    if isinstance(v, str):  # Si viene como texto
+        return v.strip().lower() in VERDADEROS  # Solo los textos reconocidos son verdaderos
+    return bool(v)  # Número/bool/None
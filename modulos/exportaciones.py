@@ -1,75 +1,389 @@
-from typing import List, Dict, Any  # Tipos para claridad
+import csv  # Archivos planos CSV
+import gzip  # CSV/NDJSON comprimidos (.gz)
+import importlib.util  # find_spec: saber si pypdf está instalada sin importarla
+import io  # Buffers grandes de lectura/escritura
+import json  # NDJSON (un objeto JSON por línea)
+import math  # fsum para el valor por categoría
+import os  # Rutas de los tramos del PDF paralelo
+from collections import deque  # Tramos de PDF en vuelo (modo paralelo)
+from itertools import chain, islice  # Para separar una muestra del resto sin materializar todo
+from typing import List, Dict, Any, Callable, Optional, Iterable, Iterator, Tuple  # Tipos para claridad
 from openpyxl import Workbook  # Para crear Excel
 from openpyxl import load_workbook  # Para leer Excel (IMPORTACIÓN)
+from openpyxl.utils import get_column_letter  # Letra de columna (A, B, C...) para fijar anchos
 from reportlab.lib.pagesizes import letter  # Tamaño carta para PDF
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer  # Elementos para PDF
+from reportlab.pdfgen.canvas import Canvas  # Dibujo directo de páginas (sin armar todo el documento antes)
+from reportlab.platypus import Table, TableStyle, Paragraph  # Elementos para PDF
 from reportlab.lib import colors  # Colores para estilos de tabla
 from reportlab.lib.styles import getSampleStyleSheet  # Estilos predefinidos de texto para PDF
+from reportlab.pdfbase.pdfmetrics import stringWidth  # Ancho real de un texto (para recortar celdas largas)
+
+from .funciones_utiles import subtotal_producto  # Valor de cada producto (precio * stock) para los subtotales por categoría
 
 CAMPOS = ["sku", "nombre", "categoria", "precio", "stock", "activo", "creado_en"]  # Columnas estándar para exportación
+CADA_FILAS = 500  # Cada cuántas filas se informa el progreso
+
+MAX_FILAS_HOJA = 1048576  # Límite de filas de una hoja de Excel (incluye el encabezado)
+FILAS_MUESTRA = 1000  # Filas que se miran antes de escribir para calcular anchos de columna
+
+Progreso = Optional[Callable[[int, int], None]]  # Callback opcional progreso(hechos, total); puede lanzar una excepción para cancelar
 
-def exportar_excel(registros: List[Dict[str, Any]], ruta: str) -> None:  # Función para exportar a Excel
-    wb = Workbook()  # Creamos un nuevo libro de Excel
-    ws = wb.active  # Seleccionamos la hoja activa
-    ws.title = "Productos"  # Renombramos la hoja
+def _ancho(largo: int) -> int:  # Ancho de columna a partir del texto más largo (mín 10, máx 40)
+    return min(max(largo, 10) + 2, 40)  # Mismo criterio de siempre
 
+def _hoja_excel(wb, numero: int, largos: List[int]):  # Crea una hoja de solo escritura con anchos y encabezado
+    ws = wb.create_sheet("Productos" if numero == 1 else f"Productos ({numero})")  # Nombre de la hoja
+    for i, largo in enumerate(largos, start=1):  # Los anchos deben fijarse antes de la primera fila
+        ws.column_dimensions[get_column_letter(i)].width = _ancho(largo)  # Ajustamos ancho
     ws.append([c.upper() for c in CAMPOS])  # Escribimos encabezados en la primera fila
+    return ws  # Retornamos la hoja
+
+def exportar_excel(registros: Iterable[Dict[str, Any]], ruta: str, progreso: Progreso = None, max_filas_hoja: int = MAX_FILAS_HOJA) -> int:  # Exporta a Excel en streaming (memoria constante)
+    total = len(registros) if hasattr(registros, "__len__") else 0  # Total si se conoce (un generador no lo tiene)
+    filas = ([r.get(c, "") for c in CAMPOS] for r in registros)  # Filas en el orden de CAMPOS (se generan al vuelo)
+
+    muestra = list(islice(filas, FILAS_MUESTRA))  # Primeras filas: sirven para calcular los anchos de la primera hoja
+    largos = [len(c) for c in CAMPOS]  # Máximo de caracteres por columna (parte en el encabezado)
+    for fila in muestra:  # Recorremos la muestra
+        largos = [max(m, len(str(v)) if v is not None else 0) for m, v in zip(largos, fila)]  # Actualizamos máximos
 
-    for r in registros:  # Recorremos los registros a exportar
-        ws.append([r.get(c, "") for c in CAMPOS])  # Escribimos cada registro en una fila (mismo orden de CAMPOS)
+    wb = Workbook(write_only=True)  # Libro de solo escritura: las filas van directo al archivo, no quedan en memoria
+    hoja = 1  # Número de hoja actual
+    ws = _hoja_excel(wb, hoja, largos)  # Primera hoja
+    en_hoja = 1  # Filas escritas en la hoja (el encabezado cuenta)
 
-    for col in ws.columns:  # Recorremos columnas para ajustar ancho
-        max_len = 10  # Largo mínimo
-        for cell in col:  # Recorremos celdas de esa columna
-            val = str(cell.value) if cell.value is not None else ""  # Convertimos valor a texto
-            max_len = max(max_len, len(val))  # Actualizamos máximo
-        ws.column_dimensions[col[0].column_letter].width = min(max_len + 2, 40)  # Ajustamos ancho (máx 40)
+    escritas = 0  # Filas de datos escritas
+    for fila in chain(muestra, filas):  # Una sola pasada: muestra + resto
+        if en_hoja >= max_filas_hoja:  # Hoja llena: seguimos en otra
+            hoja += 1  # Siguiente número
+            ws = _hoja_excel(wb, hoja, largos)  # Usa los máximos acumulados hasta aquí
+            en_hoja = 1  # Solo el encabezado
+        ws.append(fila)  # Escribimos la fila
+        en_hoja += 1  # Contamos en la hoja
+        escritas += 1  # Contamos en total
+        if escritas > FILAS_MUESTRA:  # Fuera de la muestra (ya medida), seguimos acumulando máximos para hojas siguientes
+            largos = [max(m, len(str(v)) if v is not None else 0) for m, v in zip(largos, fila)]  # Máximos corrientes
+        if progreso and escritas % CADA_FILAS == 0:  # Cada cierto número de filas
+            progreso(escritas, total)  # Informamos avance (y permitimos cancelar)
 
     wb.save(ruta)  # Guardamos el archivo Excel en la ruta
+    if progreso:  # Si hay callback
+        progreso(escritas, total or escritas)  # Terminado
+    return escritas  # Cantidad de filas exportadas
+
+# ------------------------- PDF -------------------------
+# La paginación la decide este módulo (no reportlab): cada página es una tabla de alto fijo con FILAS_PAGINA filas.
+# Así cada tabla es chica (costo lineal), el total de páginas se conoce antes de dibujar ("Página x de y")
+# y cualquier tramo de páginas se puede dibujar por separado (en otro proceso) y luego unir.
+
+FILAS_PAGINA = 48  # Filas de datos por página (más el encabezado; caben con el título en la primera)
+ALTO_FILA = 14  # Alto fijo de cada fila (puntos)
+MARGEN = 36  # Margen de la hoja (media pulgada)
+ANCHOS_PDF = (70, 170, 70, 60, 40, 40, 90)  # Ancho de cada columna de CAMPOS (suman el ancho útil de la hoja carta)
+PAGINAS_POR_PARTE = 200  # Páginas que dibuja cada proceso de una vez (modo paralelo)
+
+_GRUPO = "grupo"  # Marca de fila de encabezado de categoría (fila = (_GRUPO, texto))
+
+GLIFO_MAX = 1.05  # Ancho del carácter más ancho de Helvetica, en tamaños de letra ("@" 1.015, "W" 0.944; se deja margen)
+
+class _AnchosGlifos(dict):  # Carácter → ancho en milésimas del tamaño de letra (enteros, igual que las tablas de la fuente)
+    def __missing__(self, c: str) -> float:  # Primera vez que aparece (se mide cada carácter una sola vez)
+        ancho = self[c] = stringWidth(c, "Helvetica", 1000)  # Medimos y guardamos
+        return ancho  # Ancho del carácter
 
-def exportar_pdf(registros: List[Dict[str, Any]], ruta: str, titulo: str = "Reporte de Productos") -> None:  # Función para exportar a PDF
-    doc = SimpleDocTemplate(ruta, pagesize=letter)  # Creamos el documento PDF tamaño carta
-    styles = getSampleStyleSheet()  # Obtenemos estilos predefinidos
-    story = []  # Lista de “componentes” que se agregan al PDF
+_ANCHOS = _AnchosGlifos()  # Compartido por todas las celdas (stringWidth suma los mismos anchos, sin kerning; en enteros no hay redondeo)
+_ANCHO_PUNTOS = _ANCHOS["…"]  # Ancho de los puntos suspensivos
 
-    story.append(Paragraph(titulo, styles["Title"]))  # Agregamos un título
-    story.append(Spacer(1, 12))  # Espacio vertical
+def _recortar(texto: str, ancho: float) -> str:  # Acorta un texto para que quepa en su columna (Helvetica 8)
+    if len(texto) * GLIFO_MAX * 8 <= ancho - 4:  # Corto: cabe aunque sea todo "W" o "@" (evita medir las celdas chicas)
+        return texto  # Sin cambios
+    anchos = list(map(_ANCHOS.__getitem__, texto))  # Ancho de cada carácter (map en C: mucho más rápido que stringWidth por celda)
+    disponible = (ancho - 4) * 1000 / 8  # Espacio de la celda en milésimas de Helvetica 8
+    if sum(anchos) <= disponible:  # Medido: cabe
+        return texto  # Sin cambios
+    usado, limite = 0.0, disponible - _ANCHO_PUNTOS  # Espacio para el texto sin los "…"
+    for i, a in enumerate(anchos):  # Carácter a carácter
+        usado += a  # Ancho acumulado
+        if usado > limite:  # Este ya no cabe
+            return texto[:i] + "…"  # Cortamos aquí
+    return texto + "…"  # No se alcanza (el texto completo no cabía)
 
-    data = [[c.upper() for c in CAMPOS]]  # Primera fila (encabezados)
-    for r in registros:  # Recorremos registros
-        data.append([str(r.get(c, "")) for c in CAMPOS])  # Agregamos cada fila como texto (para evitar problemas de tipos)
+def _filas_pdf(registros: List[Dict[str, Any]], agrupar: bool) -> Iterator[Any]:  # Filas del PDF en orden (datos y, si se agrupa, encabezados de categoría)
+    if not agrupar:  # Sin agrupar: una fila por producto, en el orden de la vista
+        for r in registros:  # Recorremos
+            yield [_recortar(str(r.get(c, "")), w) for c, w in zip(CAMPOS, ANCHOS_PDF)]  # Fila como texto
+        return  # Fin
 
-    tabla = Table(data, repeatRows=1)  # Creamos tabla y repetimos encabezado en cada página
-    tabla.setStyle(TableStyle([  # Definimos estilo de tabla
+    grupos: Dict[str, List[Dict[str, Any]]] = {}  # Categoría → productos (referencias, sin copiar)
+    for r in registros:  # Un solo recorrido
+        grupos.setdefault(str(r.get("categoria", "")), []).append(r)  # Agrupamos conservando el orden
+    for categoria in sorted(grupos):  # Categorías en orden alfabético
+        productos = grupos[categoria]  # Productos de la categoría
+        valor = math.fsum(subtotal_producto(p) for p in productos)  # Valor de la categoría
+        yield (_GRUPO, f"{categoria or 'Sin categoría'} — {len(productos):,} productos — valor inventario {valor:,.0f}")  # Encabezado
+        for r in productos:  # Productos del grupo
+            yield [_recortar(str(r.get(c, "")), w) for c, w in zip(CAMPOS, ANCHOS_PDF)]  # Fila como texto
+
+def _total_filas_pdf(registros: List[Dict[str, Any]], agrupar: bool) -> int:  # Cantidad de filas que tendrá el PDF (sin recorrer dos veces las filas)
+    if not agrupar:  # Sin agrupar
+        return len(registros)  # Una por producto
+    return len(registros) + len({str(r.get("categoria", "")) for r in registros})  # Más un encabezado por categoría
+
+def _paginas_pdf(filas: Iterable[Any]) -> Iterator[List[Any]]:  # Corta el flujo de filas en páginas
+    it = iter(filas)  # Iterador único
+    while True:  # Hasta agotar
+        pagina = list(islice(it, FILAS_PAGINA))  # Filas de la página
+        if not pagina:  # Se acabó
+            return  # Fin
+        yield pagina  # Página
+
+def _estilo_base():  # Estilo común de todas las tablas (se crea una vez por archivo)
+    return [  # Lista de comandos de TableStyle
         ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),  # Fondo gris claro para encabezado
         ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),  # Rejilla de la tabla
         ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),  # Fuente negrita para encabezado
         ("FONTSIZE", (0, 0), (-1, -1), 8),  # Tamaño letra
         ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),  # Alineación vertical
-    ]))  # Fin del estilo
+    ]
+
+def _dibujar_paginas(c, paginas: Iterable[List[Any]], primera: int, total_paginas: int, titulo: str, progreso: Progreso = None) -> int:  # Dibuja páginas en un canvas
+    ancho, alto = letter  # Tamaño de la hoja
+    base = _estilo_base()  # Estilo común
+    encabezado = [c_.upper() for c_ in CAMPOS]  # Fila de encabezados (se repite en cada página)
+    x = (ancho - sum(ANCHOS_PDF)) / 2  # Tabla centrada
+    numero = primera  # Número de la página actual
+    filas_hechas = 0  # Filas dibujadas (para el progreso)
+    for pagina in paginas:  # Página a página
+        tope = alto - MARGEN  # Borde superior disponible
+        if numero == 1:  # Primera página: título
+            parrafo = Paragraph(titulo, getSampleStyleSheet()["Title"])  # Título
+            _, h = parrafo.wrapOn(c, ancho - 2 * MARGEN, MARGEN * 3)  # Medimos
+            parrafo.drawOn(c, MARGEN, tope - h)  # Dibujamos
+            tope -= h + 12  # Espacio bajo el título
+
+        datos = [encabezado]  # Encabezado + filas
+        estilo = list(base)  # Estilo de esta página
+        for i, fila in enumerate(pagina, start=1):  # Filas de la página
+            if isinstance(fila, tuple):  # Encabezado de categoría: ocupa toda la fila
+                datos.append([fila[1]] + [""] * (len(CAMPOS) - 1))  # Texto en la primera celda
+                estilo += [("SPAN", (0, i), (-1, i)), ("BACKGROUND", (0, i), (-1, i), colors.whitesmoke), ("FONTNAME", (0, i), (-1, i), "Helvetica-Bold")]  # Celda combinada en negrita
+            else:  # Fila de producto
+                datos.append(fila)  # Tal cual
+        tabla = Table(datos, colWidths=ANCHOS_PDF, rowHeights=ALTO_FILA)  # Anchos y altos fijos: reportlab no mide celda por celda
+        tabla.setStyle(TableStyle(estilo))  # Estilo
+        _, h = tabla.wrapOn(c, ancho, alto)  # Calcula la disposición (barato: todo es fijo)
+        tabla.drawOn(c, x, tope - h)  # Dibujamos
+
+        c.setFont("Helvetica", 8)  # Pie de página
+        c.drawRightString(ancho - MARGEN, MARGEN / 2, f"Página {numero} de {total_paginas}")  # Número de página
+        c.showPage()  # Cerramos la página
+        numero += 1  # Siguiente
+        filas_hechas += len(pagina)  # Contamos
+        if progreso:  # Si hay callback
+            progreso(filas_hechas, 0)  # Avance (el llamador conoce el total)
+    return numero - primera  # Páginas dibujadas
+
+def _nuevo_canvas(ruta: str):  # Canvas carta con compresión (el contenido de cada página queda comprimido hasta guardar)
+    return Canvas(ruta, pagesize=letter, pageCompression=1)  # Canvas
+
+def _dibujar_parte(ruta: str, paginas: List[List[Any]], primera: int, total_paginas: int, titulo: str) -> int:  # Proceso hijo: dibuja un tramo de páginas a un PDF propio
+    c = _nuevo_canvas(ruta)  # Canvas del tramo
+    n = _dibujar_paginas(c, paginas, primera, total_paginas, titulo)  # Dibujamos
+    c.save()  # Guardamos
+    return n  # Páginas dibujadas
+
+def _procesos_pdf(procesos: int) -> int:  # Procesos realmente usables (el modo paralelo necesita pypdf para unir)
+    if procesos <= 1:  # Secuencial pedido
+        return 1  # Uno
+    if importlib.util.find_spec("pypdf") is None:  # pypdf es opcional (solo comprobamos que esté, sin importarlo)
+        return 1  # Secuencial
+    return procesos  # Paralelo
+
+def exportar_pdf(  # Exporta a PDF por páginas (memoria y tiempo lineales), opcionalmente agrupado por categoría y en paralelo
+    registros: List[Dict[str, Any]],  # Filas a exportar
+    ruta: str,  # PDF de salida
+    titulo: str = "Reporte de Productos",  # Título de la primera página
+    progreso: Progreso = None,  # Callback progreso(hechos, total)
+    agrupar_por_categoria: bool = False,  # True = un bloque por categoría con cantidad y valor
+    procesos: int = 1,  # >1 = dibuja tramos de páginas en procesos separados y los une (requiere pypdf)
+) -> int:  # Retorna la cantidad de páginas
+    total_filas = _total_filas_pdf(registros, agrupar_por_categoria)  # Filas del PDF
+    total_paginas = max(1, -(-total_filas // FILAS_PAGINA))  # Páginas (división hacia arriba; al menos una)
+    paginas = _paginas_pdf(_filas_pdf(registros, agrupar_por_categoria))  # Flujo de páginas (se arma al vuelo)
+    avance = (lambda hechos, _: progreso(hechos, total_filas)) if progreso else None  # Progreso con el total real
+
+    if _procesos_pdf(procesos) == 1 or total_paginas <= PAGINAS_POR_PARTE:  # Secuencial (o muy chico para repartir)
+        c = _nuevo_canvas(ruta)  # Canvas del archivo final
+        _dibujar_paginas(c, paginas if total_filas else iter([[]]), 1, total_paginas, titulo, avance)  # Sin filas: una página con título y encabezado
+        c.save()  # Guardamos el PDF final
+    else:  # Paralelo
+        _exportar_pdf_paralelo(paginas, ruta, total_paginas, titulo, procesos, avance)  # Tramos en procesos + unión
+    if progreso:  # Si hay callback
+        progreso(total_filas, total_filas)  # Terminado
+    return total_paginas  # Cantidad de páginas
+
+def _exportar_pdf_paralelo(paginas: Iterator[List[Any]], ruta: str, total_paginas: int, titulo: str, procesos: int, progreso: Progreso) -> None:  # Reparte tramos de páginas entre procesos y los une en orden
+    import multiprocessing  # Contexto "spawn" (seguro aunque la app tenga hilos y Tk)
+    import tempfile  # Carpeta para los tramos
+    import shutil  # Borrado de la carpeta temporal
+    from concurrent.futures import ProcessPoolExecutor  # Pool de procesos
+    from pypdf import PdfWriter  # Unión de PDFs
+
+    carpeta = tempfile.mkdtemp(prefix="sgp_pdf_")  # Tramos temporales
+    partes: List[str] = []  # Archivos de los tramos, en orden
+    try:  # Siempre limpiamos
+        pool = ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context("spawn"))  # Pool
+        try:  # Si se cancela o falla un tramo, no se dibujan los tramos que aún no empezaron
+            en_vuelo: deque = deque()  # (futuro, filas del tramo) en orden de envío
+            hechas = 0  # Filas de tramos terminados
+
+            def esperar_uno() -> None:  # Espera el tramo más antiguo e informa avance
+                nonlocal hechas  # Contador compartido
+                futuro, filas = en_vuelo.popleft()  # Más antiguo
+                futuro.result()  # Propaga errores del proceso
+                hechas += filas  # Contamos
+                if progreso:  # Si hay callback
+                    progreso(hechas, 0)  # Avance (permite cancelar)
+
+            primera = 1  # Primera página del próximo tramo
+            while True:  # Tramo a tramo
+                tramo = list(islice(paginas, PAGINAS_POR_PARTE))  # Páginas del tramo
+                if not tramo:  # No quedan
+                    break  # Fin del envío
+                if len(en_vuelo) >= 2 * procesos:  # Como mucho 2 tramos por proceso en memoria
+                    esperar_uno()  # Esperamos al más antiguo
+                partes.append(os.path.join(carpeta, f"{len(partes):05d}.pdf"))  # Archivo del tramo
+                en_vuelo.append((pool.submit(_dibujar_parte, partes[-1], tramo, primera, total_paginas, titulo), sum(map(len, tramo))))  # Enviamos
+                primera += len(tramo)  # Numeración del siguiente tramo
+            while en_vuelo:  # Esperamos lo que falta
+                esperar_uno()  # Uno a uno
+        finally:  # Pase lo que pase
+            pool.shutdown(wait=True, cancel_futures=True)  # Cerramos los procesos
+
+        escritor = PdfWriter()  # PDF final
+        for parte in partes:  # En orden
+            escritor.append(parte)  # Agregamos las páginas del tramo
+        with open(ruta, "wb") as f:  # Archivo final
+            escritor.write(f)  # Escribimos
+    finally:  # Pase lo que pase
+        shutil.rmtree(carpeta, ignore_errors=True)  # Borramos los tramos
+
+def iterar_excel(ruta: str, progreso: Progreso = None) -> Iterator[Tuple[int, Dict[str, Any]]]:  # Lee la primera hoja fila a fila (modo solo lectura, memoria constante)
+    wb = load_workbook(ruta, read_only=True, data_only=True)  # Solo lectura: las filas se leen del XML a medida que se piden
+    try:  # El libro en modo lectura mantiene el archivo abierto: lo cerramos siempre
+        ws = wb.active  # Tomamos la primera hoja (activa)
+        filas = ws.iter_rows(values_only=True)  # Iterador de tuplas de valores
+        encabezado = next(filas, None)  # Primera fila (encabezados)
+        if encabezado is None:  # Hoja vacía
+            return  # Nada que leer
+        headers = [str(v).strip().lower() if v else "" for v in encabezado]  # Normalizamos encabezados a minúscula
+
+        total = max((ws.max_row or 0) - 1, 0)  # Filas de datos según la dimensión guardada (0 = desconocido)
+        for fila_excel, row in enumerate(filas, start=2):  # Recorremos filas desde la segunda (datos)
+            if progreso and fila_excel % CADA_FILAS == 0:  # Cada cierto número de filas
+                progreso(fila_excel - 1, total)  # Informamos avance (y permitimos cancelar)
+            if all(v is None or str(v).strip() == "" for v in row):  # Si la fila está completamente vacía
+                continue  # La saltamos
+            yield fila_excel, {h: v for h, v in zip(headers, row) if h}  # Número de fila real + dict (sin columnas sin encabezado)
+    finally:  # Pase lo que pase
+        wb.close()  # Liberamos el archivo
+
+def importar_excel(ruta: str, progreso: Progreso = None) -> List[Dict[str, Any]]:  # Función para importar registros desde Excel (lista completa)
+    return [item for _, item in iterar_excel(ruta, progreso)]  # Misma lectura en streaming, materializada en una lista
+
+# ------------------------- ARCHIVOS PLANOS (CSV / NDJSON) -------------------------
+# Para sistemas que solo necesitan los datos: sin estilos ni hojas, con escrituras grandes de a muchas filas.
+# Un nombre terminado en .gz se escribe comprimido; al leer, el gzip se detecta por su firma (no por el nombre).
+
+BUFFER_ARCHIVO = 1024 * 1024  # Buffer de lectura/escritura (1 MB: pocas llamadas al sistema y a zlib)
+FILAS_ESCRITURA = 5000  # Filas que se arman en memoria antes de cada escritura
+NIVEL_GZIP = 6  # Compresión: casi el tamaño del nivel 9 a una fracción del tiempo
+
+_FIRMA_GZIP = b"\x1f\x8b"  # Primeros bytes de todo archivo gzip
+_JSON_LINEA = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode  # Serializador compacto (se crea una sola vez)
+
+def formato_archivo(ruta: str) -> str:  # "csv", "ndjson" o "excel" según la extensión (sin contar un .gz final)
+    base = ruta[:-3] if ruta.lower().endswith(".gz") else ruta  # productos.csv.gz → productos.csv
+    return {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}.get(os.path.splitext(base)[1].lower(), "excel")  # Por extensión
+
+def _abrir_escritura(ruta: str) -> io.TextIOWrapper:  # Texto UTF-8 con buffer grande (comprimido si la ruta termina en .gz)
+    if ruta.lower().endswith(".gz"):  # Comprimido
+        binario = io.BufferedWriter(gzip.GzipFile(ruta, "wb", compresslevel=NIVEL_GZIP), BUFFER_ARCHIVO)  # zlib recibe trozos grandes
+        return io.TextIOWrapper(binario, encoding="utf-8", newline="")  # Texto sobre el gzip
+    return open(ruta, "w", encoding="utf-8", newline="", buffering=BUFFER_ARCHIVO)  # Archivo normal
+
+def _abrir_lectura(ruta: str) -> io.TextIOWrapper:  # Texto UTF-8 con buffer grande (descomprime si el archivo es gzip)
+    with open(ruta, "rb") as f:  # Miramos la firma
+        comprimido = f.read(2) == _FIRMA_GZIP  # gzip aunque no se llame .gz
+    if comprimido:  # Comprimido
+        binario = io.BufferedReader(gzip.GzipFile(ruta, "rb"), BUFFER_ARCHIVO)  # Descompresión en trozos grandes
+        return io.TextIOWrapper(binario, encoding="utf-8-sig", newline="")  # utf-8-sig: acepta el BOM de Excel
+    return open(ruta, "r", encoding="utf-8-sig", newline="", buffering=BUFFER_ARCHIVO)  # Archivo normal
+
+def _escribir_en_bloques(ruta: str, registros: Iterable[Dict[str, Any]], inicio: str, texto_bloque: Callable[[List[Dict[str, Any]]], str], progreso: Progreso) -> int:  # Escribe un encabezado y luego bloques de FILAS_ESCRITURA filas
+    total = len(registros) if hasattr(registros, "__len__") else 0  # Total si se conoce (un generador no lo tiene)
+    escritas = 0  # Filas escritas
+    it = iter(registros)  # Un solo recorrido (sirve con generadores)
+    with _abrir_escritura(ruta) as f:  # Archivo (o gzip)
+        f.write(inicio)  # Encabezado (vacío en NDJSON)
+        while True:  # Bloque a bloque
+            bloque = list(islice(it, FILAS_ESCRITURA))  # Siguientes filas
+            if not bloque:  # Se acabó el flujo
+                break  # Fin
+            f.write(texto_bloque(bloque))  # Una sola escritura por bloque
+            escritas += len(bloque)  # Contamos
+            if progreso:  # Si hay callback
+                progreso(escritas, total)  # Informamos avance (y permitimos cancelar)
+    if progreso:  # Si hay callback
+        progreso(escritas, total or escritas)  # Terminado
+    return escritas  # Cantidad de filas exportadas
+
+def exportar_csv(registros: Iterable[Dict[str, Any]], ruta: str, progreso: Progreso = None, separador: str = ",") -> int:  # Exporta a CSV en streaming (columnas de CAMPOS)
+    buffer = io.StringIO()  # Texto del bloque
+    escritor = csv.writer(buffer, delimiter=separador, lineterminator="\n")  # Comillas solo donde hacen falta
 
-    story.append(tabla)  # Agregamos tabla al PDF
-    doc.build(story)  # Construimos el PDF final
+    def texto_bloque(bloque: List[Dict[str, Any]]) -> str:  # Un bloque de filas como texto CSV
+        buffer.seek(0)  # Reutilizamos el buffer
+        buffer.truncate()  # Vacío
+        escritor.writerows([r.get(c, "") for c in CAMPOS] for r in bloque)  # Filas en el orden de CAMPOS
+        return buffer.getvalue()  # Texto del bloque
 
-def importar_excel(ruta: str) -> List[Dict[str, Any]]:  # Función para importar registros desde Excel
-    wb = load_workbook(ruta)  # Abrimos el Excel
-    ws = wb.active  # Tomamos la primera hoja (activa)
+    return _escribir_en_bloques(ruta, registros, separador.join(CAMPOS) + "\n", texto_bloque, progreso)  # Encabezado + bloques
 
-    headers = []  # Lista donde guardaremos los nombres de columnas del Excel
-    for cell in ws[1]:  # Recorremos la primera fila (encabezados)
-        headers.append(str(cell.value).strip().lower() if cell.value else "")  # Normalizamos encabezado a minúscula
+def exportar_ndjson(registros: Iterable[Dict[str, Any]], ruta: str, progreso: Progreso = None) -> int:  # Exporta a NDJSON en streaming (un producto por línea, claves en el orden de CAMPOS)
+    def texto_bloque(bloque: List[Dict[str, Any]]) -> str:  # Un bloque de filas como líneas JSON
+        return "".join([_JSON_LINEA({c: r.get(c) for c in CAMPOS if r.get(c) is not None}) + "\n" for r in bloque])  # Tipos nativos (números y booleanos)
 
-    registros = []  # Lista de registros (cada uno será un dict)
-    for row in ws.iter_rows(min_row=2, values_only=True):  # Recorremos filas desde la segunda (datos)
-        if all(v is None or str(v).strip() == "" for v in row):  # Si la fila está completamente vacía
-            continue  # La saltamos
+    return _escribir_en_bloques(ruta, registros, "", texto_bloque, progreso)  # Sin encabezado
 
-        item = {}  # Diccionario para la fila actual
-        for h, v in zip(headers, row):  # Asociamos encabezado con valor
-            if not h:  # Si el encabezado está vacío
-                continue  # Saltamos esa columna
-            item[h] = v  # Guardamos en dict (clave=encabezado, valor=celda)
+def iterar_csv(ruta: str, progreso: Progreso = None) -> Iterator[Tuple[int, Dict[str, Any]]]:  # Lee un CSV (o .csv.gz) fila a fila, como iterar_excel
+    with _abrir_lectura(ruta) as f:  # Buffer grande
+        primera = f.readline()  # Encabezado
+        separador = ";" if primera.count(";") > primera.count(",") else ","  # Acepta el CSV de Excel en español
+        headers = [h.strip().lower() for h in next(csv.reader([primera], delimiter=separador), [])]  # Normalizamos encabezados a minúscula
+        lector = csv.reader(f, delimiter=separador)  # Resto del archivo (se lee de a bloques del buffer)
+        for leidas, row in enumerate(lector, start=1):  # Registro a registro
+            if progreso and leidas % CADA_FILAS == 0:  # Cada cierto número de filas
+                progreso(leidas, 0)  # Total desconocido (barra indeterminada); permite cancelar
+            if not any(v.strip() for v in row):  # Fila vacía
+                continue  # La saltamos
+            yield lector.line_num + 1, {h: v for h, v in zip(headers, row) if h}  # Línea real del archivo (la 1 es el encabezado) + dict
 
-        registros.append(item)  # Agregamos la fila como dict a la lista
+def iterar_ndjson(ruta: str, progreso: Progreso = None) -> Iterator[Tuple[int, Dict[str, Any]]]:  # Lee un NDJSON (o .ndjson.gz) línea a línea, como iterar_excel
+    with _abrir_lectura(ruta) as f:  # Buffer grande
+        for numero, linea in enumerate(f, start=1):  # Una línea por producto
+            if progreso and numero % CADA_FILAS == 0:  # Cada cierto número de filas
+                progreso(numero, 0)  # Total desconocido (barra indeterminada); permite cancelar
+            if not linea.strip():  # Línea vacía
+                continue  # La saltamos
+            try:  # Cada línea es un objeto JSON
+                item = json.loads(linea)  # Producto
+            except json.JSONDecodeError as e:  # Archivo dañado
+                raise ValueError(f"Línea {numero}: JSON inválido ({e.msg}).") from e  # Como un Excel ilegible: se informa y se detiene
+            if not isinstance(item, dict):  # Debe ser un objeto
+                raise ValueError(f"Línea {numero}: se esperaba un objeto JSON.")  # Formato incorrecto
+            yield numero, {str(k).strip().lower(): v for k, v in item.items()}  # Claves en minúscula (igual que los encabezados)
 
-    return registros  # Retornamos la lista de dicts importados
+def iterar_filas(ruta: str, progreso: Progreso = None) -> Iterator[Tuple[int, Dict[str, Any]]]:  # Lectura en streaming según el formato del archivo
+    lector = {"csv": iterar_csv, "ndjson": iterar_ndjson}.get(formato_archivo(ruta), iterar_excel)  # Por extensión
+    return lector(ruta, progreso)  # (número de fila, dict) con las mismas claves en todos los formatos
@@ -1,4 +1,6 @@
-from typing import List, Dict, Any  # Importamos tipos para claridad
+import math  # fsum: suma de floats sin acumular error de redondeo
+import operator  # operator.mul para multiplicar columnas sin bucle Python
+from typing import List, Dict, Any, Iterable  # Importamos tipos para claridad
 
 def valor_inventario_recursivo(productos: List[Dict[str, Any]], i: int = 0) -> float:  # Función recursiva (requisito)
     if i >= len(productos):  # Caso base: si el índice llegó al final
@@ -7,3 +9,84 @@ def valor_inventario_recursivo(productos: List[Dict[str, Any]], i: int = 0) -> f
     p = productos[i]  # Tomamos el producto actual
     subtotal = float(p.get("precio", 0.0)) * int(p.get("stock", 0))  # Calculamos precio * stock
     return subtotal + valor_inventario_recursivo(productos, i + 1)  # Llamada recursiva al siguiente índice
+
+def subtotal_producto(p: Dict[str, Any]) -> float:  # Valor de un producto: precio * stock (mismo cálculo que la versión recursiva)
+    return float(p.get("precio", 0.0)) * int(p.get("stock", 0))  # Precio por stock
+
+def valor_inventario(productos: Iterable[Dict[str, Any]]) -> float:  # Versión iterativa: sirve para cualquier tamaño de catálogo
+    return math.fsum(subtotal_producto(p) for p in productos)  # Un solo recorrido, sin un frame de recursión por producto
+
+def valor_columnas(precios: Iterable[float], stocks: Iterable[int]) -> float:  # Suma de precio*stock sobre columnas ya armadas
+    return math.fsum(map(operator.mul, precios, stocks))  # Multiplicación y suma en C, sin bucle Python
+
+
+class ValorizacionInventario:  # Total del inventario (y por categoría) mantenido al día en O(1) por cambio
+    def __init__(self, productos: Iterable[Dict[str, Any]] = ()):  # Constructor (valoriza los productos iniciales)
+        self._total = [0.0, 0.0]  # [suma, compensación] del valor total (suma de Neumaier)
+        self._por_categoria: Dict[str, List[float]] = {}  # Categoría → [suma, compensación] de sus productos
+        for p in productos:  # Recorremos una sola vez
+            self.al_agregar(p)  # Sumamos cada producto
+
+    @property
+    def total(self) -> float:  # Valor total del inventario
+        return self._total[0] + self._total[1]  # Suma más el error acumulado
+
+    @property
+    def por_categoria(self) -> Dict[str, float]:  # Categoría → valor de sus productos (copia)
+        return {cat: s + c for cat, (s, c) in self._por_categoria.items()}  # Son pocas categorías
+
+    def al_agregar(self, p: Dict[str, Any]) -> None:  # Suma un producto nuevo
+        self._sumar(p, 1)  # Signo positivo
+
+    def al_eliminar(self, p: Dict[str, Any]) -> None:  # Resta un producto eliminado
+        self._sumar(p, -1)  # Signo negativo
+
+    def al_actualizar(self, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:  # Ajusta por un producto modificado
+        self._sumar(anterior, -1)  # Quitamos el valor anterior
+        self._sumar(nuevo, 1)  # Sumamos el nuevo
+
+    def al_actualizar_varios(self, pares: List[tuple]) -> None:  # Muchos cambios juntos (ej. ajuste de precios a una selección)
+        self._sumar_varios((anterior for anterior, _ in pares), -1)  # Quitamos los valores anteriores
+        self._sumar_varios((nuevo for _, nuevo in pares), 1)  # Sumamos los nuevos
+
+    def al_eliminar_varios(self, bajas: List[tuple]) -> None:  # Muchas bajas juntas
+        self._sumar_varios((p for p, in bajas), -1)  # Todas restan
+
+    def _sumar_varios(self, productos: Iterable[Dict[str, Any]], signo: int) -> None:  # Agrupa los subtotales por categoría y suma cada grupo con fsum (una sola acumulación por categoría)
+        grupos: Dict[str, List[float]] = {}  # Categoría → subtotales
+        for p in productos:  # Cada producto
+            cat = p.get("categoria", "Otro")  # Igual que _sumar
+            valores = grupos.get(cat)  # Subtotales de su categoría
+            if valores is None:  # Primera vez en este lote
+                grupos[cat] = [subtotal_producto(p)]  # Lista nueva
+            else:  # Ya existe
+                valores.append(subtotal_producto(p))  # Agregamos
+        for cat, valores in grupos.items():  # Pocas categorías
+            suma = math.fsum(valores)  # Suma del grupo (redondeada una vez)
+            valores.append(-suma)  # Lo que se perdió al redondear:
+            resto = math.fsum(valores)  # fsum lo calcula exacto (así el lote no arrastra más error que los cambios sueltos)
+            acumulado = self._por_categoria.get(cat)  # Acumulador de la categoría
+            if acumulado is None:  # Primera vez que aparece
+                acumulado = self._por_categoria[cat] = [0.0, 0.0]  # Lo creamos
+            for valor in (signo * suma, signo * resto):  # Suma y resto
+                _acumular(self._total, valor)  # Ajustamos el total
+                _acumular(acumulado, valor)  # Ajustamos el subtotal de la categoría
+
+    def _sumar(self, p: Dict[str, Any], signo: int) -> None:  # Aplica el subtotal de un producto con signo
+        valor = signo * subtotal_producto(p)  # Subtotal con signo
+        cat = p.get("categoria", "Otro")  # Categoría (igual que reportes.conteo_por_categoria)
+        _acumular(self._total, valor)  # Ajustamos el total
+        acumulado = self._por_categoria.get(cat)  # Acumulador de la categoría
+        if acumulado is None:  # Primera vez que aparece
+            acumulado = self._por_categoria[cat] = [0.0, 0.0]  # Lo creamos
+        _acumular(acumulado, valor)  # Ajustamos el subtotal de la categoría
+
+
+def _acumular(acumulado: List[float], valor: float) -> None:  # Suma compensada (Neumaier): no arrastra error con altas y bajas
+    suma = acumulado[0]  # Suma actual
+    nueva = suma + valor  # Suma redondeada
+    if abs(suma) >= abs(valor):  # El menor de los dos es el que pierde bits
+        acumulado[1] += (suma - nueva) + valor  # Guardamos lo que se perdió de valor
+    else:  # valor es el mayor
+        acumulado[1] += (valor - nueva) + suma  # Guardamos lo que se perdió de suma
+    acumulado[0] = nueva  # Nueva suma
@@ -1,18 +1,246 @@
-from typing import List, Dict, Any  # Tipos para documentar estructuras de datos
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Callable, Tuple  # Tipos para documentar estructuras de datos
+
+from .indice_busqueda import IndiceBusqueda, normalizar_consulta  # Índice invertido de trigramas para buscar() rápido
+from .indices_ordenados import IndiceOrdenado  # Índices secundarios ordenados (precio, stock, creado_en)
+from .huellas import HuellasContenido  # Huella del contenido por SKU (detecta cambios que no cambian nada)
+
+
+class CatalogoProductos:  # Almacén de productos con índice hash SKU → posición (búsqueda, edición y borrado O(1))
+    def __init__(self, productos: Optional[List[Dict[str, Any]]] = None):  # Constructor (opcionalmente con productos iniciales)
+        self._items: List[Optional[Dict[str, Any]]] = []  # Lista interna en orden de inserción (None = hueco eliminado)
+        self._pos: Dict[str, int] = {}  # Índice hash: SKU → posición en self._items
+        self._huecos = 0  # Cantidad de posiciones eliminadas pendientes de compactar
+        self._observadores: List[Any] = []  # Componentes que se actualizan con cada cambio (índices, totales, etc.)
+        self._indice: Optional[IndiceBusqueda] = None  # Índice de búsqueda (se crea en la primera búsqueda)
+        self._agregados = None  # Conteos por categoría e índice por stock (se crean en el primer reporte)
+        self._ordenados: Dict[str, IndiceOrdenado] = {}  # Campo → índice ordenado (se crea en la primera consulta por ese campo)
+        self._huellas: Optional[HuellasContenido] = None  # Huella del contenido por SKU (se crea en la primera importación)
+        self.version = 0  # Se incrementa con cada cambio (sirve para detectar si el catálogo cambió)
+        self.duplicados: List[Tuple[int, Dict[str, Any]]] = []  # (posición en la lista cargada, producto) descartados por SKU repetido
+
+        for i, p in enumerate(productos or []):  # Cargamos los productos iniciales (si vienen)
+            if not self.agregar(p):  # Cada uno entra al índice (el índice exige SKU único: gana la primera aparición)
+                self.duplicados.append((i, p))  # Se anota para avisar (antes la lista los conservaba todos)
+
+    # ------------------------- LECTURA -------------------------
+
+    def __len__(self) -> int:  # Cantidad de productos vivos
+        return len(self._pos)  # El índice tiene exactamente un SKU por producto
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:  # Recorre los productos en orden de inserción
+        return (p for p in self._items if p is not None)  # Saltamos los huecos de productos eliminados
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:  # Acceso por posición (compatibilidad con código que usa listas)
+        self._compactar()  # Sin huecos, la posición interna coincide con la visible
+        return self._items[i]  # Retornamos el producto en esa posición
+
+    def __contains__(self, sku: object) -> bool:  # Permite escribir: sku in catalogo
+        return sku in self._pos  # Consulta O(1) en el índice
+
+    @property
+    def skus(self):  # Conjunto vivo de SKUs (se mantiene solo, no hay que reconstruirlo)
+        return self._pos.keys()  # Vista tipo set sobre el índice (soporta "in", len, iteración)
+
+    def obtener(self, sku: str) -> Optional[Dict[str, Any]]:  # Retorna el producto de un SKU o None
+        pos = self._pos.get(sku)  # Buscamos la posición en el índice
+        return None if pos is None else self._items[pos]  # Retornamos el producto si existe
+
+    def posicion(self, sku: str) -> int:  # Posición visible del SKU (como list.index) o -1
+        self._compactar()  # Quitamos huecos para que la posición sea la real
+        return self._pos.get(sku, -1)  # Retornamos posición o -1
+
+    @property
+    def agregados(self):  # reportes.AgregadosReporte vivo (se crea la primera vez; luego se actualiza solo con cada cambio)
+        if self._agregados is None:  # Primer reporte
+            from .reportes import AgregadosReporte  # Import local (evita import circular)
+            self._agregados = AgregadosReporte(self, por_stock=self.indice_ordenado("stock"))  # Un recorrido completo, una sola vez (comparte el índice por stock)
+            self.suscribir(self._agregados)  # Desde ahora se ajusta en cada alta/cambio/baja
+        return self._agregados  # Agregados al día
+
+    @property
+    def huellas(self) -> HuellasContenido:  # SKU → huella del contenido (se crea la primera vez; luego se actualiza sola con cada cambio)
+        if self._huellas is None:  # Primera consulta
+            self._huellas = HuellasContenido(self)  # Un recorrido completo, una sola vez
+            self.suscribir(self._huellas)  # Desde ahora se ajusta en cada alta/cambio/baja
+        return self._huellas  # Huellas al día
+
+    def indice_ordenado(self, campo: str) -> IndiceOrdenado:  # Índice vivo ordenado por "precio", "stock" o "creado_en"
+        indice = self._ordenados.get(campo)  # ¿Ya existe?
+        if indice is None:  # Primera consulta por ese campo
+            indice = self._ordenados[campo] = IndiceOrdenado(campo, self)  # Un solo sort
+            self.suscribir(indice)  # Desde ahora se ajusta en cada alta/cambio/baja
+        return indice  # Índice al día
+
+    def como_lista(self) -> List[Dict[str, Any]]:  # Copia superficial en forma de lista (para JSON, exportar, etc.)
+        return list(self)  # Lista con los productos vivos
+
+    def buscar(self, texto: str, por_relevancia: bool = False) -> List[Dict[str, Any]]:  # Busca por SKU/nombre/categoría usando el índice
+        q = normalizar_consulta(texto)  # Normalizamos igual que la búsqueda lineal
+        if not q:  # Si no hay texto de búsqueda
+            return self.como_lista()  # Devolvemos todos
+
+        resultado = self.buscar_por_indice(q)  # Pocos candidatos: directo del índice
+        if resultado is None:  # Consulta corta o muy frecuente
+            textos = self.indice_busqueda.textos  # Textos ya normalizados (sin casefold por consulta)
+            resultado = [p for p in self._items if p is not None and q in textos[p.get("sku")]]  # Recorrido en orden del catálogo
+
+        if por_relevancia:  # SKU exacto primero, luego prefijo, luego subcadena (sort estable: conserva el orden del catálogo)
+            indice = self.indice_busqueda  # Referencia local
+            resultado.sort(key=lambda p: indice.relevancia(q, p.get("sku")))  # Ordenamos por relevancia
+        return resultado  # Productos encontrados
+
+    @property
+    def indice_busqueda(self) -> IndiceBusqueda:  # Índice de búsqueda vivo (se crea la primera vez)
+        if self._indice is None:  # Primera búsqueda: construimos el índice una sola vez
+            self._indice = IndiceBusqueda(self)  # Indexa todos los productos actuales
+            self.suscribir(self._indice)  # Desde ahora se actualiza solo con cada cambio
+        return self._indice  # Índice al día
+
+    def buscar_por_indice(self, q: str) -> Optional[List[Dict[str, Any]]]:  # Resultado de q (ya normalizada) desde el índice; None = conviene recorrer
+        skus = self.indice_busqueda.candidatos(q)  # SKUs que contienen el texto (None = conviene recorrer)
+        if skus is None:  # Consulta corta o muy frecuente
+            return None  # Que recorra quien llama (de una vez o por partes)
+        return [self._items[i] for i in sorted(self._pos[s] for s in skus)]  # Mismo orden que la búsqueda lineal
+
+    def filtrar(self, registros: Iterable[Dict[str, Any]], q: str) -> List[Dict[str, Any]]:  # Los registros (del catálogo) que contienen q (ya normalizada), en su orden
+        textos = self.indice_busqueda.textos  # Textos ya normalizados
+        return [p for p in registros if q in textos.get(p.get("sku"), "")]  # Sirve para acotar un resultado anterior o recorrer por tramos
+
+    # ------------------------- OBSERVADORES -------------------------
+
+    def suscribir(self, observador: Any) -> None:  # Registra un componente con métodos al_agregar/al_actualizar/al_eliminar
+        self._observadores.append(observador)  # Lo agregamos a la lista de avisos
+
+    def desuscribir(self, observador: Any) -> None:  # Deja de avisar a un componente
+        if observador in self._observadores:  # Si estaba registrado
+            self._observadores.remove(observador)  # Lo quitamos
+
+    def _avisar(self, evento: str, *args: Any) -> None:  # Notifica un cambio a todos los observadores
+        self.version += 1  # Nueva versión del catálogo
+        for obs in self._observadores:  # Recorremos observadores
+            getattr(obs, evento)(*args)  # Llamamos al método del evento
+
+    def _avisar_varios(self, evento: str, cambios: List[tuple]) -> None:  # Notifica muchos cambios juntos (una sola versión nueva)
+        self.version += 1  # Nueva versión del catálogo
+        for obs in self._observadores:  # Recorremos observadores
+            en_lote = getattr(obs, evento + "_varios", None)  # ¿Sabe procesarlos juntos? (ej. un índice que conviene reconstruir)
+            if en_lote is not None:  # Sí
+                en_lote(cambios)  # Una sola llamada con todo
+            else:  # No: uno por uno, igual que con cambios sueltos
+                uno = getattr(obs, evento)  # Método del evento
+                for args in cambios:  # Cada cambio
+                    uno(*args)  # Mismos argumentos que _avisar
+
+    # ------------------------- ESCRITURA -------------------------
+
+    def agregar(self, producto: Dict[str, Any]) -> bool:  # Agrega un producto (CRUD: Create) en O(1)
+        sku = producto.get("sku")  # SKU del producto nuevo
+        if sku in self._pos:  # Si ya existe, no se duplica (el índice exige SKU único)
+            return False  # No se agregó
+        self._pos[sku] = len(self._items)  # Registramos la posición final
+        self._items.append(producto)  # Append al final de la lista
+        self._avisar("al_agregar", producto)  # Avisamos el alta
+        return True  # Éxito
+
+    def actualizar(self, sku_original: str, producto_nuevo: Dict[str, Any]) -> bool:  # Reemplaza un producto (CRUD: Update) en O(1)
+        pos = self._pos.get(sku_original)  # Buscamos la posición por hash
+        if pos is None:  # Si no existe
+            return False  # No se pudo actualizar
+
+        sku_nuevo = producto_nuevo.get("sku")  # SKU que quedará registrado
+        if sku_nuevo != sku_original and sku_nuevo in self._pos:  # Si el SKU nuevo ya lo usa otro producto
+            return False  # No permitimos duplicar SKUs
+
+        anterior = self._items[pos]  # Producto antes del cambio
+        creado = anterior.get("creado_en")  # Rescatamos fecha/hora original
+        if creado:  # Si existe
+            producto_nuevo["creado_en"] = creado  # Conservamos el creado_en original
+
+        if sku_nuevo != sku_original:  # Si cambió el SKU
+            del self._pos[sku_original]  # Quitamos la clave antigua del índice
+            self._pos[sku_nuevo] = pos  # Registramos la nueva en la misma posición
+        self._items[pos] = producto_nuevo  # Reemplazamos el dict en esa posición
+        self._avisar("al_actualizar", anterior, producto_nuevo)  # Avisamos el cambio
+        return True  # Indicamos éxito
+
+    def eliminar(self, sku: str) -> bool:  # Elimina un producto (CRUD: Delete) en O(1) amortizado
+        pos = self._pos.pop(sku, None)  # Sacamos el SKU del índice
+        if pos is None:  # Si no existe
+            return False  # No se pudo eliminar
+
+        anterior = self._items[pos]  # Producto que se elimina
+        self._items[pos] = None  # Dejamos un hueco (no desplazamos la lista)
+        self._huecos += 1  # Contamos el hueco
+        self._avisar("al_eliminar", anterior)  # Avisamos la baja
+        if self._huecos > 1024 and self._huecos * 2 > len(self._items):  # Si más de la mitad son huecos
+            self._compactar()  # Compactamos (costo repartido entre muchos borrados)
+        return True  # Éxito
+
+    def actualizar_varios(self, productos_nuevos: Iterable[Dict[str, Any]]) -> int:  # Reemplaza varios productos (por su SKU, sin cambiarlo) en una pasada; retorna cuántos
+        pares = []  # (anterior, nuevo) de cada reemplazo
+        for nuevo in productos_nuevos:  # Cada producto
+            pos = self._pos.get(nuevo.get("sku"))  # Posición por hash
+            if pos is None:  # Ya no existe
+                continue  # Se omite
+            anterior = self._items[pos]  # Producto antes del cambio
+            creado = anterior.get("creado_en")  # Rescatamos fecha/hora original
+            if creado:  # Si existe
+                nuevo["creado_en"] = creado  # Conservamos el creado_en original
+            self._items[pos] = nuevo  # Reemplazamos el dict en esa posición
+            pares.append((anterior, nuevo))  # Para avisar
+        if pares:  # Hubo cambios
+            self._avisar_varios("al_actualizar", pares)  # Un solo aviso (índices, totales y guardado se enteran juntos)
+        return len(pares)  # Reemplazados
+
+    def eliminar_varios(self, skus: Iterable[str]) -> int:  # Elimina varios productos en una pasada; retorna cuántos
+        bajas = []  # (producto,) de cada baja
+        for sku in skus:  # Cada SKU
+            pos = self._pos.pop(sku, None)  # Sacamos el SKU del índice
+            if pos is None:  # No existe (o venía repetido)
+                continue  # Se omite
+            bajas.append((self._items[pos],))  # Producto que se elimina
+            self._items[pos] = None  # Dejamos un hueco
+        self._huecos += len(bajas)  # Contamos los huecos
+        if bajas:  # Hubo bajas
+            self._avisar_varios("al_eliminar", bajas)  # Un solo aviso
+        if self._huecos > 1024 and self._huecos * 2 > len(self._items):  # Si más de la mitad son huecos
+            self._compactar()  # Una sola compactación al final
+        return len(bajas)  # Eliminados
+
+    def _compactar(self) -> None:  # Elimina huecos y recalcula posiciones (conserva el orden)
+        if not self._huecos:  # Si no hay huecos
+            return  # Nada que hacer
+        self._items = [p for p in self._items if p is not None]  # Lista sin huecos
+        self._pos.clear()  # Vaciamos el índice en el mismo dict (la vista self.skus sigue siendo válida)
+        self._pos.update((p.get("sku"), i) for i, p in enumerate(self._items))  # Reconstruimos posiciones
+        self._huecos = 0  # Ya no quedan huecos
+
+
+# ------------------------- API FUNCIONAL (compatible con listas) -------------------------
 
 def index_por_sku(productos: List[Dict[str, Any]], sku: str) -> int:  # Busca el índice de un producto por SKU
+    if isinstance(productos, CatalogoProductos):  # Si es el catálogo indexado
+        return productos.posicion(sku)  # Consulta O(1) en el índice hash
     for i, p in enumerate(productos):  # Recorremos la lista con índice
         if p.get("sku") == sku:  # Si el SKU coincide
             return i  # Retornamos el índice encontrado
     return -1  # Si no se encontró, retornamos -1
 
 def construir_set_skus(productos: List[Dict[str, Any]]) -> set:  # Construye un set con todos los SKUs (evita duplicados)
+    if isinstance(productos, CatalogoProductos):  # Si es el catálogo indexado
+        return set(sku for sku in productos.skus if sku)  # Copiamos las claves del índice (sin leer cada dict)
     return set(p.get("sku") for p in productos if p.get("sku"))  # Set comprehension (rápido) filtrando SKUs no vacíos
 
 def agregar_producto(productos: List[Dict[str, Any]], producto: Dict[str, Any]) -> None:  # Agrega un producto a la lista
+    if isinstance(productos, CatalogoProductos):  # Si es el catálogo indexado
+        productos.agregar(producto)  # Agrega y actualiza el índice
+        return  # Listo
     productos.append(producto)  # Append agrega al final de la lista (CRUD: Create)
 
 def actualizar_producto(productos: List[Dict[str, Any]], sku_original: str, producto_nuevo: Dict[str, Any]) -> bool:  # Actualiza producto existente
+    if isinstance(productos, CatalogoProductos):  # Si es el catálogo indexado
+        return productos.actualizar(sku_original, producto_nuevo)  # Actualización O(1)
+
     idx = index_por_sku(productos, sku_original)  # Buscamos el índice del producto a actualizar
     if idx == -1:  # Si no existe
         return False  # No se pudo actualizar
@@ -25,13 +253,67 @@ def actualizar_producto(productos: List[Dict[str, Any]], sku_original: str, prod
     return True  # Indicamos éxito
 
 def eliminar_producto(productos: List[Dict[str, Any]], sku: str) -> bool:  # Elimina producto por SKU
+    if isinstance(productos, CatalogoProductos):  # Si es el catálogo indexado
+        return productos.eliminar(sku)  # Borrado O(1) sin desplazar la lista
+
     idx = index_por_sku(productos, sku)  # Buscamos el índice
     if idx == -1:  # Si no existe
         return False  # No se pudo eliminar
     productos.pop(idx)  # Quitamos el elemento en ese índice (CRUD: Delete)
     return True  # Éxito
 
+def eliminar_productos(productos: List[Dict[str, Any]], skus: Iterable[str]) -> int:  # Elimina varios productos por SKU; retorna cuántos
+    if isinstance(productos, CatalogoProductos):  # Si es el catálogo indexado
+        return productos.eliminar_varios(skus)  # Una pasada y un solo aviso
+
+    quitar = set(skus)  # Pertenencia O(1)
+    antes = len(productos)  # Para contar
+    productos[:] = [p for p in productos if p.get("sku") not in quitar]  # Una pasada (no un pop por SKU)
+    return antes - len(productos)  # Eliminados
+
+def modificar_productos(productos: List[Dict[str, Any]], skus: Iterable[str], cambio: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> Tuple[int, List[str]]:  # Aplica cambio(p) → campos nuevos (None = no se puede) a varios productos
+    elegidos = dict.fromkeys(skus)  # SKUs a modificar (sin repetidos, en el orden recibido)
+    nuevos, omitidos = [], []  # Productos nuevos y SKUs que no admitían el cambio
+    fuente = (productos.obtener(s) for s in elegidos) if isinstance(productos, CatalogoProductos) else (p for p in productos if p.get("sku") in elegidos)  # Solo los elegidos
+    for p in fuente:  # Cada producto elegido
+        if p is None:  # Ya no existe
+            continue  # Se omite
+        campos = cambio(p)  # Campos que cambian
+        if campos is None:  # El cambio no es válido para este producto (ej. stock negativo)
+            omitidos.append(p.get("sku"))  # Lo informamos
+        else:  # Válido
+            nuevos.append({**p, **campos})  # Dict nuevo (los productos no se modifican en el lugar)
+
+    if isinstance(productos, CatalogoProductos):  # Si es el catálogo indexado
+        return productos.actualizar_varios(nuevos), omitidos  # Una pasada y un solo aviso
+    por_sku = {p["sku"]: p for p in nuevos}  # Reemplazos
+    for i, p in enumerate(productos):  # Una pasada por la lista
+        if p.get("sku") in por_sku:  # Elegido
+            productos[i] = por_sku[p.get("sku")]  # Reemplazo
+    return len(nuevos), omitidos  # Modificados y omitidos
+
+def ajustar_precios(productos: List[Dict[str, Any]], skus: Iterable[str], porcentaje: float) -> Tuple[int, List[str]]:  # Sube o baja el precio un porcentaje (ej. 10 o -5)
+    factor = 1 + porcentaje / 100  # 10% → 1.10
+    if factor < 0:  # Más de -100% dejaría precios negativos
+        return 0, list(skus)  # Nada que hacer
+    return modificar_productos(productos, skus, lambda p: {"precio": round(float(p.get("precio", 0.0)) * factor, 2)})  # Redondeo a centavos
+
+def ajustar_stock(productos: List[Dict[str, Any]], skus: Iterable[str], cantidad: int) -> Tuple[int, List[str]]:  # Suma (o resta) unidades; omite los que quedarían negativos
+    def cambio(p):  # Stock nuevo o None
+        stock = int(p.get("stock", 0)) + cantidad  # Nuevo stock
+        return {"stock": stock} if stock >= 0 else None  # Misma regla que validar_producto
+    return modificar_productos(productos, skus, cambio)  # Una pasada
+
+def cambiar_activo(productos: List[Dict[str, Any]], skus: Iterable[str], activo: bool) -> Tuple[int, List[str]]:  # Activa o desactiva varios productos
+    return modificar_productos(productos, skus, lambda p: {"activo": bool(activo)})  # Una pasada
+
+def cambiar_categoria(productos: List[Dict[str, Any]], skus: Iterable[str], categoria: str) -> Tuple[int, List[str]]:  # Reasigna la categoría (ya validada por quien llama)
+    return modificar_productos(productos, skus, lambda p: {"categoria": categoria})  # Una pasada
+
 def buscar(productos: List[Dict[str, Any]], texto: str) -> List[Dict[str, Any]]:  # Busca por SKU/nombre/categoría
+    if isinstance(productos, CatalogoProductos):  # Si es el catálogo indexado
+        return productos.buscar(texto)  # Usa el índice invertido (mismos resultados, sin recorrer todo)
+
     q = (texto or "").strip().casefold()  # Normalizamos a minúsculas para comparación robusta
     if not q:  # Si no hay texto de búsqueda
         return list(productos)  # Devolvemos copia de toda la lista
@@ -0,0 +1,43 @@
+from typing import Dict, Any, Iterable, Optional, Tuple  # Tipos para documentar
+
+Huella = Tuple[str, str, str, float, int, bool]  # Contenido normalizado de un producto
+
+
+def huella(p: Dict[str, Any]) -> Huella:  # Huella del contenido de un producto (sin creado_en): igual huella ↔ igual contenido
+    return (  # La tupla misma, no su hash(): dos contenidos distintos nunca dan la misma huella (sin colisiones)
+        str(p.get("sku", "")),  # SKU
+        str(p.get("nombre", "")),  # Nombre
+        str(p.get("categoria", "")),  # Categoría
+        float(p.get("precio", 0.0)) + 0.0,  # 10 y 10.0 dan lo mismo (+ 0.0: -0.0 y 0.0 son el mismo precio)
+        int(p.get("stock", 0)),  # Stock entero
+        bool(p.get("activo", True)),  # Booleano
+    )
+
+
+class HuellasContenido:  # SKU → huella del contenido, al día con cada cambio del catálogo (solo en memoria de este proceso; nunca se guarda en disco)
+    def __init__(self, productos: Iterable[Dict[str, Any]] = ()):  # Constructor (calcula la huella de los productos iniciales)
+        self._huellas: Dict[Any, Huella] = {p.get("sku"): huella(p) for p in productos}  # Un recorrido completo, una sola vez
+
+    # ------------------------- MANTENCIÓN INCREMENTAL -------------------------
+
+    def al_agregar(self, p: Dict[str, Any]) -> None:  # Alta
+        self._huellas[p.get("sku")] = huella(p)  # Huella nueva
+
+    def al_actualizar(self, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:  # Cambio
+        if anterior.get("sku") != nuevo.get("sku"):  # Cambió el SKU
+            self._huellas.pop(anterior.get("sku"), None)  # Fuera la clave anterior
+        self._huellas[nuevo.get("sku")] = huella(nuevo)  # Huella al día
+
+    def al_eliminar(self, p: Dict[str, Any]) -> None:  # Baja
+        self._huellas.pop(p.get("sku"), None)  # Fuera
+
+    # ------------------------- CONSULTAS -------------------------
+
+    def __len__(self) -> int:  # Productos con huella
+        return len(self._huellas)  # Tamaño del dict
+
+    def get(self, sku: Any) -> Optional[Huella]:  # Huella actual de un SKU (None si no existe)
+        return self._huellas.get(sku)  # O(1)
+
+    def sin_cambios(self, p: Dict[str, Any]) -> bool:  # ¿p tiene el mismo contenido que el producto de su SKU en el catálogo?
+        return self._huellas.get(p.get("sku")) == huella(p)  # Comparación campo a campo (los textos del catálogo son los mismos objetos: casi siempre por identidad)
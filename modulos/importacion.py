@@ -0,0 +1,200 @@
+import csv  # Informe de errores por fila (se abre bien en Excel)
+import json  # Producto descartado al cargar, completo dentro del informe
+import os  # Rutas
+import tempfile  # Archivo temporal para los lotes ya validados
+from itertools import islice  # Para cortar el flujo de filas en lotes
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, Optional, Set  # Tipos para claridad
+
+from .validaciones import validar_lote  # Mismas reglas que el formulario, validando el lote completo de una vez
+from .gestion_datos import actualizar_producto  # Actualización por SKU (conserva creado_en)
+from .exportaciones import iterar_filas, Progreso  # Lectura en streaming (Excel, CSV o NDJSON, con o sin gzip)
+
+TAM_LOTE = 2000  # Filas por lote (validación y alta al catálogo)
+
+Fila = Tuple[int, Dict[str, Any]]  # (número de fila en el Excel, valores de la fila)
+Operacion = Tuple[int, str, Dict[str, Any], bool]  # (fila, sku, producto validado, es_nuevo)
+
+
+# ------------------------- ETAPAS DEL FLUJO -------------------------
+
+def en_lotes(items: Iterable[Any], tam: int = TAM_LOTE) -> Iterator[List[Any]]:  # Agrupa un flujo en listas de tam elementos
+    it = iter(items)  # Iterador único (islice avanza sobre él)
+    while True:  # Hasta agotar
+        lote = list(islice(it, tam))  # Siguiente lote
+        if not lote:  # Se acabó el flujo
+            return  # Fin
+        yield lote  # Entregamos el lote
+
+def columnas_lote(lote: List[Fila]) -> Dict[str, List[Any]]:  # Pasa un lote de filas (dicts) a columnas, como las recibe validar_lote
+    columnas = {c: [r.get(c) for _, r in lote] for c in ("sku", "nombre", "categoria", "precio", "stock")}  # Una lista por campo
+    columnas["activo"] = [r.get("activo", True) for _, r in lote]  # Sin columna "activo" en el Excel: activo
+    return columnas  # Columnas del lote
+
+def preparar_lote(lote: List[Fila], skus: Set[str], sobrescribir: bool, vistos: Dict[str, int]) -> Tuple[List[Operacion], List[Tuple[int, str, str]]]:  # Valida un lote completo
+    validos, errores = validar_lote(  # Validación en bloque (normaliza, convierte y detecta SKUs repetidos en el archivo)
+        columnas_lote(lote), skus, permitir_existentes=sobrescribir, filas=[f for f, _ in lote], vistos=vistos
+    )
+    operaciones = [(fila, p["sku"], p, p["sku"] not in skus) for fila, p in validos]  # Alta si el SKU no está en el catálogo; si está, actualización
+    rechazos = [(e["fila"], e["sku"], "; ".join(e["errores"])) for e in errores]  # (fila, sku, motivo)
+    return operaciones, rechazos  # Resultado del lote
+
+def aplicar_lote(catalogo, operaciones: List[Operacion]) -> Tuple[int, int, int, List[Tuple[int, str, str]]]:  # Alta/cambio en el catálogo de un lote ya validado
+    nuevos = 0  # Contador nuevos
+    actualizados = 0  # Contador actualizados
+    sin_cambios = 0  # Filas iguales a lo que ya hay (no se tocan: ni índices ni guardado)
+    fallidos: List[Tuple[int, str, str]] = []  # Filas que no se pudieron aplicar
+    huellas = catalogo.huellas if any(not es_nuevo for *_, es_nuevo in operaciones) else None  # Solo hacen falta si hay actualizaciones
+    for fila_excel, sku, producto, es_nuevo in operaciones:  # Aplicamos en orden
+        if es_nuevo and catalogo.agregar(producto):  # Agrega nuevo (False si el SKU ya existe)
+            nuevos += 1  # Suma nuevos
+        elif not es_nuevo and huellas.sin_cambios(producto):  # Mismo contenido que el catálogo (ej. se re-importa el mismo archivo)
+            sin_cambios += 1  # Se cuenta y se salta
+        elif not es_nuevo and actualizar_producto(catalogo, sku, producto):  # Actualiza existente
+            actualizados += 1  # Suma actualizados
+        else:  # El catálogo cambió mientras se validaba
+            fallidos.append((fila_excel, sku, f"No se pudo aplicar SKU {sku}."))  # Motivo
+    return nuevos, actualizados, sin_cambios, fallidos  # Resultado del lote
+
+
+# ------------------------- INFORME DE ERRORES -------------------------
+
+def rechazos_carga(catalogo) -> List[Tuple[int, str, str]]:  # Productos descartados al cargar (SKU repetido) como filas del informe
+    return [  # (fila, sku, motivo); el motivo lleva el producto completo para poder recuperarlo
+        (i + 1, p.get("sku"), "SKU repetido en los datos (se conservó la primera aparición). Descartado: " + json.dumps(p, ensure_ascii=False, default=str))
+        for i, p in catalogo.duplicados  # En orden de la lista cargada
+    ]
+
+def ruta_informe_carga(ruta_datos: str) -> str:  # Informe de duplicados junto al archivo de datos
+    return os.path.splitext(ruta_datos)[0] + "_duplicados.csv"  # productos.json → productos_duplicados.csv
+
+def ruta_informe(ruta_excel: str) -> str:  # Ruta del informe de errores junto al archivo importado
+    base = ruta_excel[:-3] if ruta_excel.lower().endswith(".gz") else ruta_excel  # productos.csv.gz → productos.csv
+    return os.path.splitext(base)[0] + "_errores.csv"  # productos.xlsx → productos_errores.csv
+
+class InformeErrores:  # Escribe los rechazos fila a fila en un CSV (no se acumulan en memoria)
+    def __init__(self, ruta: str, ya_escritas: int = 0):  # Constructor (ya_escritas > 0 = continuar un informe existente)
+        self.ruta = ruta  # Ruta del CSV
+        self.cantidad = ya_escritas  # Filas rechazadas escritas
+        self._archivo = None  # El archivo se crea recién con el primer error
+        self._escritor = None  # csv.writer sobre el archivo
+
+    def agregar(self, rechazos: Iterable[Tuple[int, str, str]]) -> None:  # Escribe (fila, sku, motivo) al informe
+        for rechazo in rechazos:  # Recorremos
+            if self._escritor is None:  # Primer error: abrimos (o continuamos) el archivo
+                nuevo = self.cantidad == 0  # Si aún no hay nada escrito va el encabezado
+                self._archivo = open(self.ruta, "w" if nuevo else "a", newline="", encoding="utf-8-sig")  # BOM para que Excel lea bien los acentos
+                self._escritor = csv.writer(self._archivo, delimiter=";")  # Punto y coma (Excel en español)
+                if nuevo:  # Archivo nuevo
+                    self._escritor.writerow(["fila", "sku", "motivo"])  # Encabezado
+            self._escritor.writerow(rechazo)  # Una línea por fila rechazada
+            self.cantidad += 1  # Contamos
+
+    def cerrar(self) -> None:  # Cierra el archivo (se puede volver a agregar después: continúa al final)
+        if self._archivo is not None:  # Si se abrió
+            self._archivo.close()  # Cerramos
+            self._archivo = None  # Sin archivo
+            self._escritor = None  # Sin escritor
+
+    def __enter__(self):  # Uso con "with"
+        return self  # El propio informe
+
+    def __exit__(self, *exc) -> None:  # Al salir del "with"
+        self.cerrar()  # Cerramos siempre
+
+
+# ------------------------- LOTES VALIDADOS EN DISCO -------------------------
+
+class LotesEnDisco:  # Lotes validados en un NDJSON temporal (una línea por lote): todo o nada sin tener el archivo entero en memoria
+    def __init__(self):  # Constructor (crea el temporal vacío)
+        fd, self.ruta = tempfile.mkstemp(prefix="sgp_importacion_", suffix=".ndjson")  # Nombre único (otro proceso puede reabrirlo)
+        self._archivo = os.fdopen(fd, "w", encoding="utf-8")  # Abierto para agregar lotes
+        self.cantidad = 0  # Operaciones guardadas
+
+    def agregar(self, operaciones: List[Operacion]) -> None:  # Guarda un lote (la memoria solo retiene el lote actual)
+        self._archivo.write(json.dumps(operaciones, ensure_ascii=False, separators=(",", ":")) + "\n")  # Tuplas → listas JSON
+        self.cantidad += len(operaciones)  # Contamos
+
+    def cerrar(self) -> None:  # Termina la escritura (después se puede leer, incluso desde otro proceso)
+        if self._archivo is not None:  # Si sigue abierto
+            self._archivo.close()  # Cerramos
+            self._archivo = None  # Sin archivo (así el objeto se puede enviar a otro proceso)
+
+    def __iter__(self) -> Iterator[List[Operacion]]:  # Relee los lotes en el mismo orden, uno a la vez
+        self.cerrar()  # Todo escrito
+        with open(self.ruta, "r", encoding="utf-8") as f:  # Lectura
+            for linea in f:  # Un lote por línea
+                yield [tuple(op) for op in json.loads(linea)]  # Listas JSON → Operacion
+
+    def borrar(self) -> None:  # Elimina el temporal (se llama siempre: se aplicó, se canceló o falló)
+        self.cerrar()  # Por si seguía abierto
+        try:  # Puede no existir
+            os.remove(self.ruta)  # Borramos
+        except FileNotFoundError:  # Ya borrado
+            pass  # Nada que hacer
+
+    def __enter__(self):  # Uso con "with"
+        return self  # Los propios lotes
+
+    def __exit__(self, *exc) -> None:  # Al salir del "with"
+        self.borrar()  # Nunca queda basura en la carpeta temporal
+
+
+def validar_en_disco(  # Lee y valida el archivo completo sin tocar el catálogo; los lotes válidos quedan en disco
+    ruta: str,  # Archivo a importar
+    skus: Set[str],  # SKUs actuales del catálogo
+    sobrescribir: bool,  # True = actualiza existentes
+    informe: InformeErrores,  # Donde se escriben los rechazos
+    progreso: Progreso = None,  # Callback progreso(hechos, total)
+    tam_lote: int = TAM_LOTE,  # Filas por lote
+) -> LotesEnDisco:  # Lotes listos para aplicar (quien llama los borra)
+    lotes = LotesEnDisco()  # Temporal vacío
+    try:  # Si la lectura falla o se cancela, el temporal no queda
+        for operaciones in lotes_validados(ruta, skus, sobrescribir, informe, progreso, tam_lote):  # Flujo leer → normalizar → validar
+            lotes.agregar(operaciones)  # Al disco
+        lotes.cerrar()  # Listo para releer
+    except BaseException:  # Cancelación o error
+        lotes.borrar()  # Limpiamos
+        raise  # El llamador decide
+    return lotes  # Archivo completo y válido
+
+
+# ------------------------- FLUJO COMPLETO -------------------------
+
+def lotes_validados(  # Leer → validar por lotes, entregando lotes listos para aplicar (memoria acotada al lote)
+    ruta: str,  # Archivo a importar (.xlsx, .csv o .ndjson; CSV/NDJSON pueden venir comprimidos con gzip)
+    skus: Set[str],  # SKUs actuales del catálogo
+    sobrescribir: bool,  # True = actualiza existentes
+    informe: InformeErrores,  # Donde se escriben los rechazos
+    progreso: Progreso = None,  # Callback progreso(hechos, total)
+    tam_lote: int = TAM_LOTE,  # Filas por lote
+) -> Iterator[List[Operacion]]:  # Lotes de operaciones válidas
+    vistos: Dict[str, int] = {}  # SKU → primera fila del archivo donde aparece (los repetidos se rechazan)
+    for lote in en_lotes(iterar_filas(ruta, progreso), tam_lote):  # Lote a lote (nada más se materializa)
+        operaciones, rechazos = preparar_lote(lote, skus, sobrescribir, vistos)  # Validación del lote
+        informe.agregar(rechazos)  # Rechazos directo al archivo
+        if operaciones:  # Si quedó algo válido
+            yield operaciones  # Lote para el catálogo
+
+def importar_excel_en_catalogo(  # Importación completa en el hilo actual (sin guardar: el llamador sincroniza una sola vez)
+    ruta: str,  # Excel a importar
+    catalogo,  # CatalogoProductos destino
+    sobrescribir: bool,  # True = actualiza existentes
+    ruta_errores: Optional[str] = None,  # CSV de errores (por defecto junto al Excel)
+    progreso: Progreso = None,  # Callback progreso(hechos, total)
+    tam_lote: int = TAM_LOTE,  # Filas por lote
+) -> Dict[str, Any]:  # Resumen: nuevos, actualizados, sin_cambios, rechazados, informe (ruta o None)
+    nuevos = actualizados = sin_cambios = 0  # Contadores
+    with InformeErrores(ruta_errores or ruta_informe(ruta)) as informe, validar_en_disco(ruta, set(catalogo.skus), sobrescribir, informe, progreso, tam_lote) as lotes:  # Todo o nada: si el archivo falla a mitad, el catálogo no cambia
+        for operaciones in lotes:  # Lote a lote desde el temporal
+            n, a, iguales, fallidos = aplicar_lote(catalogo, operaciones)  # Alta en bloque
+            nuevos += n  # Acumulamos
+            actualizados += a  # Acumulamos
+            sin_cambios += iguales  # Acumulamos
+            informe.agregar(fallidos)  # Filas que no se pudieron aplicar
+    return {  # Resumen final
+        "nuevos": nuevos,
+        "actualizados": actualizados,
+        "sin_cambios": sin_cambios,
+        "rechazados": informe.cantidad,
+        "informe": informe.ruta if informe.cantidad else None,
+    }
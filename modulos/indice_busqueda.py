@@ -0,0 +1,146 @@
+import re  # Para separar el texto en tokens (palabras)
+from typing import Dict, Any, List, Set, Iterable, Optional  # Tipos para documentar estructuras de datos
+
+CAMPOS_BUSQUEDA = ("sku", "nombre", "categoria")  # Campos donde busca el buscador (mismo criterio que gestion_datos.buscar)
+SEPARADOR = "\x1f"  # Separa campos en el texto unido (nunca aparece en una búsqueda, así no hay coincidencias entre campos)
+_SEPARADOR_TOKENS = re.compile(r"[^\w]+")  # Todo lo que no sea letra/número/_ separa palabras
+
+
+def normalizar_consulta(texto: str) -> str:  # Normaliza la consulta igual que gestion_datos.buscar
+    return (texto or "").strip().casefold().replace(SEPARADOR, "")  # strip + casefold (y sin el separador interno)
+
+
+def _trigramas(texto: str) -> Set[str]:  # Conjunto de trigramas (3 caracteres seguidos) de un texto
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}  # Ventana deslizante de 3 caracteres
+
+
+class IndiceBusqueda:  # Índice invertido de trigramas sobre sku/nombre/categoría (se actualiza con cada cambio del catálogo)
+    def __init__(self, productos: Iterable[Dict[str, Any]] = ()):  # Constructor (indexa los productos iniciales)
+        self._textos: Dict[Any, str] = {}  # SKU → "sku␟nombre␟categoria" en minúscula (evita casefold en cada consulta)
+        self._trigramas: Dict[str, Set[Any]] = {}  # Trigrama (de sku o nombre) → set de SKUs que lo contienen
+        self._categorias: Dict[str, int] = {}  # Categoría normalizada → cantidad de productos (son pocas, no se indexan por trigrama)
+
+        for p in productos:  # Indexamos lo que ya existe
+            self.al_agregar(p)  # Mismo camino que un alta
+
+    @property
+    def textos(self) -> Dict[Any, str]:  # SKU → texto unido y normalizado (solo lectura)
+        return self._textos  # Dict interno (para recorridos rápidos)
+
+    # ------------------------- MANTENCIÓN INCREMENTAL -------------------------
+
+    def al_agregar(self, p: Dict[str, Any]) -> None:  # Indexa un producto nuevo
+        sku = p.get("sku")  # Clave del producto
+        sku_n, nombre_n, cat_n = (str(p.get(c, "")).casefold() for c in CAMPOS_BUSQUEDA)  # Igual que la búsqueda lineal (str + casefold)
+        self._textos[sku] = SEPARADOR.join((sku_n, nombre_n, cat_n))  # Guardamos texto unido
+        self._categorias[cat_n] = self._categorias.get(cat_n, 0) + 1  # Contamos la categoría
+
+        trig = self._trigramas  # Referencia local (más rápido dentro del bucle)
+        for g in _trigramas(sku_n) | _trigramas(nombre_n):  # Trigramas de SKU y nombre
+            skus = trig.get(g)  # Lista invertida actual
+            if skus is None:  # Si es un trigrama nuevo
+                trig[g] = {sku}  # Creamos la lista
+            else:  # Si ya existía
+                skus.add(sku)  # Agregamos el SKU
+
+    def al_eliminar(self, p: Dict[str, Any]) -> None:  # Quita un producto del índice
+        sku = p.get("sku")  # Clave del producto
+        texto = self._textos.pop(sku, None)  # Sacamos su texto
+        if texto is None:  # Si no estaba indexado
+            return  # Nada más que hacer
+
+        sku_n, nombre_n, cat_n = texto.split(SEPARADOR)  # Recuperamos los campos normalizados
+        restantes = self._categorias.get(cat_n, 0) - 1  # Descontamos la categoría
+        if restantes > 0:  # Si quedan productos en ella
+            self._categorias[cat_n] = restantes  # Guardamos nuevo conteo
+        else:  # Si era el último
+            self._categorias.pop(cat_n, None)  # Quitamos la categoría
+
+        for g in _trigramas(sku_n) | _trigramas(nombre_n):  # Recorremos sus trigramas
+            skus = self._trigramas.get(g)  # Lista invertida de ese trigrama
+            if skus is not None:  # Si existe
+                skus.discard(sku)  # Quitamos el SKU
+                if not skus:  # Si quedó vacía
+                    del self._trigramas[g]  # Liberamos la entrada
+
+    def al_actualizar(self, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:  # Re-indexa un producto modificado
+        sku = nuevo.get("sku")  # Clave del producto
+        texto = self._textos.get(sku)  # Texto indexado actual
+        if texto is None or anterior.get("sku") != sku or anterior.get("nombre") != nuevo.get("nombre"):  # Cambió lo que tiene trigramas
+            self.al_eliminar(anterior)  # Quitamos la versión anterior
+            self.al_agregar(nuevo)  # Indexamos la nueva
+            return  # Listo
+
+        cat_n = str(nuevo.get("categoria", "")).casefold()  # Categoría nueva normalizada
+        sku_n, nombre_n, cat_anterior = texto.split(SEPARADOR)  # Campos indexados
+        if cat_n == cat_anterior:  # Ej. cambio de precio, stock o activo: el texto es el mismo
+            return  # Nada que re-indexar
+        self._textos[sku] = SEPARADOR.join((sku_n, nombre_n, cat_n))  # Solo cambia la categoría (sin trigramas)
+        restantes = self._categorias.get(cat_anterior, 0) - 1  # Descontamos la anterior
+        if restantes > 0:  # Si quedan productos en ella
+            self._categorias[cat_anterior] = restantes  # Guardamos nuevo conteo
+        else:  # Si era el último
+            self._categorias.pop(cat_anterior, None)  # Quitamos la categoría
+        self._categorias[cat_n] = self._categorias.get(cat_n, 0) + 1  # Contamos la nueva
+
+    def al_eliminar_varios(self, bajas: List[tuple]) -> None:  # Muchas bajas juntas (ej. eliminar una selección grande)
+        if len(bajas) * 8 < len(self._textos):  # Pocas: una por una
+            for (p,) in bajas:  # Cada baja
+                self.al_eliminar(p)  # Camino normal
+            return  # Listo
+        quitar = set()  # SKUs eliminados
+        for (p,) in bajas:  # Cada baja: solo texto y categoría (sin calcular trigramas)
+            sku = p.get("sku")  # Clave del producto
+            texto = self._textos.pop(sku, None)  # Sacamos su texto
+            if texto is None:  # Si no estaba indexado
+                continue  # Nada más que hacer
+            quitar.add(sku)  # Para restarlo de las listas
+            cat_n = texto.rsplit(SEPARADOR, 1)[1]  # Categoría normalizada (último campo)
+            restantes = self._categorias.get(cat_n, 0) - 1  # Descontamos la categoría
+            if restantes > 0:  # Si quedan productos en ella
+                self._categorias[cat_n] = restantes  # Guardamos nuevo conteo
+            else:  # Si era el último
+                self._categorias.pop(cat_n, None)  # Quitamos la categoría
+        trig = self._trigramas  # Referencia local
+        for g, skus in list(trig.items()):  # Una resta de sets (en C) por trigrama: recorre las listas una vez, sin un discard por producto y trigrama
+            restantes = skus - quitar  # Lista sin los eliminados
+            if restantes:  # Quedan productos
+                trig[g] = restantes  # Lista nueva
+            else:  # Quedó vacía
+                del trig[g]  # Liberamos la entrada
+
+    # ------------------------- CONSULTA -------------------------
+
+    def candidatos(self, q: str) -> Optional[Set[Any]]:  # SKUs que contienen q (normalizado); None = conviene recorrer todo
+        if len(q) < 3:  # Consultas muy cortas no tienen trigramas
+            return None  # Las resuelve un recorrido sobre los textos ya normalizados
+        if any(q in cat for cat in self._categorias):  # Si coincide con una categoría, el resultado es enorme
+            return None  # Recorrer es más barato que intersectar
+
+        listas = []  # Listas invertidas de cada trigrama de la consulta
+        for g in _trigramas(q):  # Trigramas de la consulta
+            skus = self._trigramas.get(g)  # Productos que lo contienen
+            if not skus:  # Si algún trigrama no aparece en ningún producto
+                return set()  # No puede haber resultados
+            listas.append(skus)  # Guardamos la lista
+
+        listas.sort(key=len)  # Intersectamos desde la lista más corta (más barato)
+        if len(listas[0]) * 4 > len(self._textos):  # Si hasta la lista más corta abarca gran parte del catálogo
+            return None  # Recorrer es más barato
+        posibles = set(listas[0])  # Copia de la lista más corta
+        for skus in listas[1:]:  # Recorremos las demás
+            posibles &= skus  # Intersección de sets
+            if not posibles:  # Si ya no queda nada
+                break  # Cortamos temprano
+
+        # Los trigramas pueden venir de campos distintos: confirmamos la subcadena en el texto unido
+        textos = self._textos  # Referencia local
+        return {sku for sku in posibles if q in textos[sku]}  # Filtramos falsos positivos
+
+    def relevancia(self, q: str, sku: Any) -> int:  # 0 = SKU exacto, 1 = prefijo, 2 = subcadena
+        texto = self._textos[sku]  # Texto unido del producto
+        if texto.startswith(q + SEPARADOR):  # El SKU completo es la consulta
+            return 0  # Máxima relevancia
+        if texto.startswith(q) or any(tok.startswith(q) for tok in _SEPARADOR_TOKENS.split(texto)):  # Prefijo de SKU o de alguna palabra
+            return 1  # Relevancia media
+        return 2  # Solo subcadena
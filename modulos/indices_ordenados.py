@@ -0,0 +1,193 @@
+from bisect import bisect_left, bisect_right, insort  # Búsqueda binaria (bloques y dentro de cada bloque)
+from datetime import datetime, timedelta  # Fechas relativas ("últimos 7 días")
+from itertools import chain, islice  # Recorridos sin copiar la lista completa
+from operator import itemgetter  # Clave de búsqueda: el valor de cada entrada
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Callable  # Tipos para documentar
+
+CARGA = 1000  # Elementos por bloque (un bloque se parte en dos al llegar al doble)
+
+CAMPOS_ORDENABLES: Dict[str, Callable[[Dict[str, Any]], Any]] = {  # Campo → valor comparable (mismas conversiones que reportes/funciones_utiles)
+    "precio": lambda p: float(p.get("precio", 0.0)),  # Precio como float
+    "stock": lambda p: int(p.get("stock", 0)),  # Stock como int
+    "creado_en": lambda p: str(p.get("creado_en") or ""),  # "AAAA-MM-DD HH:MM:SS" ordena bien como texto
+}
+
+
+def _identidad(x: Any) -> Any:  # Clave por defecto: el elemento completo
+    return x  # Sin transformar
+
+
+class ListaOrdenada:  # Lista ordenada en bloques: insertar y borrar mueven ~CARGA elementos, no la lista completa
+    def __init__(self, items: Iterable[Any] = (), carga: int = CARGA):  # Constructor (un solo sort para los elementos iniciales)
+        self._carga = carga  # Tamaño normal de bloque
+        todos = sorted(items)  # Orden inicial
+        self._bloques: List[List[Any]] = [todos[i:i + carga] for i in range(0, len(todos), carga)]  # Bloques ordenados
+        self._maximos: List[Any] = [b[-1] for b in self._bloques]  # Último elemento de cada bloque (para elegir bloque)
+        self._largo = len(todos)  # Cantidad total
+
+    def __len__(self) -> int:  # Cantidad de elementos
+        return self._largo  # Contador mantenido
+
+    def __iter__(self) -> Iterator[Any]:  # De menor a mayor
+        return chain.from_iterable(self._bloques)  # Bloque tras bloque
+
+    def __reversed__(self) -> Iterator[Any]:  # De mayor a menor
+        return chain.from_iterable(reversed(b) for b in reversed(self._bloques))  # Bloques y elementos al revés
+
+    def agregar(self, x: Any) -> None:  # Inserta manteniendo el orden
+        if not self._bloques:  # Lista vacía
+            self._bloques.append([x])  # Primer bloque
+            self._maximos.append(x)  # Su máximo
+        else:  # Buscamos el bloque
+            i = bisect_left(self._maximos, x)  # Primer bloque cuyo máximo es >= x
+            if i == len(self._bloques):  # Mayor que todo: va al final del último bloque
+                i -= 1  # Último bloque
+                self._bloques[i].append(x)  # Al final
+                self._maximos[i] = x  # Nuevo máximo
+            else:  # Dentro de un bloque
+                insort(self._bloques[i], x)  # Inserción ordenada (mueve como mucho 2*CARGA elementos)
+            if len(self._bloques[i]) > 2 * self._carga:  # Bloque demasiado grande
+                b = self._bloques[i]  # Lo partimos en dos
+                self._bloques[i:i + 1] = [b[:self._carga], b[self._carga:]]  # Dos mitades
+                self._maximos[i:i + 1] = [b[self._carga - 1], b[-1]]  # Sus máximos
+        self._largo += 1  # Un elemento más
+
+    def quitar(self, x: Any) -> bool:  # Borra un elemento igual a x (False si no está)
+        i = bisect_left(self._maximos, x)  # Bloque donde estaría
+        if i == len(self._bloques):  # Mayor que todo
+            return False  # No está
+        b = self._bloques[i]  # Bloque
+        j = bisect_left(b, x)  # Posición dentro del bloque
+        if j == len(b) or b[j] != x:  # No coincide
+            return False  # No está
+        del b[j]  # Lo quitamos
+        if b:  # Quedan elementos en el bloque
+            self._maximos[i] = b[-1]  # Máximo al día
+        else:  # Bloque vacío
+            del self._bloques[i]  # Lo quitamos
+            del self._maximos[i]  # Y su máximo
+        self._largo -= 1  # Un elemento menos
+        return True  # Borrado
+
+    def reemplazar(self, x: Any, y: Any) -> bool:  # Cambia x por y en su lugar (y debe ordenar igual que x respecto al resto)
+        i = bisect_left(self._maximos, x)  # Bloque donde estaría
+        if i == len(self._bloques):  # Mayor que todo
+            return False  # No está
+        b = self._bloques[i]  # Bloque
+        j = bisect_left(b, x)  # Posición dentro del bloque
+        if j == len(b) or b[j] != x:  # No coincide
+            return False  # No está
+        b[j] = y  # Sin mover nada
+        if j == len(b) - 1:  # Era el máximo del bloque
+            self._maximos[i] = y  # Máximo al día
+        return True  # Reemplazado
+
+    def _posicion(self, valor: Any, clave: Callable[[Any], Any], derecha: bool) -> tuple:  # (bloque, posición) del primer elemento con clave >= valor (> si derecha)
+        buscar = bisect_right if derecha else bisect_left  # Tipo de búsqueda
+        i = buscar(self._maximos, valor, key=clave)  # Bloque
+        if i == len(self._bloques):  # Después de todo
+            return i, 0  # Fin
+        return i, buscar(self._bloques[i], valor, key=clave)  # Dentro del bloque
+
+    def rango(self, desde: Any = None, hasta: Any = None, clave: Callable[[Any], Any] = _identidad) -> Iterator[Any]:  # Elementos con desde <= clave <= hasta, en orden
+        i, j = (0, 0) if desde is None else self._posicion(desde, clave, False)  # Inicio
+        fin_i, fin_j = (len(self._bloques), 0) if hasta is None else self._posicion(hasta, clave, True)  # Fin (exclusivo)
+        while (i, j) < (fin_i, fin_j):  # Bloque a bloque
+            b = self._bloques[i]  # Bloque actual
+            yield from b[j:fin_j] if i == fin_i else (b[j:] if j else b)  # Parte del bloque dentro del rango
+            i, j = i + 1, 0  # Siguiente bloque
+
+
+_VALOR = itemgetter(0)  # Valor de una entrada (valor, sku, producto)
+_SKU = itemgetter(1)  # SKU de una entrada
+
+class IndiceOrdenado:  # Índice secundario ordenado por un campo (precio, stock o creado_en), al día con cada cambio del catálogo
+    def __init__(self, campo: str, productos: Iterable[Dict[str, Any]] = ()):  # Constructor (indexa los productos iniciales)
+        self.campo = campo  # Campo indexado
+        self._valor = CAMPOS_ORDENABLES[campo]  # Conversión a valor comparable
+        self._entradas: Dict[Any, tuple] = {}  # SKU → entrada tal como está en la lista (las bajas la buscan por SKU, no recalculan el valor del dict)
+        for p in productos:  # Recorremos una sola vez
+            if p.get("sku") not in self._entradas:  # SKU repetido: gana la primera aparición (como el catálogo)
+                self._entrada(p)  # Entrada guardada
+        self._lista = ListaOrdenada(self._entradas.values())  # (valor, sku, producto) ordenado por valor y luego SKU
+
+    def _entrada(self, p: Dict[str, Any]) -> tuple:  # Entrada nueva del índice, congelada con el valor de ahora (el SKU desempata; nunca se comparan dicts)
+        sku = p.get("sku")  # Clave
+        entrada = self._entradas[sku] = (self._valor(p), sku, p)  # Un cambio posterior del dict en el lugar no cambia su posición guardada
+        return entrada  # Para insertarla en la lista
+
+    # ------------------------- MANTENCIÓN INCREMENTAL -------------------------
+
+    def al_agregar(self, p: Dict[str, Any]) -> None:  # Alta
+        self._lista.agregar(self._entrada(p))  # Inserción ordenada
+
+    def al_eliminar(self, p: Dict[str, Any]) -> None:  # Baja (aunque el dict haya cambiado en el lugar: se quita la entrada guardada)
+        entrada = self._entradas.pop(p.get("sku"), None)  # Entrada que está en la lista
+        if entrada is not None:  # Estaba indexado
+            self._lista.quitar(entrada)  # Borrado por búsqueda binaria (la misma tupla: nunca empata con otra)
+
+    def al_actualizar(self, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:  # Cambio (puede moverlo de lugar)
+        sku = anterior.get("sku")  # SKU antes del cambio
+        viejo = self._entradas.get(sku)  # Entrada guardada
+        if viejo is not None and sku == nuevo.get("sku") and viejo[0] == self._valor(nuevo):  # Mismo valor y SKU (ej. cambió otro campo): solo cambia el dict
+            self._lista.reemplazar(viejo, self._entrada(nuevo))  # En su lugar, sin mover nada
+            return  # Listo
+        self.al_eliminar(anterior)  # Sale la versión anterior
+        self.al_agregar(nuevo)  # Entra la nueva
+
+    def al_actualizar_varios(self, pares: List[tuple]) -> None:  # Muchos cambios juntos (ej. ajuste de precios a una selección)
+        if len(pares) * 8 < len(self._lista):  # Pocos: uno por uno (cada uno mueve ~CARGA elementos)
+            for anterior, nuevo in pares:  # Cada cambio
+                self.al_actualizar(anterior, nuevo)  # Camino normal
+            return  # Listo
+        quitar, movidos, quietos = set(), [], {}  # SKUs que salen de la lista, productos que entran de nuevo y SKU → entrada nueva en el mismo lugar
+        entradas, valor = self._entradas, self._valor  # Referencias locales (bucle de muchos cambios)
+        for anterior, nuevo in pares:  # Cada cambio
+            sku = anterior.get("sku")  # SKU antes del cambio
+            viejo = entradas.get(sku)  # Entrada guardada
+            v = valor(nuevo)  # Valor nuevo (una sola vez)
+            if viejo is not None and viejo[0] == v and sku == nuevo.get("sku"):  # Sigue en el mismo lugar
+                quietos[sku] = entradas[sku] = (v, sku, nuevo)  # Solo cambia el dict
+            else:  # Cambió de lugar
+                if entradas.pop(sku, None) is not None:  # Estaba indexado
+                    quitar.add(sku)  # Sale su entrada
+                movidos.append(nuevo)  # Se reubica con el sort
+        self._reconstruir(quitar, movidos, quietos)  # Una pasada y un solo sort
+
+    def al_eliminar_varios(self, bajas: List[tuple]) -> None:  # Muchas bajas juntas
+        if len(bajas) * 8 < len(self._lista):  # Pocas: una por una
+            for (p,) in bajas:  # Cada baja
+                self.al_eliminar(p)  # Camino normal
+            return  # Listo
+        quitar = set()  # SKUs eliminados
+        for (p,) in bajas:  # Cada baja
+            if self._entradas.pop(p.get("sku"), None) is not None:  # Estaba indexado
+                quitar.add(p.get("sku"))  # Sale su entrada
+        self._reconstruir(quitar, [], {})  # Una pasada
+
+    def _reconstruir(self, quitar: set, nuevos: List[Dict[str, Any]], quietos: Dict[Any, tuple]) -> None:  # Lista nueva: sin las entradas de quitar, con las de nuevos y con las de quietos en su lugar
+        entradas = [e for e in self._lista if e[1] not in quitar] if quitar else list(self._lista)  # Ya ordenadas
+        if quietos:  # Entradas que cambian solo de dict
+            entradas = list(map(quietos.get, map(_SKU, entradas), entradas))  # quietos.get(sku, entrada) en C, sin bucle Python
+        entradas.extend(self._entrada(p) for p in nuevos)  # Al final (el sort las ubica)
+        self._lista = ListaOrdenada(entradas, self._lista._carga)  # Un solo sort (casi ordenado: Timsort lo aprovecha)
+
+    # ------------------------- CONSULTAS -------------------------
+
+    def __len__(self) -> int:  # Productos indexados
+        return len(self._lista)  # Largo de la lista
+
+    def productos(self, descendente: bool = False) -> List[Dict[str, Any]]:  # Todos los productos en orden (sin ordenar nada)
+        entradas = reversed(self._lista) if descendente else iter(self._lista)  # Sentido
+        return [p for _, _, p in entradas]  # Solo los productos
+
+    def rango(self, desde: Any = None, hasta: Any = None) -> List[Dict[str, Any]]:  # Productos con desde <= valor <= hasta (None = sin límite)
+        return [p for _, _, p in self._lista.rango(desde, hasta, clave=_VALOR)]  # Búsqueda binaria + recorrido del resultado
+
+    def primeros(self, k: int, descendente: bool = False) -> List[Dict[str, Any]]:  # Los k de menor valor (o mayor)
+        entradas = reversed(self._lista) if descendente else iter(self._lista)  # Sentido
+        return [p for _, _, p in islice(entradas, max(0, k))]  # Solo k entradas
+
+
+def hace_dias(dias: float, ahora: Optional[datetime] = None) -> str:  # Límite para rango de creado_en ("últimos N días")
+    return ((ahora or datetime.now()) - timedelta(days=dias)).strftime("%Y-%m-%d %H:%M:%S")  # Mismo formato que creado_en
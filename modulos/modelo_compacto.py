@@ -0,0 +1,227 @@
+import math  # fsum para los productos guardados aparte
+import re  # Formato exacto de creado_en
+import sys  # sys.intern para compartir el texto de las categorías
+from array import array  # Columnas numéricas compactas
+from collections import Counter  # Conteo de códigos de categoría en C
+from itertools import compress, groupby  # Filas de una categoría y tramos de filas compactables, sin bucle Python
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple  # Tipos para claridad
+
+from .validaciones import CATEGORIAS  # Categorías conocidas (códigos fijos en el almacén por columnas)
+from .funciones_utiles import valor_columnas, subtotal_producto  # Suma de precio*stock (columnas y dicts)
+
+CAMPOS = ("sku", "nombre", "categoria", "precio", "stock", "activo", "creado_en")  # Forma del producto en dict (igual que el JSON)
+
+# creado_en ("AAAA-MM-DD HH:MM:SS", 19 caracteres) se guarda como un entero AAAAMMDDHHMMSS.
+# Solo se empaqueta si tiene exactamente ese formato (así al desempaquetar se obtiene el mismo texto; si no, se guarda el texto tal cual).
+
+_ES_FECHA = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}").fullmatch  # Formato exacto (solo dígitos ASCII)
+_SIN_SEPARADORES = str.maketrans("", "", "-: ")  # Quita guiones, espacio y dos puntos
+_STOCK_MIN, _STOCK_MAX = -(1 << 63), (1 << 63)  # Rango de un entero de 64 bits (columna "q")
+
+def empaquetar_fecha(texto: Any) -> Optional[int]:  # "2026-05-23 10:00:00" → 20260523100000 (None si no tiene ese formato exacto)
+    if type(texto) is not str or _ES_FECHA(texto) is None:  # Otro tipo u otro formato
+        return None  # No empaquetable
+    return int(texto.translate(_SIN_SEPARADORES))  # Entero de 14 cifras
+
+def desempaquetar_fecha(n: int) -> str:  # 20260523100000 → "2026-05-23 10:00:00"
+    s = f"{n:014d}"  # 14 cifras con ceros a la izquierda
+    return f"{s[0:4]}-{s[4:6]}-{s[6:8]} {s[8:10]}:{s[10:12]}:{s[12:14]}"  # Texto original
+
+_FALTA = object()  # Marca de campo ausente en el dict original (para reconstruirlo igual)
+
+
+class Producto:  # Registro compacto: atributos fijos (__slots__) en vez de un dict por producto
+    __slots__ = ("sku", "nombre", "categoria", "precio", "stock", "activo", "_creado", "_extra")  # Sin __dict__ por instancia
+
+    def __init__(self, sku: str, nombre: str, categoria: str, precio: float, stock: int, activo: bool, creado_en: Any = _FALTA):  # Constructor
+        self.sku = sku  # SKU
+        self.nombre = nombre  # Nombre
+        self.categoria = sys.intern(categoria) if type(categoria) is str else categoria  # Un solo objeto por categoría
+        self.precio = precio  # Precio
+        self.stock = stock  # Stock
+        self.activo = activo  # Activo
+        self.creado_en = creado_en  # Fecha (se empaqueta si se puede)
+        self._extra = None  # Claves fuera de CAMPOS (casi nunca hay)
+
+    @property
+    def creado_en(self) -> Any:  # Fecha de creación como texto (igual que en el dict)
+        c = self._creado  # Valor guardado
+        return desempaquetar_fecha(c) if type(c) is int else c  # Entero → texto; cualquier otra cosa tal cual
+
+    @creado_en.setter
+    def creado_en(self, valor: Any) -> None:  # Guarda la fecha empaquetada si tiene el formato estándar
+        n = empaquetar_fecha(valor)  # Intentamos empaquetar
+        self._creado = valor if n is None else n  # Entero (compacto) o el valor original
+
+    @classmethod
+    def desde_dict(cls, p: Dict[str, Any]) -> "Producto":  # dict del catálogo/JSON → Producto
+        r = cls(*(p.get(c, _FALTA) for c in CAMPOS))  # Campos en orden (los que faltan quedan marcados)
+        if len(p) > len(CAMPOS) or any(c not in p for c in CAMPOS):  # Claves extra o faltantes: revisamos
+            extra = {k: v for k, v in p.items() if k not in CAMPOS}  # Claves fuera de CAMPOS
+            r._extra = extra or None  # Solo si hay
+        return r  # Registro compacto
+
+    def a_dict(self) -> Dict[str, Any]:  # Producto → dict con la misma forma (y las mismas claves) que el original
+        d = {  # Campos en el orden de CAMPOS
+            "sku": self.sku, "nombre": self.nombre, "categoria": self.categoria, "precio": self.precio,
+            "stock": self.stock, "activo": self.activo, "creado_en": self.creado_en,
+        }
+        if _FALTA in (self.sku, self.nombre, self.categoria, self.precio, self.stock, self.activo, self._creado):  # Algún campo faltaba
+            d = {k: v for k, v in d.items() if v is not _FALTA}  # Los quitamos
+        if self._extra:  # Claves extra
+            d.update(self._extra)  # Las devolvemos
+        return d  # dict igual al original
+
+    def __repr__(self) -> str:  # Representación legible (para depurar)
+        return f"Producto({self.a_dict()!r})"  # Como el dict
+
+
+class ColumnasProductos:  # Almacén por columnas: una lista/array por campo en vez de un objeto por producto
+    def __init__(self, productos: Iterable[Dict[str, Any]] = ()):  # Constructor (carga dicts)
+        self.categorias: List[str] = list(CATEGORIAS)  # Código → categoría (las conocidas tienen código fijo)
+        self._codigo: Dict[str, int] = {c: i for i, c in enumerate(self.categorias)}  # Categoría → código
+        self.skus: List[str] = []  # Columna SKU
+        self.nombres: List[str] = []  # Columna nombre
+        self._cat = array("B")  # Columna categoría (1 byte por producto)
+        self.precios = array("d")  # Columna precio (8 bytes)
+        self.stocks = array("q")  # Columna stock (8 bytes)
+        self._activo = array("b")  # Columna activo (1 byte)
+        self._creado = array("q")  # Columna creado_en empaquetada (8 bytes)
+        self._originales: Dict[int, Dict[str, Any]] = {}  # Fila → dict original, para productos que no caben en las columnas
+        self.extender(productos)  # Cargamos (columnas completas de una vez)
+
+    def _cabe(self, p: Dict[str, Any]) -> Optional[Tuple[int, int]]:  # (código de categoría, fecha empaquetada) si el dict se puede guardar sin pérdida
+        if len(p) != len(CAMPOS):  # Claves faltantes o extra
+            return None  # No cabe
+        if type(p.get("sku")) is not str or type(p.get("nombre")) is not str or type(p.get("categoria")) is not str:  # Textos
+            return None  # No cabe
+        if type(p.get("precio")) is not float or type(p.get("stock")) is not int or type(p.get("activo")) is not bool:  # Tipos exactos
+            return None  # No cabe (ej. precio entero en el JSON: se conserva tal cual)
+        if not _STOCK_MIN <= p["stock"] < _STOCK_MAX:  # Fuera de un entero de 64 bits
+            return None  # No cabe
+        fecha = empaquetar_fecha(p.get("creado_en"))  # Fecha empaquetada
+        if fecha is None:  # Formato distinto
+            return None  # No cabe
+        codigo = self._codigo.get(p["categoria"])  # Código de la categoría
+        if codigo is None:  # Categoría nueva
+            if len(self.categorias) >= 255:  # Sin códigos libres (255 = fila guardada aparte)
+                return None  # No cabe
+            codigo = len(self.categorias)  # Nuevo código
+            self.categorias.append(sys.intern(p["categoria"]))  # La registramos
+            self._codigo[p["categoria"]] = codigo  # Índice inverso
+        return codigo, fecha  # Cabe
+
+    def agregar(self, p: Dict[str, Any]) -> None:  # Agrega un producto (dict) al final
+        cabe = self._cabe(p)  # ¿Se puede guardar en columnas sin perder nada?
+        if cabe is None:  # No: se guarda el dict original y las columnas llevan valores neutros
+            self._originales[len(self.skus)] = dict(p)  # Copia del original
+            codigo, fecha, precio, stock, activo = 255, 0, 0.0, 0, 0  # Relleno
+            sku, nombre = str(p.get("sku", "")), ""  # El SKU sigue en su columna (para búsquedas)
+        else:  # Sí
+            codigo, fecha = cabe  # Código y fecha
+            precio, stock, activo = p["precio"], p["stock"], int(p["activo"])  # Números
+            sku, nombre = p["sku"], p["nombre"]  # Textos
+        self.skus.append(sku)  # Columna SKU
+        self.nombres.append(nombre)  # Columna nombre
+        self._cat.append(codigo)  # Columna categoría
+        self.precios.append(precio)  # Columna precio
+        self.stocks.append(stock)  # Columna stock
+        self._activo.append(activo)  # Columna activo
+        self._creado.append(fecha)  # Columna fecha
+
+    def extender(self, productos: Iterable[Dict[str, Any]]) -> None:  # Agrega muchos productos al final (mismo resultado que agregar uno a uno)
+        filas = productos if isinstance(productos, list) else list(productos)  # Se recorre más de una vez
+        distintas = {t for p in filas if type(t := p.get("creado_en")) is str}  # Fechas distintas (una importación comparte la misma)
+        fechas = {t: empaquetar_fecha(t) for t in distintas}  # Cada una se empaqueta una sola vez
+        cabe = [  # Misma revisión que _cabe, en una sola comprensión (sin llamar un método por fila)
+            len(p) == 7 and type(p.get("sku")) is str and type(p.get("nombre")) is str and type(p.get("categoria")) is str
+            and type(p.get("precio")) is float and type(p.get("stock")) is int and type(p.get("activo")) is bool
+            and _STOCK_MIN <= p["stock"] < _STOCK_MAX and type(p.get("creado_en")) is str and fechas[p["creado_en"]] is not None
+            for p in filas
+        ]
+        i = 0  # Inicio del tramo
+        for compacto, tramo in groupby(cabe):  # Tramos seguidos que caben (o no) en las columnas
+            fin = i + len(list(tramo))  # Fin del tramo
+            if compacto and self._extender_columnas(filas[i:fin], fechas):  # Caso normal: todo el tramo por columnas
+                pass  # Listo
+            else:  # Productos que se guardan aparte (o sin códigos de categoría libres)
+                for p in filas[i:fin]:  # Uno a uno
+                    self.agregar(p)  # Camino general
+            i = fin  # Siguiente tramo
+
+    def _extender_columnas(self, filas: List[Dict[str, Any]], fechas: Dict[str, Optional[int]]) -> bool:  # Agrega filas que caben en las columnas (False = faltan códigos de categoría)
+        codigos = self._codigo  # Categoría → código
+        nuevas = {p["categoria"] for p in filas} - codigos.keys()  # Categorías aún sin código
+        if len(self.categorias) + len(nuevas) > 255:  # No alcanzan los códigos (255 = fila guardada aparte)
+            return False  # Lo resuelve agregar() fila a fila
+        for cat in nuevas:  # Registramos
+            codigos[cat] = len(self.categorias)  # Nuevo código
+            self.categorias.append(sys.intern(cat))  # Texto compartido
+        self.skus += [p["sku"] for p in filas]  # Columna SKU
+        self.nombres += [p["nombre"] for p in filas]  # Columna nombre
+        self._cat.extend([codigos[p["categoria"]] for p in filas])  # Columna categoría
+        self.precios.extend([p["precio"] for p in filas])  # Columna precio
+        self.stocks.extend([p["stock"] for p in filas])  # Columna stock
+        self._activo.extend([p["activo"] for p in filas])  # Columna activo (bool → 0/1)
+        self._creado.extend([fechas[p["creado_en"]] for p in filas])  # Columna fecha (ya empaquetada)
+        return True  # Agregadas
+
+    def __len__(self) -> int:  # Cantidad de productos
+        return len(self.skus)  # Largo de cualquier columna
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:  # Producto i como dict (misma forma que el original)
+        if i < 0:  # Índices negativos como en una lista
+            i += len(self.skus)  # Desde el final
+        original = self._originales.get(i) if self._originales else None  # ¿Se guardó aparte?
+        if original is not None:  # Sí
+            return dict(original)  # Copia del original
+        return {  # Reconstruido desde las columnas
+            "sku": self.skus[i],
+            "nombre": self.nombres[i],
+            "categoria": self.categorias[self._cat[i]],
+            "precio": self.precios[i],
+            "stock": self.stocks[i],
+            "activo": bool(self._activo[i]),
+            "creado_en": desempaquetar_fecha(self._creado[i]),
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:  # Recorre los productos como dicts (así sirve a persistencia, exportaciones y reportes)
+        for i in range(len(self.skus)):  # Fila a fila
+            yield self[i]  # dict reconstruido
+
+    def a_dicts(self) -> List[Dict[str, Any]]:  # Lista de dicts (la forma de siempre)
+        return list(self)  # Todos
+
+    def valor_inventario(self) -> float:  # Suma de precio*stock directo sobre las columnas (sin crear dicts)
+        if not self._originales:  # Caso normal: todo está en columnas
+            return valor_columnas(self.precios, self.stocks)  # Producto punto en C
+        extra = math.fsum(subtotal_producto(p) for p in self._originales.values())  # Guardados aparte (en las columnas valen 0)
+        return valor_columnas(self.precios, self.stocks) + extra  # Total
+
+    # ------------------------- REPORTES SOBRE LAS COLUMNAS (mismos resultados que reportes.py) -------------------------
+
+    def bajo_stock(self, umbral: int = 5) -> List[Any]:  # SKUs con stock <= umbral, en orden (como reportes.productos_bajo_stock)
+        if not self._originales:  # Caso normal: solo columnas
+            return [sku for sku, stock in zip(self.skus, self.stocks) if stock <= umbral]  # Sin crear dicts
+        return [p.get("sku") for p in self if int(p.get("stock", 0)) <= umbral]  # Con productos aparte: mismo criterio que la lista
+
+    def conteo_por_categoria(self) -> Dict[str, int]:  # Categoría → cantidad (orden de primera aparición, como reportes.conteo_por_categoria)
+        if not self._originales:  # Caso normal: se cuentan códigos de 1 byte
+            return {self.categorias[codigo]: n for codigo, n in Counter(self._cat).items()}  # Counter conserva el orden de aparición
+        conteo: Dict[str, int] = {}  # Con productos aparte: recorrido como en reportes
+        for p in self:  # Dicts reconstruidos
+            cat = p.get("categoria", "Otro")  # Misma regla
+            conteo[cat] = conteo.get(cat, 0) + 1  # Contamos
+        return conteo  # Conteo
+
+    def valor_por_categoria(self) -> Dict[str, float]:  # Categoría → suma de precio*stock (orden de primera aparición)
+        if not self._originales:  # Caso normal: una pasada en C por categoría (son pocas)
+            valores = {}  # Resultado
+            for codigo in dict.fromkeys(self._cat):  # Códigos en orden de aparición
+                filas = bytes(map(codigo.__eq__, self._cat))  # 1 en las filas de la categoría
+                valores[self.categorias[codigo]] = valor_columnas(compress(self.precios, filas), compress(self.stocks, filas))  # fsum de esas filas
+            return valores  # Valor por categoría
+        grupos: Dict[str, List[float]] = {}  # Con productos aparte: subtotales agrupados
+        for p in self:  # Dicts reconstruidos
+            grupos.setdefault(p.get("categoria", "Otro"), []).append(subtotal_producto(p))  # Misma regla que ValorizacionInventario
+        return {cat: math.fsum(v) for cat, v in grupos.items()}  # Suma exacta por grupo
@@ -1,7 +1,17 @@
 import json  # Permite leer y escribir JSON
 import os  # Permite trabajar con rutas y crear carpetas
 import sys  # Permite detectar si el programa corre como .exe (PyInstaller)
-from typing import List, Dict, Any  # Tipos para claridad y aprendizaje
+import re  # Versión de la foto leída desde el encabezado del JSON (sin cargarlo completo)
+import threading  # Para compactar el diario en segundo plano
+import time  # Espera del bloqueo entre instancias
+from typing import List, Dict, Any, Optional, Tuple, Set  # Tipos para claridad y aprendizaje
+
+try:  # Bloqueo de archivos entre procesos: msvcrt en Windows, fcntl en Linux/macOS
+    import msvcrt  # Windows
+    fcntl = None  # No se usa
+except ImportError:  # No es Windows
+    msvcrt = None  # No se usa
+    import fcntl  # Linux/macOS
 
 
 def _directorio_base_app(nombre_app: str = "SGP") -> str:  # Devuelve la carpeta base segura para guardar datos
@@ -26,35 +36,528 @@ def obtener_ruta_datos() -> str:  # Construye y devuelve la ruta final del archi
 
 RUTA_DATOS = obtener_ruta_datos()  # Ruta por defecto del “archivo base de datos”
 
+BACKEND = os.environ.get("SGP_BACKEND", "json").strip().lower()  # Almacenamiento elegido por configuración: "json" (por defecto) o "sqlite"
+
+
+def preparar_ruta_datos(ruta_json: str = RUTA_DATOS) -> str:  # Ruta efectiva según BACKEND (migra el JSON a SQLite la primera vez)
+    if BACKEND != "sqlite":  # Modo JSON
+        return ruta_json  # Se usa tal cual
+
+    from . import persistencia_sqlite  # Import local: solo se carga si se usa SQLite
+    ruta_db = os.path.splitext(ruta_json)[0] + ".db"  # Ejemplo: productos.json → productos.db
+    if not os.path.exists(ruta_db) and os.path.exists(ruta_json):  # Primera ejecución con SQLite y hay datos en JSON
+        persistencia_sqlite.migrar_desde_json(ruta_json, ruta_db)  # Migración única
+    return ruta_db  # Desde ahora se usa la base
+
+
+def crear_persistencia(catalogo, ruta: str = RUTA_DATOS, version: Optional[int] = None):  # Crea el componente que guarda cada cambio del catálogo
+    from . import persistencia_sqlite  # Import local (evita import circular)
+    if persistencia_sqlite.es_ruta_sqlite(ruta):  # Base SQLite (SQLite ya bloquea entre procesos)
+        return persistencia_sqlite.SincronizadorSQLite(catalogo, ruta)  # UPSERT/DELETE por cambio
+    return DiarioCambios(catalogo, ruta, version=version)  # JSON con diario de cambios (version = la que se cargó)
+
+
+def ruta_diario(ruta: str = RUTA_DATOS) -> str:  # Ruta del diario de cambios que acompaña al JSON
+    return ruta + ".log"  # Ejemplo: productos.json.log
+
+
+# ------------------------- BLOQUEO ENTRE INSTANCIAS -------------------------
+
+class BloqueoArchivo:  # Bloqueo exclusivo sobre <ruta>.lock: una sola instancia (o hilo) lee/escribe los archivos de datos a la vez
+    def __init__(self, ruta: str, espera: float = 10.0):  # Constructor (espera = segundos máximos esperando a otra instancia)
+        self.ruta = ruta + ".lock"  # Archivo de bloqueo (vacío, solo se bloquea)
+        self.espera = espera  # Tiempo máximo de espera
+        self._f = None  # Archivo abierto mientras dura el bloqueo
+
+    def __enter__(self) -> "BloqueoArchivo":  # Toma el bloqueo (espera si otra instancia lo tiene)
+        os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)  # Carpeta de datos
+        f = open(self.ruta, "a+b")  # Cada uso abre su propio descriptor (así también excluye a otros hilos)
+        limite = time.monotonic() + self.espera  # Hasta cuándo esperamos
+        while True:  # Reintentos cortos
+            try:  # Intentamos sin bloquear
+                if msvcrt is not None:  # Windows
+                    f.seek(0)  # Bloqueamos siempre el primer byte
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)  # Falla si otro lo tiene
+                else:  # Linux/macOS
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)  # Falla si otro lo tiene
+                break  # Lo tenemos
+            except OSError:  # Ocupado
+                if time.monotonic() > limite:  # Esperamos demasiado
+                    f.close()  # Soltamos el archivo
+                    raise TimeoutError(f"Los datos están ocupados por otra instancia ({self.ruta}).")  # Aviso al que llama
+                time.sleep(0.05)  # Reintentamos en un momento
+        self._f = f  # Guardamos el descriptor
+        return self  # Para "with ... as"
+
+    def __exit__(self, *_exc) -> None:  # Suelta el bloqueo
+        if msvcrt is not None:  # Windows
+            self._f.seek(0)  # Mismo byte
+            msvcrt.locking(self._f.fileno(), msvcrt.LK_UNLCK, 1)  # Desbloqueamos
+        else:  # Linux/macOS
+            fcntl.flock(self._f.fileno(), fcntl.LOCK_UN)  # Desbloqueamos
+        self._f.close()  # Cerramos
+        self._f = None  # Ya no hay bloqueo
+
+
+# ------------------------- VERSIONES -------------------------
+# Cada operación del diario lleva un número de versión "v" (1, 2, 3...) y la foto guarda la versión que incluye:
+#   productos.json      {"version": 120, "productos": [...]}
+#   productos.json.log  {"v": 121, "op": "put", "p": {...}}
+# La versión del archivo es la mayor de todas; solo se escribe con el bloqueo tomado, así nunca se repite.
+
+_PATRON_VERSION = re.compile(rb'^\s*\{\s*"version"\s*:\s*(\d+)')  # Encabezado de la foto (la clave "version" se escribe primero)
+
+
+def _estado(ruta: str) -> Optional[tuple]:  # (mtime, tamaño, inodo) de un archivo, o None si no existe
+    try:  # stat es muy barato
+        st = os.stat(ruta)  # Metadatos
+    except FileNotFoundError:  # No existe
+        return None  # Sin estado
+    return (st.st_mtime_ns, st.st_size, st.st_ino)  # Cambia si alguien lo escribe, reemplaza o rota
+
+
+def _version_foto(ruta: str) -> int:  # Versión de la foto leyendo solo su encabezado
+    try:  # Primeros bytes
+        with open(ruta, "rb") as f:  # Binario
+            inicio = f.read(64)  # Alcanza para {"version": N
+    except FileNotFoundError:  # Sin foto
+        return 0  # Versión cero
+    m = _PATRON_VERSION.match(inicio)  # ¿Formato con versión?
+    return int(m.group(1)) if m else 0  # Formato antiguo (lista sola) = versión cero
+
+
+def _ultima_version_diario(ruta_log: str) -> int:  # Versión de la última operación de un diario (lee solo el final)
+    try:  # Últimos 64 KB
+        with open(ruta_log, "rb") as f:  # Binario
+            f.seek(0, os.SEEK_END)  # Final
+            f.seek(max(0, f.tell() - 65536))  # Un tramo final
+            cola = f.read()  # Lo leemos
+    except FileNotFoundError:  # Sin diario
+        return 0  # Versión cero
+    for linea in reversed(cola.splitlines()):  # Desde la última línea
+        try:  # Puede estar cortada
+            op = json.loads(linea)  # Operación
+        except ValueError:  # Incompleta o ilegible
+            continue  # Probamos la anterior
+        if isinstance(op, dict) and "v" in op:  # Con versión
+            return int(op["v"])  # La última escrita
+    return 0  # Diario sin versiones (formato antiguo)
 
-def cargar_productos(ruta: str = RUTA_DATOS) -> List[Dict[str, Any]]:  # Carga productos desde JSON
-    os.makedirs(os.path.dirname(ruta), exist_ok=True)  # Asegura que exista la carpeta donde vive el archivo
+
+def version_actual(ruta: str = RUTA_DATOS) -> int:  # Versión actual de los datos en disco (foto + diarios), sin cargarlos
+    log = ruta_diario(ruta)  # Diario actual
+    return max(_version_foto(ruta), _ultima_version_diario(log + ".1"), _ultima_version_diario(log))  # La mayor
+
+
+# ------------------------- LECTURA -------------------------
+
+def cargar_productos(ruta: str = RUTA_DATOS) -> List[Dict[str, Any]]:  # Carga productos desde JSON (foto + diario de cambios)
+    return cargar_con_version(ruta)[0]  # Solo la lista
+
+
+def cargar_con_version(ruta: str = RUTA_DATOS) -> Tuple[List[Dict[str, Any]], int]:  # (productos, versión) leídos con el bloqueo tomado
+    from . import persistencia_sqlite  # Import local (evita import circular)
+    if persistencia_sqlite.es_ruta_sqlite(ruta):  # Si la ruta es una base SQLite
+        return persistencia_sqlite.cargar_productos(ruta), 0  # Misma API, otro almacenamiento (sin versión)
+
+    with BloqueoArchivo(ruta):  # Nadie compacta ni escribe mientras leemos foto y diarios
+        return _cargar_json(ruta)  # Lectura consistente
+
+
+def _cargar_json(ruta: str) -> Tuple[List[Dict[str, Any]], int]:  # Foto + diarios (quien llama tiene el bloqueo)
+    productos, version = _leer_json(ruta)  # Leemos la última foto completa del catálogo
+    for log in (ruta_diario(ruta) + ".1", ruta_diario(ruta)):  # Diario en compactación (si quedó) y diario actual
+        productos, version = _reproducir_diario(productos, log, version)  # Aplicamos los cambios posteriores a la foto
+    return productos, version  # Lista final y su versión
+
+
+def _leer_json(ruta: str) -> Tuple[List[Dict[str, Any]], int]:  # Lee el archivo JSON principal: (productos, versión)
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)  # Asegura que exista la carpeta donde vive el archivo
 
     if not os.path.exists(ruta):  # Si el archivo no existe aún
-        with open(ruta, "w", encoding="utf-8") as f:  # Lo creamos en escritura
-            f.write("[]")  # Lo iniciamos como lista vacía
-        return []  # Retornamos lista vacía
+        _escribir_json([], ruta)  # Lo iniciamos vacío (versión 0)
+        return [], 0  # Retornamos lista vacía
 
     with open(ruta, "r", encoding="utf-8") as f:  # Abrimos el archivo en lectura
         try:  # Intentamos leer JSON válido
             data = json.load(f)  # Convertimos JSON a estructura Python
         except json.JSONDecodeError:  # Si el archivo estuviera corrupto o mal escrito
-            return []  # Retornamos vacío para no romper la app
+            return [], 0  # Retornamos vacío para no romper la app
 
-    if isinstance(data, list):  # Si el JSON es una lista (formato esperado)
-        return data  # Retornamos esa lista
+    if isinstance(data, list):  # Formato antiguo: solo la lista
+        return data, 0  # Versión cero
 
-    if isinstance(data, dict) and isinstance(data.get("productos"), list):  # Si alguien guardó un dict con "productos"
-        return data["productos"]  # Retornamos la lista dentro del dict
+    if isinstance(data, dict) and isinstance(data.get("productos"), list):  # Formato actual: {"version", "productos"}
+        return data["productos"], int(data.get("version") or 0)  # Lista y versión
 
-    return []  # Cualquier otro formato lo tratamos como vacío
+    return [], 0  # Cualquier otro formato lo tratamos como vacío
 
 
-def guardar_productos(productos: List[Dict[str, Any]], ruta: str = RUTA_DATOS) -> None:  # Guarda productos en JSON
-    os.makedirs(os.path.dirname(ruta), exist_ok=True)  # Asegura que exista la carpeta
+def _reproducir_diario(productos: List[Dict[str, Any]], ruta_log: str, version: int = 0) -> Tuple[List[Dict[str, Any]], int]:  # Aplica un diario sobre una lista
+    if not os.path.exists(ruta_log):  # Si no hay diario
+        return productos, version  # Nada que aplicar
 
-    tmp = ruta + ".tmp"  # Archivo temporal para escritura segura
+    items: List[Optional[Dict[str, Any]]] = list(productos)  # Copia donde None marca un eliminado
+    pos = {p.get("sku"): i for i, p in enumerate(items)}  # SKU → posición (para aplicar en O(1))
+    with open(ruta_log, "r", encoding="utf-8") as f:  # Abrimos el diario
+        for linea in f:  # Una operación por línea
+            try:  # Intentamos leer la operación
+                op = json.loads(linea)  # Convertimos la línea a dict
+            except json.JSONDecodeError:  # Línea cortada por un cierre inesperado
+                continue  # Ignoramos lo incompleto (solo se pierde esa operación)
+            v = op.get("v")  # Versión de la operación (None en diarios antiguos)
+            if v is not None:  # Con versión
+                if v <= version:  # Ya incluida en la foto (o repetida)
+                    continue  # La saltamos
+                version = v  # Avanzamos
+
+            if op.get("op") == "put":  # Alta o modificación
+                p = op.get("p") or {}  # Producto completo
+                i = pos.get(p.get("sku"))  # Posición actual (si existe)
+                if i is None:  # Producto nuevo
+                    pos[p.get("sku")] = len(items)  # Registramos su posición
+                    items.append(p)  # Lo agregamos al final
+                else:  # Producto existente
+                    items[i] = p  # Lo reemplazamos en su lugar
+            elif op.get("op") == "del":  # Eliminación
+                i = pos.pop(op.get("sku"), None)  # Sacamos su posición
+                if i is not None:  # Si existía
+                    items[i] = None  # Lo marcamos como eliminado
+                    por = op.get("por")  # Cambio de SKU: el "put" siguiente ocupa su lugar
+                    if por is not None and por not in pos:  # SKU nuevo libre
+                        pos[por] = i  # El reemplazo queda en la misma posición (como en el catálogo)
+
+    return [p for p in items if p is not None], version  # Lista final sin eliminados y versión alcanzada
+
+
+# ------------------------- ESCRITURA -------------------------
+
+def _escribir_json(productos: List[Dict[str, Any]], ruta: str, sincronizar_disco: bool = False, version: int = 0) -> None:  # Escritura atómica del JSON
+    os.replace(_escribir_temporal(productos, ruta, sincronizar_disco, version), ruta)  # Reemplazamos el archivo real por el temporal (reduce riesgo de corrupción)
+
+
+def _escribir_temporal(productos: List[Dict[str, Any]], ruta: str, sincronizar_disco: bool = False, version: int = 0) -> str:  # Escribe la foto en un temporal y retorna su ruta
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)  # Asegura que exista la carpeta
+
+    if not isinstance(productos, list):  # Si llega el catálogo indexado u otro iterable
+        productos = list(productos)  # Lo pasamos a lista (json.dump solo serializa listas)
+
+    tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"  # Temporal propio (otra instancia puede estar escribiendo el suyo)
     with open(tmp, "w", encoding="utf-8") as f:  # Abrimos el temporal para escribir
-        json.dump(productos, f, ensure_ascii=False, indent=2)  # Guardamos el JSON “bonito” (indentado)
+        json.dump({"version": version, "productos": productos}, f, ensure_ascii=False, indent=2)  # Versión primero (se lee sin cargar todo)
+        if sincronizar_disco:  # Si se pide, forzamos que los datos lleguen al disco antes del reemplazo
+            f.flush()  # Vaciamos el buffer de Python
+            os.fsync(f.fileno())  # Vaciamos el buffer del sistema operativo
+    return tmp  # Ruta del temporal
+
+
+def _borrar(ruta: str) -> None:  # Borra un archivo si existe (sin fallar si no está)
+    try:  # Intentamos borrar
+        os.remove(ruta)  # Eliminamos
+    except FileNotFoundError:  # Si no existía
+        pass  # No hay nada que hacer
+
+
+def guardar_productos(productos: List[Dict[str, Any]], ruta: str = RUTA_DATOS, version_esperada: Optional[int] = None) -> bool:  # Guarda productos en JSON (False = otra instancia cambió los datos)
+    from . import persistencia_sqlite  # Import local (evita import circular)
+    if persistencia_sqlite.es_ruta_sqlite(ruta):  # Si la ruta es una base SQLite
+        persistencia_sqlite.guardar_productos(productos, ruta)  # Reemplazo completo en una transacción
+        return True  # Listo
+
+    with BloqueoArchivo(ruta):  # Nadie escribe mientras reemplazamos todo
+        actual = version_actual(ruta)  # Versión en disco
+        if version_esperada is not None and actual != version_esperada:  # Alguien guardó después de nuestra carga
+            return False  # No pisamos sus cambios (el que llama decide: recargar y reintentar)
+        _escribir_json(productos, ruta, version=actual + 1)  # Foto completa con reemplazo atómico
+        _borrar(ruta_diario(ruta) + ".1")  # La foto ya incluye todo: los diarios quedan obsoletos
+        _borrar(ruta_diario(ruta))  # (si no se borran, se volverían a aplicar al cargar)
+    return True  # Guardado
+
+
+def _sku_op(op: Dict[str, Any]) -> Any:  # SKU afectado por una operación del diario
+    return (op.get("p") or {}).get("sku") if op.get("op") == "put" else op.get("sku")  # put lleva el producto; del, el SKU
+
+
+class DiarioCambios:  # Persistencia por diario: cada cambio se agrega al .log y la foto completa se compacta cada tanto
+    def __init__(self, catalogo, ruta: str = RUTA_DATOS, umbral_bytes: int = 4 * 1024 * 1024, sincronizar_disco: bool = False, version: Optional[int] = None):  # Constructor
+        self.catalogo = catalogo  # Catálogo (CatalogoProductos) que se va a persistir
+        self.ruta = ruta  # Ruta de la foto completa (productos.json)
+        self.ruta_log = ruta_diario(ruta)  # Ruta del diario actual
+        self.umbral_bytes = umbral_bytes  # Tamaño del diario que dispara una compactación
+        self.sincronizar_disco = sincronizar_disco  # True = fsync en cada sincronización (más lento, más seguro)
+        self.version = version_actual(ruta) if version is None else version  # Versión de los datos que ya tiene el catálogo
+        self._pendientes: List[Dict[str, Any]] = []  # Operaciones aún no escritas (se escriben juntas en sincronizar())
+        self._aplicando = False  # True mientras aplicamos cambios de otra instancia (no se vuelven a anotar)
+        self._lectura = (None, 0)  # (inodo, bytes ya leídos) del diario actual: solo se lee lo nuevo
+        self._firma_vista: Optional[tuple] = None  # Estado de foto/diarios la última vez que los revisamos
+        self._foto_vista: Optional[tuple] = None  # Estado de la foto que ya conocemos
+        self._hilo: Optional[threading.Thread] = None  # Hilo de compactación en curso (si hay)
+        with BloqueoArchivo(ruta):  # Estado inicial consistente
+            self._cerrar_linea_cortada()  # Si el último cierre cortó una línea, la terminamos
+            if version_actual(ruta) == self.version:  # Nadie escribió desde que se cargó el catálogo
+                self._marcar_leido()  # Lo que hay en disco ya está en el catálogo
+        catalogo.suscribir(self)  # Recibimos cada alta/cambio/baja del catálogo
+
+    def _cerrar_linea_cortada(self) -> None:  # Evita que una línea incompleta se pegue con la siguiente operación
+        try:  # Intentamos leer el último byte
+            with open(self.ruta_log, "rb") as f:  # Lectura binaria
+                f.seek(0, os.SEEK_END)  # Vamos al final
+                if f.tell() == 0:  # Diario vacío
+                    return  # Nada que reparar
+                f.seek(-1, os.SEEK_END)  # Último byte
+                ultimo = f.read(1)  # Lo leemos
+        except FileNotFoundError:  # Si no hay diario
+            return  # Nada que reparar
+        if ultimo != b"\n":  # Si la última línea quedó a medias
+            with open(self.ruta_log, "ab") as f:  # Abrimos para agregar
+                f.write(b"\n")  # Cerramos esa línea (al cargar se ignora por inválida)
+
+    def _firma(self) -> tuple:  # Estado actual de foto, diario rotado y diario (solo stat: muy barato)
+        return (_estado(self.ruta), _estado(self.ruta_log + ".1"), _estado(self.ruta_log))  # Tres stat
+
+    def _marcar_leido(self) -> None:  # Todo lo que hay en disco ya está en el catálogo (con el bloqueo tomado)
+        self._firma_vista = self._firma()  # Estado visto
+        self._foto_vista = self._firma_vista[0]  # Foto conocida
+        log = self._firma_vista[2]  # Diario actual
+        self._lectura = (log[2], log[1]) if log else (None, 0)  # Próxima lectura desde el final actual
+
+    # ------------------------- REGISTRO DE CAMBIOS -------------------------
+
+    def al_agregar(self, p: Dict[str, Any]) -> None:  # Alta → línea "put"
+        self._anotar({"op": "put", "p": p})  # Guardamos el producto completo
+
+    def al_actualizar(self, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:  # Cambio → "put" (y "del" si cambió el SKU)
+        if anterior.get("sku") != nuevo.get("sku"):  # Si cambió el SKU, el antiguo deja de existir
+            self._anotar({"op": "del", "sku": anterior.get("sku"), "por": nuevo.get("sku")})  # Borramos el SKU antiguo (el nuevo conserva su posición)
+        self._anotar({"op": "put", "p": nuevo})  # Guardamos la versión nueva
+
+    def al_eliminar(self, p: Dict[str, Any]) -> None:  # Baja → línea "del"
+        self._anotar({"op": "del", "sku": p.get("sku")})  # Solo hace falta el SKU
+
+    def al_actualizar_varios(self, pares: List[tuple]) -> None:  # Muchos cambios juntos: las mismas líneas, anotadas en una pasada
+        if self._aplicando:  # Igual que _anotar
+            return  # Ya están en el archivo
+        ops: List[Dict[str, Any]] = []  # Líneas nuevas
+        for anterior, nuevo in pares:  # Cada cambio
+            if anterior.get("sku") != nuevo.get("sku"):  # Cambió el SKU
+                ops.append({"op": "del", "sku": anterior.get("sku"), "por": nuevo.get("sku")})  # Igual que al_actualizar
+            ops.append({"op": "put", "p": nuevo})  # Versión nueva
+        self._pendientes.extend(ops)  # Un solo extend
+
+    def al_eliminar_varios(self, bajas: List[tuple]) -> None:  # Muchas bajas juntas
+        if not self._aplicando:  # Igual que _anotar
+            self._pendientes.extend({"op": "del", "sku": p.get("sku")} for p, in bajas)  # Una línea "del" por baja
+
+    def _anotar(self, op: Dict[str, Any]) -> None:  # Guarda la operación hasta el próximo sincronizar()
+        if not self._aplicando:  # Los cambios que vienen de otra instancia ya están en el archivo
+            self._pendientes.append(op)  # Se serializa al escribir (ahí recibe su versión)
+
+    # ------------------------- CAMBIOS DE OTRAS INSTANCIAS -------------------------
+    #
+    # La sincronización tiene tres pasos para que la parte lenta (bloqueo y disco) pueda ir en otro hilo:
+    #   tomar_pendientes() → hilo de la interfaz: se lleva lo anotado hasta ese momento
+    #   escribir(lote)     → cualquier hilo (uno a la vez): trae lo remoto y agrega el lote al diario, sin tocar el catálogo
+    #   aplicar(resultado) → hilo de la interfaz: lleva al catálogo lo que escribieron otras instancias
+    # sincronizar() y revisar() hacen los tres pasos seguidos en el hilo que los llama.
+
+    def hay_cambios_externos(self) -> bool:  # ¿Alguien tocó los archivos desde la última lectura? (solo stat: se puede llamar seguido)
+        return self._firma() != self._firma_vista  # Comparamos con lo visto
+
+    def revisar(self) -> List[Any]:  # Aplica al catálogo lo que otras instancias escribieron; retorna los SKUs que cambiaron
+        if not self.hay_cambios_externos():  # Nadie tocó los archivos
+            return []  # Nada nuevo
+        return self.aplicar(self.escribir([]))  # Lote vacío: solo lectura
+
+    def _leer_remotos(self) -> Tuple[str, Any]:  # ("foto", productos) u ("ops", operaciones nuevas); con el bloqueo tomado
+        foto = _estado(self.ruta)  # ¿Cambió la foto?
+        if foto != self._foto_vista and _version_foto(self.ruta) > self.version:  # Otra instancia compactó o guardó todo con cambios que no tenemos
+            productos, self.version = _cargar_json(self.ruta)  # Estado completo en disco
+            return "foto", productos  # Se compara con el catálogo al aplicar
+        return "ops", self._operaciones_nuevas()  # Caso normal: solo las líneas nuevas (avanza self.version)
+
+    def aplicar(self, resultado: Tuple[Tuple[str, Any], List[Any], Set[Any]]) -> List[Any]:  # Lleva al catálogo lo traído por escribir(); retorna los SKUs que cambiaron
+        (tipo, datos), _, escritos = resultado  # Lo remoto y los SKUs del lote que escribimos
+        recientes: Set[Any] = {_sku_op(op) for op in self._pendientes}  # Anotados después del lote: son más nuevos que lo remoto
+        if tipo == "foto":  # Estado completo
+            ops = self._diferencias(datos, recientes | escritos)  # Sin historial no se sabe quién tocó qué: se conservan los nuestros
+        else:  # Operaciones sueltas
+            ops = [op for op in datos if _sku_op(op) not in recientes]  # Las del lote en conflicto sí se aplican (gana lo guardado primero)
+
+        cambiados = []  # SKUs tocados
+        self._aplicando = True  # Lo que aplicamos no se vuelve a anotar
+        try:  # Aplicamos en orden
+            for op in ops:  # Cada operación
+                self._aplicar(op)  # Al catálogo (índices, totales y tabla se enteran como con cualquier cambio)
+                cambiados.append(_sku_op(op))  # Cambiado
+        finally:  # Siempre
+            self._aplicando = False  # Volvemos a anotar
+        return cambiados  # Para refrescar la vista
+
+    def _operaciones_nuevas(self) -> List[Dict[str, Any]]:  # Líneas con versión mayor a la nuestra (lee desde donde quedó)
+        ops = []  # Operaciones nuevas
+        inodo, leidos = self._lectura  # Dónde quedamos
+        for ruta_log in (self.ruta_log + ".1", self.ruta_log):  # Rotado (si una compactación está en curso) y actual
+            est = _estado(ruta_log)  # ¿Existe?
+            if est is None:  # No
+                continue  # Siguiente
+            desde = leidos if inodo and est[2] == inodo and est[1] >= leidos else 0  # Mismo archivo que ya leímos: solo el final
+            with open(ruta_log, "rb") as f:  # Binario (posiciones en bytes)
+                f.seek(desde)  # Saltamos lo ya leído
+                datos = f.read()  # Lo nuevo
+            for linea in datos.splitlines():  # Una operación por línea
+                try:  # Puede estar cortada
+                    op = json.loads(linea)  # Operación
+                except ValueError:  # Ilegible
+                    continue  # Se ignora (igual que al cargar)
+                v = op.get("v")  # Versión
+                if v is None or v <= self.version:  # Sin versión (ya cargada al inicio) o ya aplicada
+                    continue  # Se salta
+                self.version = v  # Avanzamos
+                ops.append(op)  # Nueva
+        return ops  # En orden
+
+    def _diferencias(self, productos: List[Dict[str, Any]], locales: Set[Any]) -> List[Dict[str, Any]]:  # Operaciones que llevan el catálogo al estado del disco
+        en_disco = {p.get("sku"): p for p in productos}  # SKU → producto en disco
+        ops = [{"op": "del", "sku": p.get("sku")} for p in self.catalogo if p.get("sku") not in en_disco and p.get("sku") not in locales]  # Ya no existen
+        for sku, p in en_disco.items():  # Existentes en disco
+            if sku not in locales and self.catalogo.obtener(sku) != p:  # Nuevo o distinto (los nuestros sin guardar se conservan)
+                ops.append({"op": "put", "p": p})  # Alta o cambio
+        return ops  # Solo lo distinto
+
+    def _aplicar(self, op: Dict[str, Any]) -> None:  # Aplica una operación del diario al catálogo
+        if op.get("op") == "put":  # Alta o modificación
+            p = op.get("p") or {}  # Producto completo
+            if p.get("sku") in self.catalogo:  # Ya existe
+                self.catalogo.actualizar(p.get("sku"), p)  # Reemplazo
+            else:  # Nuevo
+                self.catalogo.agregar(p)  # Alta
+        elif op.get("op") == "del":  # Baja
+            self.catalogo.eliminar(op.get("sku"))  # Por SKU
+
+    # ------------------------- ESCRITURA -------------------------
+
+    @property
+    def hay_pendientes(self) -> bool:  # ¿Hay cambios anotados sin escribir?
+        return bool(self._pendientes)  # Lista no vacía
+
+    def tomar_pendientes(self) -> List[Dict[str, Any]]:  # Se lleva lo anotado hasta ahora (los cambios siguientes van a una lista nueva)
+        lote, self._pendientes = self._pendientes, []  # Intercambio: el lote ya no cambia aunque sigan llegando cambios
+        return lote  # Para escribir()
+
+    def devolver(self, lote: List[Dict[str, Any]]) -> None:  # Un lote que no se pudo escribir vuelve a quedar pendiente
+        self._pendientes[:0] = lote  # Adelante: es anterior a lo anotado después
+
+    def escribir(self, lote: List[Dict[str, Any]]) -> Tuple[Tuple[str, Any], List[Any], Set[Any]]:  # Trae lo remoto y agrega el lote al diario; retorna (remoto, conflictos, SKUs escritos)
+        propios: Set[Any] = {_sku_op(op) for op in lote}  # SKUs que queremos escribir
+        with BloqueoArchivo(self.ruta):  # Una instancia a la vez
+            estado = (self.version, self._lectura, self._firma_vista, self._foto_vista)  # Hasta dónde leímos (se restaura si falla)
+            try:  # Leer o escribir puede fallar (disco lleno, permisos)
+                return self._escribir_con_bloqueo(lote, propios)  # Lectura remota + nuestras líneas
+            except BaseException:  # Lo remoto leído nunca llegó al catálogo
+                self.version, self._lectura, self._firma_vista, self._foto_vista = estado  # El reintento lo vuelve a leer
+                raise  # El llamador devuelve el lote a pendientes
+
+    def _escribir_con_bloqueo(self, lote: List[Dict[str, Any]], propios: Set[Any]) -> Tuple[Tuple[str, Any], List[Any], Set[Any]]:  # Cuerpo de escribir() (con el bloqueo tomado)
+        remoto = self._leer_remotos()  # Primero lo de otras instancias (control optimista: si tocaron lo mismo, gana lo guardado)
+        conflictos = []  # SKUs que otro cambió primero
+        if remoto[0] == "ops":  # Con historial se sabe exactamente qué tocó cada uno
+            for op in remoto[1]:  # Operaciones remotas
+                sku = _sku_op(op)  # Producto afectado
+                if sku in propios and sku not in conflictos:  # También lo cambiamos aquí
+                    conflictos.append(sku)  # Conflicto
+        if conflictos:  # Nuestros cambios de esos productos se descartan
+            descartar = set(conflictos)  # Conjunto
+            lote = [op for op in lote if _sku_op(op) not in descartar]  # Sin los perdedores
+            propios -= descartar  # Esos sí se toman de lo remoto al aplicar
+        self._escribir_lote(lote)  # Agregamos nuestras líneas con versiones nuevas
+        self._marcar_leido()  # Al día
+        return remoto, conflictos, propios  # Para aplicar() en el hilo del catálogo
+
+    def sincronizar(self) -> List[Any]:  # Escribe los cambios pendientes (barato: solo lo nuevo); retorna SKUs en conflicto
+        conflictos = self._sincronizar()  # Escribimos y traemos lo remoto
+        if self.necesita_compactar():  # Si el diario creció demasiado
+            self.compactar_foto(self.catalogo.como_lista(), self.version, en_segundo_plano=True)  # Lo plegamos en una foto nueva sin bloquear
+        return conflictos  # Productos que otra instancia cambió primero (nuestro cambio se descartó)
+
+    def _sincronizar(self) -> List[Any]:  # Los tres pasos seguidos en este hilo; retorna conflictos
+        if not self._pendientes and not self.hay_cambios_externos():  # Nada nuestro que escribir y nadie más escribió
+            return []  # Sin trabajo
+        lote = self.tomar_pendientes()  # Lo anotado
+        try:  # Puede fallar (bloqueo ocupado, disco)
+            resultado = self.escribir(lote)  # Disco
+        except BaseException:  # No se pierde nada
+            self.devolver(lote)  # Vuelve a quedar pendiente
+            raise  # El llamador decide
+        self.aplicar(resultado)  # Lo remoto al catálogo
+        return resultado[1]  # Conflictos
+
+    def _escribir_lote(self, lote: List[Dict[str, Any]]) -> None:  # Agrega las operaciones al diario en una sola escritura (con el bloqueo tomado)
+        if not lote:  # Si no hay nada que escribir
+            return  # Salimos
+        lineas = []  # Líneas a escribir
+        version = self.version  # Copia local: self.version avanza solo si la escritura termina bien
+        for op in lote:  # Cada operación recibe la siguiente versión
+            version += 1  # Única: solo se asigna con el bloqueo tomado y después de leer lo remoto
+            lineas.append(json.dumps({"v": version, **op}, ensure_ascii=False, separators=(",", ":")) + "\n")  # JSON sin espacios
+        self._cerrar_linea_cortada()  # Por si otra instancia se cortó a mitad de línea
+        with open(self.ruta_log, "a", encoding="utf-8") as f:  # Abrimos en modo agregar (no se deja abierto entre cambios)
+            f.write("".join(lineas))  # Una sola escritura para todas las líneas
+            if self.sincronizar_disco:  # Si se pidió durabilidad fuerte
+                f.flush()  # Vaciamos buffer de Python
+                os.fsync(f.fileno())  # Vaciamos buffer del sistema operativo
+        self.version = version  # Escrito: las versiones quedan tomadas
+
+    # ------------------------- COMPACTACIÓN -------------------------
+
+    def necesita_compactar(self) -> bool:  # ¿El diario pasó el umbral y no hay una compactación en curso?
+        if self._hilo is not None and self._hilo.is_alive():  # Ya hay una
+            return False  # No lanzamos otra
+        try:  # Revisamos el tamaño del diario
+            return os.path.getsize(self.ruta_log) > self.umbral_bytes  # Creció demasiado
+        except OSError:  # Si no existe aún
+            return False  # Nada que compactar
+
+    def compactar(self, en_segundo_plano: bool = False) -> List[Any]:  # Escribe lo pendiente y una foto completa; retorna conflictos
+        conflictos = self._sincronizar()  # La foto debe incluir lo nuestro y lo de otras instancias
+        self.compactar_foto(self.catalogo.como_lista(), self.version, en_segundo_plano)  # Catálogo y disco están al día en este instante
+        return conflictos  # Conflictos encontrados al traer lo remoto
+
+    def compactar_foto(self, foto: List[Dict[str, Any]], version: int, en_segundo_plano: bool = False) -> bool:  # Escribe la foto dada (tomada sin pendientes) y descarta el diario ya incluido
+        if self._hilo is not None and self._hilo.is_alive():  # Si ya hay una compactación en curso
+            return False  # No lanzamos otra
+        ruta_rotado = self.ruta_log + ".1"  # Diario que quedará cubierto por la foto
+        with BloqueoArchivo(self.ruta):  # Rotación consistente
+            if version_actual(self.ruta) != version:  # Alguien escribió después de tomar la foto: no la incluye
+                return False  # Se compactará en otra ocasión
+            if os.path.exists(self.ruta_log):  # Si hay diario actual
+                if os.path.exists(ruta_rotado):  # Quedó un rotado (compactación interrumpida o de otra instancia)
+                    with open(self.ruta_log, "r", encoding="utf-8") as src, open(ruta_rotado, "a", encoding="utf-8") as dst:  # Lo unimos al final
+                        dst.write(src.read())  # Así la foto nueva cubre ambos (las versiones evitan reaplicar)
+                    _borrar(self.ruta_log)  # El diario actual ya quedó dentro del rotado
+                else:  # Caso normal
+                    os.replace(self.ruta_log, ruta_rotado)  # Rotamos: los cambios nuevos irán a un .log vacío
+            rotado = _estado(ruta_rotado)  # Cómo quedó el rotado (si otra instancia le agrega algo, no se borra)
+            self._marcar_leido()  # Al día
+
+        if en_segundo_plano:  # Escritura sin bloquear la interfaz
+            self._hilo = threading.Thread(target=self._compactar, args=(foto, version, ruta_rotado, rotado), daemon=True)  # Hilo de fondo
+            self._hilo.start()  # Lo iniciamos
+        else:  # Escritura inmediata
+            self._compactar(foto, version, ruta_rotado, rotado)  # Compactamos en este hilo
+        return True  # Compactado (o en curso)
+
+    def _compactar(self, foto: List[Dict[str, Any]], version: int, ruta_rotado: str, rotado: Optional[tuple]) -> None:  # Foto atómica + borrado del diario rotado
+        tmp = _escribir_temporal(foto, self.ruta, sincronizar_disco=True, version=version)  # Lo lento, sin el bloqueo
+        with BloqueoArchivo(self.ruta):  # Reemplazo y borrado sin que nadie lea a medias
+            if _version_foto(self.ruta) < version:  # Nadie dejó una foto más nueva mientras escribíamos
+                os.replace(tmp, self.ruta)  # La foto queda en disco antes de borrar el diario
+                self._foto_vista = _estado(self.ruta)  # Foto propia: no hay que releerla
+            else:  # Otra instancia ya compactó algo más nuevo
+                _borrar(tmp)  # La nuestra sobra
+            if rotado is not None and _estado(ruta_rotado) == rotado:  # Nadie agregó nada al rotado desde que lo creamos
+                _borrar(ruta_rotado)  # El diario rotado ya está incluido en la foto
 
-    os.replace(tmp, ruta)  # Reemplazamos el archivo real por el temporal (reduce riesgo de corrupción)
+    def cerrar(self) -> None:  # Deja todo escrito (se llama al cerrar la aplicación)
+        self.sincronizar()  # Escribimos lo pendiente
+        if self._hilo is not None:  # Si hubo compactación en segundo plano
+            self._hilo.join()  # Esperamos que termine
@@ -0,0 +1,242 @@
+import os  # Rutas y carpetas
+import sqlite3  # Base de datos local en un solo archivo (incluida en Python)
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Set  # Tipos para claridad
+
+from .indice_busqueda import SEPARADOR, normalizar_consulta  # Mismo texto normalizado que usa el buscador en memoria
+
+CAMPOS = ("sku", "nombre", "categoria", "precio", "stock", "activo", "creado_en")  # Columnas guardadas (mismo orden que exportaciones.CAMPOS)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS productos (
+    id INTEGER PRIMARY KEY,
+    sku TEXT NOT NULL UNIQUE,
+    nombre TEXT,
+    categoria TEXT,
+    precio REAL,
+    stock INTEGER,
+    activo INTEGER,
+    creado_en TEXT,
+    texto_busqueda TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_productos_categoria ON productos(categoria);
+CREATE INDEX IF NOT EXISTS ix_productos_stock ON productos(stock);
+CREATE INDEX IF NOT EXISTS ix_productos_precio ON productos(precio);
+"""  # Tabla + índices (sku ya tiene índice por UNIQUE); id conserva el orden de inserción
+
+_UPSERT = (  # Alta o reemplazo por SKU (conserva el id, es decir, la posición)
+    "INSERT INTO productos (sku, nombre, categoria, precio, stock, activo, creado_en, texto_busqueda) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(sku) DO UPDATE SET nombre=excluded.nombre, categoria=excluded.categoria, precio=excluded.precio, "
+    "stock=excluded.stock, activo=excluded.activo, creado_en=excluded.creado_en, texto_busqueda=excluded.texto_busqueda"
+)
+
+
+def es_ruta_sqlite(ruta: str) -> bool:  # True si la ruta apunta a una base SQLite (por extensión)
+    return ruta.lower().endswith((".db", ".sqlite", ".sqlite3"))  # Extensiones aceptadas
+
+
+def conectar(ruta: str) -> sqlite3.Connection:  # Abre (o crea) la base y asegura tabla e índices
+    carpeta = os.path.dirname(ruta)  # Carpeta del archivo
+    if carpeta:  # Si la ruta tiene carpeta
+        os.makedirs(carpeta, exist_ok=True)  # La creamos si falta
+    con = sqlite3.connect(ruta)  # Conexión al archivo
+    con.execute("PRAGMA journal_mode=WAL")  # Escrituras con registro previo (lecturas no bloquean, seguro ante cortes)
+    con.execute("PRAGMA synchronous=NORMAL")  # Suficiente con WAL y mucho más rápido que FULL
+    con.executescript(_ESQUEMA)  # Creamos tabla e índices si no existen
+    return con  # Retornamos la conexión
+
+
+def _fila(p: Dict[str, Any]) -> tuple:  # Convierte un producto (dict) en la tupla de columnas
+    texto = SEPARADOR.join(str(p.get(c, "")).casefold() for c in ("sku", "nombre", "categoria"))  # Texto de búsqueda normalizado
+    activo = p.get("activo")  # Activo puede faltar
+    return (  # Tupla en el orden de _UPSERT
+        p.get("sku"), p.get("nombre"), p.get("categoria"), p.get("precio"), p.get("stock"),
+        None if activo is None else int(bool(activo)), p.get("creado_en"), texto,
+    )
+
+
+def _producto(fila: tuple) -> Dict[str, Any]:  # Convierte una fila de la tabla en dict (sin claves que faltaban)
+    p = {c: v for c, v in zip(CAMPOS, fila) if v is not None}  # Solo columnas con valor
+    if "activo" in p:  # El booleano se guarda como 0/1
+        p["activo"] = bool(p["activo"])  # Lo devolvemos como bool
+    return p  # Producto con la misma forma que en el JSON
+
+
+def _consultar(ruta: str, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:  # Ejecuta un SELECT de productos
+    con = conectar(ruta)  # Abrimos la base
+    try:  # Consultamos
+        return [_producto(f) for f in con.execute(sql, tuple(params))]  # Filas → dicts
+    finally:  # Siempre cerramos
+        con.close()  # Cerramos la conexión
+
+
+_SELECT = "SELECT sku, nombre, categoria, precio, stock, activo, creado_en FROM productos"  # Columnas en orden de CAMPOS
+
+
+# ------------------------- API igual a persistencia_json -------------------------
+
+def cargar_productos(ruta: str) -> List[Dict[str, Any]]:  # Carga todos los productos (en orden de inserción)
+    return _consultar(ruta, _SELECT + " ORDER BY id")  # Lista de dicts, igual que el JSON
+
+
+def guardar_productos(productos: Iterable[Dict[str, Any]], ruta: str) -> None:  # Reemplaza todo el contenido en una transacción
+    con = conectar(ruta)  # Abrimos la base
+    try:  # Escribimos
+        with con:  # Transacción: o se guarda todo o nada
+            con.execute("DELETE FROM productos")  # Vaciamos la tabla
+            con.executemany(_UPSERT, (_fila(p) for p in productos))  # Insertamos en lote
+    finally:  # Siempre cerramos
+        con.close()  # Cerramos la conexión
+
+
+def migrar_desde_json(ruta_json: str, ruta_db: str) -> int:  # Copia única del productos.json a la base SQLite
+    from .persistencia_json import cargar_productos as cargar_json  # Import local (persistencia_json también nos importa)
+    productos = cargar_json(ruta_json)  # Leemos JSON (foto + diario)
+    guardar_productos(productos, ruta_db)  # Los guardamos en SQLite
+    return len(productos)  # Cantidad migrada
+
+
+# ------------------------- CONSULTAS RESUELTAS EN SQL -------------------------
+
+def buscar(ruta: str, texto: str) -> List[Dict[str, Any]]:  # Igual que gestion_datos.buscar, pero dentro de SQLite
+    q = normalizar_consulta(texto)  # Mismo criterio de normalización (strip + casefold)
+    if not q:  # Sin texto
+        return cargar_productos(ruta)  # Todos los productos
+    return _consultar(ruta, _SELECT + " WHERE instr(texto_busqueda, ?) > 0 ORDER BY id", (q,))  # Subcadena en SKU/nombre/categoría
+
+
+def productos_bajo_stock(ruta: str, umbral: int = 5) -> List[Dict[str, Any]]:  # Igual que reportes.productos_bajo_stock (usa el índice de stock)
+    return _consultar(ruta, _SELECT + " WHERE stock <= ? OR stock IS NULL ORDER BY id", (int(umbral),))  # Filtro por rango (sin stock cuenta como 0)
+
+
+def conteo_por_categoria(ruta: str) -> Dict[str, int]:  # Igual que reportes.conteo_por_categoria (GROUP BY)
+    con = conectar(ruta)  # Abrimos la base
+    try:  # Consultamos
+        filas = con.execute("SELECT COALESCE(categoria, 'Otro'), COUNT(*) FROM productos GROUP BY 1")  # Conteo por categoría
+        return {cat: n for cat, n in filas}  # Dict categoría → cantidad
+    finally:  # Siempre cerramos
+        con.close()  # Cerramos la conexión
+
+
+def valor_inventario(ruta: str, categoria: Optional[str] = None) -> float:  # Suma de precio*stock (total o de una categoría)
+    sql = "SELECT COALESCE(SUM(COALESCE(precio, 0) * COALESCE(stock, 0)), 0) FROM productos"  # Suma en SQL
+    params: tuple = ()  # Sin filtro por defecto
+    if categoria is not None:  # Si se pide una categoría
+        sql += " WHERE categoria = ?"  # Usa el índice de categoría
+        params = (categoria,)  # Parámetro del filtro
+    con = conectar(ruta)  # Abrimos la base
+    try:  # Consultamos
+        return float(con.execute(sql, params).fetchone()[0])  # Un solo número
+    finally:  # Siempre cerramos
+        con.close()  # Cerramos la conexión
+
+
+class SincronizadorSQLite:  # Aplica cada alta/cambio/baja del catálogo como UPSERT/DELETE (misma interfaz que DiarioCambios)
+    def __init__(self, catalogo, ruta: str):  # Constructor
+        self.catalogo = catalogo  # Catálogo (CatalogoProductos) que se persiste
+        self.ruta = ruta  # Ruta de la base
+        self._con = conectar(ruta)  # Conexión abierta mientras viva la aplicación
+        self._conflictos: Dict[Any, Any] = {}  # SKU en el catálogo → SKU que conserva la base (cambio de SKU que otra instancia ganó)
+        self._aplicando = False  # True mientras deshacemos un conflicto en el catálogo (no se vuelve a escribir)
+        catalogo.suscribir(self)  # Recibimos cada cambio
+
+    def al_agregar(self, p: Dict[str, Any]) -> None:  # Alta → UPSERT
+        if not self._aplicando:  # Lo que viene de la base ya está en ella
+            self._con.execute(_UPSERT, _fila(p))  # Queda dentro de la transacción abierta
+
+    def al_actualizar(self, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:  # Cambio → UPDATE en la misma fila
+        if self._aplicando:  # Lo que viene de la base ya está en ella
+            return  # Nada que escribir
+        sku = anterior.get("sku")  # SKU con que está en la base
+        if sku in self._conflictos:  # Producto cuyo cambio de SKU perdió: su fila en la base es otra
+            self._conflictos[nuevo.get("sku")] = self._conflictos.pop(sku)  # Seguimos su SKU; se deshace al sincronizar
+            return  # No se escribe
+        try:  # Actualizamos por SKU anterior (así se conserva la posición aunque cambie el SKU)
+            self._con.execute(
+                "UPDATE productos SET sku=?, nombre=?, categoria=?, precio=?, stock=?, activo=?, creado_en=?, texto_busqueda=? WHERE sku=?",
+                _fila(nuevo) + (sku,),
+            )
+        except sqlite3.IntegrityError:  # El SKU nuevo ya existe en la base (otra instancia lo guardó primero)
+            self._conflictos[nuevo.get("sku")] = sku  # SQLite ya deshizo la sentencia; el catálogo se corrige al sincronizar
+
+    def al_eliminar(self, p: Dict[str, Any]) -> None:  # Baja → DELETE
+        if self._aplicando:  # Lo que viene de la base ya está en ella
+            return  # Nada que escribir
+        sku = self._conflictos.pop(p.get("sku"), p.get("sku"))  # Si su cambio de SKU perdió, en la base sigue con el SKU antiguo
+        self._con.execute("DELETE FROM productos WHERE sku = ?", (sku,))  # Borramos por SKU (índice único)
+
+    def al_actualizar_varios(self, pares: List[tuple]) -> None:  # Muchos cambios juntos: un solo executemany para los que conservan su SKU
+        if self._aplicando:  # Lo que viene de la base ya está en ella
+            return  # Nada que escribir
+        filas = []  # Parámetros del UPDATE en lote
+        for anterior, nuevo in pares:  # Cada cambio
+            sku = anterior.get("sku")  # SKU con que está en la base
+            if sku == nuevo.get("sku") and sku not in self._conflictos:  # Caso común (ajuste de precio, stock, etc.): no puede chocar con otro SKU
+                filas.append(_fila(nuevo) + (sku,))  # Al lote
+            else:  # Cambio de SKU o conflicto pendiente: camino normal (maneja el IntegrityError)
+                self._actualizar_filas(filas)  # Lo anterior primero (se respeta el orden)
+                filas = []  # Lote nuevo
+                self.al_actualizar(anterior, nuevo)  # Uno por uno
+        self._actualizar_filas(filas)  # El resto
+
+    def _actualizar_filas(self, filas: List[tuple]) -> None:  # UPDATE en lote por SKU (filas = _fila(nuevo) + (sku,))
+        self._con.executemany(
+            "UPDATE productos SET sku=?, nombre=?, categoria=?, precio=?, stock=?, activo=?, creado_en=?, texto_busqueda=? WHERE sku=?",
+            filas,
+        )  # Queda dentro de la transacción abierta
+
+    def al_eliminar_varios(self, bajas: List[tuple]) -> None:  # Muchas bajas juntas: un solo executemany
+        if self._aplicando:  # Lo que viene de la base ya está en ella
+            return  # Nada que escribir
+        skus = [(self._conflictos.pop(p.get("sku"), p.get("sku")),) for p, in bajas]  # Igual que al_eliminar
+        self._con.executemany("DELETE FROM productos WHERE sku = ?", skus)  # Borramos por SKU (índice único)
+
+    def _resolver_conflictos(self) -> List[Any]:  # Deshace en el catálogo los cambios de SKU que la base rechazó; retorna esos SKUs
+        conflictos, self._conflictos = list(self._conflictos.items()), {}  # Conflictos anotados
+        self._aplicando = True  # Lo que aplicamos no se vuelve a escribir
+        try:  # Gana lo guardado (igual que en DiarioCambios)
+            for sku, sku_base in conflictos:  # Cada cambio rechazado
+                filas = self._con.execute(_SELECT + " WHERE sku = ?", (sku_base,)).fetchall()  # Versión guardada del producto
+                if filas and sku_base not in self.catalogo:  # Sigue en la base con su SKU antiguo
+                    self.catalogo.actualizar(sku, _producto(filas[0]))  # Vuelve a su SKU y datos guardados (misma posición)
+                else:  # Ya no está en la base (o el catálogo ya tiene ese SKU)
+                    self.catalogo.eliminar(sku)  # Se quita del catálogo
+        finally:  # Siempre
+            self._aplicando = False  # Volvemos a escribir
+        return [sku for sku, _ in conflictos]  # SKUs que otra instancia tomó primero
+
+    def sincronizar(self) -> List[Any]:  # Confirma los cambios pendientes (una transacción por acción del usuario); retorna SKUs en conflicto
+        self._con.commit()  # COMMIT (SQLite bloquea la base entre procesos por su cuenta)
+        return self._resolver_conflictos()  # Cambios de SKU rechazados por la base
+
+    def revisar(self) -> List[Any]:  # Compatibilidad con DiarioCambios (los cambios de otras instancias se ven al recargar)
+        return []  # Nada que aplicar
+
+    @property
+    def hay_pendientes(self) -> bool:  # ¿Hay cambios sin confirmar (o conflictos sin resolver)?
+        return self._con.in_transaction or bool(self._conflictos)  # Transacción abierta o conflictos anotados
+
+    def hay_cambios_externos(self) -> bool:  # Compatibilidad con DiarioCambios
+        return False  # No se siguen
+
+    def tomar_pendientes(self) -> List[Any]:  # Confirma aquí mismo (la conexión solo se puede usar desde el hilo que la abrió); el lote son los SKUs en conflicto
+        return self.sincronizar()  # COMMIT (rápido: los cambios ya están en la transacción) y conflictos resueltos
+
+    def devolver(self, lote: List[Dict[str, Any]]) -> None:  # Compatibilidad con DiarioCambios
+        pass  # Nunca hay lote
+
+    def escribir(self, lote: List[Any]) -> Tuple[Tuple[str, Any], List[Any], Set[Any]]:  # Compatibilidad con DiarioCambios (informa los conflictos de tomar_pendientes)
+        return ("ops", []), list(lote), set()  # Nada remoto; conflictos ya resueltos en el catálogo
+
+    def aplicar(self, resultado: Tuple[Tuple[str, Any], List[Any], Set[Any]]) -> List[Any]:  # Compatibilidad con DiarioCambios; retorna los SKUs que cambiaron
+        return list(resultado[1])  # Los conflictos ya se deshicieron en el catálogo (hay que refrescar la vista)
+
+    def necesita_compactar(self) -> bool:  # Compatibilidad con DiarioCambios
+        return False  # SQLite no lo necesita
+
+    def compactar(self, en_segundo_plano: bool = False) -> List[Any]:  # Compatibilidad con DiarioCambios (SQLite no lo necesita)
+        return self.sincronizar()  # Basta con confirmar
+
+    def cerrar(self) -> None:  # Confirma y cierra la conexión
+        self.sincronizar()  # COMMIT final
+        self._con.close()  # Cerramos
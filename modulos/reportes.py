@@ -1,11 +1,91 @@
-from typing import List, Dict, Any  # Tipos para documentar
+from typing import List, Dict, Any, Iterable, Optional  # Tipos para documentar
+
+from .funciones_utiles import ValorizacionInventario  # Valor por categoría mantenido al día
+from .indices_ordenados import IndiceOrdenado  # Productos ordenados por stock
 
 def productos_bajo_stock(productos: List[Dict[str, Any]], umbral: int = 5) -> List[Dict[str, Any]]:  # Filtra productos con stock bajo
+    if hasattr(productos, "agregados"):  # Catálogo indexado: respuesta desde el índice por stock (sin recorrer todo)
+        return sorted(productos.agregados.bajo_stock(umbral), key=lambda p: productos.posicion(p.get("sku")))  # Mismo orden que el recorrido
     return [p for p in productos if int(p.get("stock", 0)) <= umbral]  # List comprehension con condición
 
 def conteo_por_categoria(productos: List[Dict[str, Any]]) -> Dict[str, int]:  # Cuenta cuántos productos hay por categoría
+    if hasattr(productos, "agregados"):  # Catálogo indexado: conteo mantenido al día
+        return productos.agregados.conteo_por_categoria()  # Copia del conteo
     conteo = {}  # Diccionario para acumular conteos
     for p in productos:  # Recorremos productos
         cat = p.get("categoria", "Otro")  # Obtenemos categoría, si falta usamos "Otro"
         conteo[cat] = conteo.get(cat, 0) + 1  # Sumamos 1 al contador de esa categoría
     return conteo  # Retornamos el dict con conteos
+
+
+class AgregadosReporte:  # Conteo y valor por categoría + productos ordenados por stock, al día con cada cambio del catálogo
+    def __init__(self, productos: Iterable[Dict[str, Any]] = (), por_stock: Optional[IndiceOrdenado] = None):  # Constructor (por_stock: índice ya suscrito al catálogo)
+        self._conteo: Dict[str, int] = {}  # Categoría → cantidad de productos
+        self.valorizacion = ValorizacionInventario()  # Total y valor por categoría
+        if iter(productos) is productos:  # Un generador solo se puede recorrer una vez
+            productos = list(productos)  # Lo materializamos (índice + conteo)
+        self._stock_propio = por_stock is None  # True = este componente mantiene su propio índice por stock
+        self.por_stock = IndiceOrdenado("stock", productos) if por_stock is None else por_stock  # Productos ordenados por stock
+
+        for p in productos:  # Recorremos una sola vez
+            self._contar(p, 1)  # Conteo y valor
+
+    # ------------------------- MANTENCIÓN INCREMENTAL -------------------------
+
+    def al_agregar(self, p: Dict[str, Any]) -> None:  # Alta
+        self._contar(p, 1)  # Conteo y valor
+        if self._stock_propio:  # Índice propio
+            self.por_stock.al_agregar(p)  # Inserción ordenada
+
+    def al_eliminar(self, p: Dict[str, Any]) -> None:  # Baja
+        self._contar(p, -1)  # Conteo y valor
+        if self._stock_propio:  # Índice propio
+            self.por_stock.al_eliminar(p)  # Borrado por búsqueda binaria
+
+    def al_actualizar(self, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:  # Cambio (puede mover el producto en el orden)
+        self.al_eliminar(anterior)  # Sale la versión anterior
+        self.al_agregar(nuevo)  # Entra la nueva
+
+    def al_actualizar_varios(self, pares: List[tuple]) -> None:  # Muchos cambios juntos: conteo en una pasada y valor sumado por categoría
+        for anterior, nuevo in pares:  # Cada cambio
+            self._ajustar_conteo(anterior.get("categoria", "Otro"), -1)  # Sale la categoría anterior
+            self._ajustar_conteo(nuevo.get("categoria", "Otro"), 1)  # Entra la nueva
+        self.valorizacion.al_actualizar_varios(pares)  # fsum por categoría
+        if self._stock_propio:  # Índice propio
+            self.por_stock.al_actualizar_varios(pares)  # Una reconstrucción si son muchos
+
+    def al_eliminar_varios(self, bajas: List[tuple]) -> None:  # Muchas bajas juntas
+        for (p,) in bajas:  # Cada baja
+            self._ajustar_conteo(p.get("categoria", "Otro"), -1)  # Descontamos
+        self.valorizacion.al_eliminar_varios(bajas)  # fsum por categoría
+        if self._stock_propio:  # Índice propio
+            self.por_stock.al_eliminar_varios(bajas)  # Una reconstrucción si son muchas
+
+    def _ajustar_conteo(self, cat: str, signo: int) -> None:  # Suma o resta un producto al conteo de su categoría
+        restantes = self._conteo.get(cat, 0) + signo  # Nuevo conteo
+        if restantes > 0:  # Quedan productos
+            self._conteo[cat] = restantes  # Guardamos
+        else:  # Era el último
+            self._conteo.pop(cat, None)  # La categoría desaparece (como en un recorrido completo)
+
+    def _contar(self, p: Dict[str, Any], signo: int) -> None:  # Ajusta conteo y valor de la categoría
+        self._ajustar_conteo(p.get("categoria", "Otro"), signo)  # Igual que conteo_por_categoria
+        if signo > 0:  # Alta
+            self.valorizacion.al_agregar(p)  # Suma su valor
+        else:  # Baja
+            self.valorizacion.al_eliminar(p)  # Resta su valor
+
+    # ------------------------- CONSULTAS (costo proporcional al resultado) -------------------------
+
+    def conteo_por_categoria(self) -> Dict[str, int]:  # Categoría → cantidad (copia)
+        return dict(self._conteo)  # Son pocas categorías
+
+    def valor_por_categoria(self) -> Dict[str, float]:  # Categoría → valor del inventario (solo categorías con productos)
+        valores = self.valorizacion.por_categoria  # Valores mantenidos al día
+        return {cat: valores.get(cat, 0.0) for cat in self._conteo}  # Mismas claves que el conteo
+
+    def bajo_stock(self, umbral: int = 5) -> List[Dict[str, Any]]:  # Productos con stock <= umbral, de menor a mayor stock
+        return self.por_stock.rango(hasta=umbral)  # Búsqueda binaria + recorrido del resultado
+
+    def menor_stock(self, k: int) -> List[Dict[str, Any]]:  # Los k productos con menos stock
+        return self.por_stock.primeros(k)  # Primeras k entradas
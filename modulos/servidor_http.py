@@ -0,0 +1,252 @@
+import asyncio  # Servidor TCP asíncrono de la biblioteca estándar (sin dependencias externas)
+import json  # Respuestas JSON
+import time  # Marca de arranque (las ETag no se repiten entre reinicios)
+from contextlib import suppress  # Cierre de conexiones sin ruido
+from http import HTTPStatus  # Textos de los códigos de estado
+from typing import List, Dict, Any, Optional, Tuple, Callable  # Tipos para claridad
+from urllib.parse import urlsplit, parse_qsl, unquote  # Ruta y parámetros del pedido
+
+from .persistencia_json import cargar_con_version, crear_persistencia  # Carga con versión y seguimiento de otras instancias
+from .gestion_datos import CatalogoProductos  # Catálogo indexado (búsqueda y SKU en O(1))
+from .reportes import productos_bajo_stock, conteo_por_categoria  # Reportes (desde los agregados mantenidos al día)
+
+POR_PAGINA = 100  # Productos por página si el cliente no indica otra cantidad (por_pagina=0 = todos)
+LOTE_TRANSMISION = 500  # Productos por trozo al transmitir; una página más grande se envía en trozos (chunked)
+MAX_RESPUESTAS = 512  # Respuestas armadas que se guardan por versión del catálogo
+MAX_RESULTADOS = 32  # Listas de resultados (búsquedas, bajo stock) que se guardan por versión (para paginar sin recalcular)
+MAX_CABECERA = 16 * 1024  # Tamaño máximo de la cabecera de un pedido
+ESPERA_INACTIVA = 15.0  # Segundos que una conexión keep-alive puede quedar sin pedidos
+
+_JSON = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode  # Serializador compacto (se crea una sola vez)
+
+
+class ErrorHTTP(Exception):  # Error que se responde al cliente como {"error": ...} con su código
+    def __init__(self, estado: int, mensaje: str):  # Constructor
+        super().__init__(mensaje)  # Mensaje
+        self.estado = estado  # Código HTTP
+
+
+def _leer_pedido(cabecera: bytes) -> Tuple[str, str, str, Dict[str, str]]:  # (método, destino, versión HTTP, cabeceras en minúsculas)
+    lineas = cabecera.decode("latin-1").split("\r\n")  # Las cabeceras HTTP son latin-1
+    metodo, destino, version = lineas[0].split(" ")  # "GET /productos?q=x HTTP/1.1" (ValueError si viene mal)
+    cabeceras = {}  # Nombre → valor
+    for linea in lineas[1:]:  # Una cabecera por línea
+        nombre, sep, valor = linea.partition(":")  # "Nombre: valor"
+        if sep:  # Línea válida
+            cabeceras[nombre.strip().lower()] = valor.strip()  # Los nombres no distinguen mayúsculas
+    return metodo, destino, version, cabeceras  # Pedido
+
+
+def _entero(params: Dict[str, str], nombre: str, defecto: int, minimo: int = 0) -> int:  # Parámetro entero de la URL (400 si no lo es)
+    try:  # Convertimos
+        valor = int(params.get(nombre, defecto))  # Texto → int
+    except ValueError:  # No es número
+        raise ErrorHTTP(400, f"'{nombre}' debe ser un número entero.")  # Pedido inválido
+    if valor < minimo:  # Fuera de rango
+        raise ErrorHTTP(400, f"'{nombre}' debe ser >= {minimo}.")  # Pedido inválido
+    return valor  # Valor
+
+
+class ServidorCatalogo:  # API HTTP de solo lectura sobre un CatalogoProductos (SKU, búsqueda, bajo stock y categorías)
+    def __init__(self, catalogo: CatalogoProductos, diario=None, revisar_cada: float = 2.0, espera_inactiva: float = ESPERA_INACTIVA):  # Constructor
+        self.catalogo = catalogo  # Catálogo que se sirve
+        self.diario = diario  # DiarioCambios (o SincronizadorSQLite) para seguir lo que guardan otras instancias (None = catálogo fijo)
+        self.revisar_cada = revisar_cada  # Segundos entre revisiones del archivo
+        self.espera_inactiva = espera_inactiva  # Tiempo máximo de una conexión sin pedidos
+        self.peticiones = 0  # Pedidos atendidos
+        self.no_modificadas = 0  # Respuestas 304 (el cliente ya tenía la versión actual)
+        self._arranque = format(time.time_ns(), "x")  # Parte fija de la ETag (el catálogo vuelve a versión 0 al reiniciar)
+        self._version_cache = None  # Versión del catálogo a la que corresponden los caches
+        self._respuestas: Dict[str, Tuple[int, bytes]] = {}  # Destino → (estado, cuerpo) ya serializado
+        self._resultados: Dict[tuple, List[Dict[str, Any]]] = {}  # Consulta → lista completa de resultados (cada página es un corte)
+        self._servidor: Optional[asyncio.AbstractServer] = None  # Servidor TCP
+        self._revision: Optional[asyncio.Task] = None  # Tarea que revisa el archivo
+
+    # ------------------------- CICLO DE VIDA -------------------------
+
+    async def iniciar(self, host: str = "127.0.0.1", puerto: int = 8080) -> asyncio.AbstractServer:  # Abre el puerto (puerto=0 = uno libre)
+        self._servidor = await asyncio.start_server(self._atender, host, puerto, limit=MAX_CABECERA)  # Una corrutina por conexión
+        if self.diario is not None:  # Seguimos los cambios de las instancias de escritorio
+            self._revision = asyncio.create_task(self._revisar())  # En el mismo bucle: el catálogo nunca cambia a mitad de una respuesta armada
+        return self._servidor  # Para consultar el puerto real
+
+    async def detener(self) -> None:  # Cierra el puerto y la revisión del archivo
+        if self._revision is not None:  # Si estaba revisando
+            self._revision.cancel()  # Cancelamos
+            with suppress(asyncio.CancelledError):  # Cancelación esperada
+                await self._revision  # Esperamos que termine
+        if self._servidor is not None:  # Si estaba abierto
+            self._servidor.close()  # No acepta más conexiones
+            await self._servidor.wait_closed()  # Esperamos el cierre
+
+    async def _revisar(self) -> None:  # Aplica al catálogo lo que guardan otras instancias (la versión cambia y las ETag también)
+        while True:  # Hasta que se detenga el servidor
+            await asyncio.sleep(self.revisar_cada)  # Intervalo
+            try:  # Casi siempre: tres stat y nada más
+                self.diario.revisar()  # Solo los productos que cambiaron
+            except TimeoutError:  # Otra instancia tiene el bloqueo
+                pass  # Reintentamos en la próxima vuelta
+
+    # ------------------------- CONEXIONES -------------------------
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:  # Una conexión: varios pedidos seguidos (keep-alive)
+        try:  # Siempre cerramos al final
+            while True:  # Un pedido por vuelta
+                try:  # Esperamos la cabecera completa
+                    cabecera = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.espera_inactiva)  # Hasta la línea en blanco
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):  # Inactiva, cerrada o cabecera gigante
+                    return  # Cerramos la conexión
+                try:  # Interpretamos
+                    metodo, destino, version, cabeceras = _leer_pedido(cabecera)  # Pedido
+                    largo = int(cabeceras.get("content-length") or 0)  # Un GET no trae cuerpo, pero si viene hay que consumirlo
+                except ValueError:  # Línea de pedido o largo inválidos
+                    self._escribir(writer, 400, False, _JSON({"error": "Pedido HTTP inválido."}).encode())  # Respondemos y cerramos
+                    await writer.drain()  # Enviamos
+                    return  # Sin keep-alive
+                if largo:  # Descartamos el cuerpo
+                    await reader.readexactly(largo)  # Para que el próximo pedido empiece donde corresponde
+                conexion = cabeceras.get("connection", "").lower()  # keep-alive / close
+                seguir = conexion != "close" if version == "HTTP/1.1" else conexion == "keep-alive"  # HTTP/1.1 mantiene por defecto; 1.0 solo si lo pide
+                if not await self._responder(writer, metodo, destino, cabeceras, seguir, version == "HTTP/1.1"):  # Respuesta
+                    return  # El cliente pidió cerrar (o la respuesta terminó con el cierre)
+        except (ConnectionError, asyncio.IncompleteReadError):  # El cliente se fue a mitad de camino
+            pass  # Nada que hacer
+        finally:  # Cierre
+            writer.close()  # Cerramos el socket
+            with suppress(Exception):  # Puede estar ya cerrado
+                await writer.wait_closed()  # Esperamos el cierre
+
+    # ------------------------- RESPUESTAS -------------------------
+
+    async def _responder(self, writer: asyncio.StreamWriter, metodo: str, destino: str, cabeceras: Dict[str, str], seguir: bool, trozos: bool) -> bool:  # Atiende un pedido; retorna si la conexión sigue
+        self.peticiones += 1  # Contador
+        if metodo not in ("GET", "HEAD"):  # API de solo lectura
+            self._escribir(writer, 405, seguir, _JSON({"error": "Solo se permiten GET y HEAD."}).encode())  # No permitido
+            await writer.drain()  # Enviamos
+            return seguir  # La conexión sigue
+
+        version = self.catalogo.version  # Versión actual del catálogo
+        etag = f'"{self._arranque}-{version}"'  # Misma versión = misma respuesta para cualquier URL
+        enviada = cabeceras.get("if-none-match")  # ETag que ya tiene el cliente
+        if enviada and (enviada == "*" or etag in (e.strip() for e in enviada.split(","))):  # No cambió nada desde su última consulta
+            self.no_modificadas += 1  # Contador
+            self._escribir(writer, 304, seguir, etag=etag)  # Sin cuerpo y sin consultar el catálogo
+            await writer.drain()  # Enviamos
+            return seguir  # La conexión sigue
+
+        if self._version_cache != version:  # El catálogo cambió: lo guardado ya no sirve
+            self._respuestas.clear()  # Respuestas armadas
+            self._resultados.clear()  # Listas de resultados
+            self._version_cache = version  # Nueva versión
+
+        guardada = self._respuestas.get(destino)  # ¿Ya armamos esta respuesta en esta versión?
+        if guardada is None:  # Primera vez
+            try:  # Consultamos
+                partes = urlsplit(destino)  # Ruta y parámetros
+                params = dict(parse_qsl(partes.query))  # Parámetros (el último gana)
+                respuesta = self._consultar(partes.path, params)  # dict (respuesta completa) o lista (paginada)
+                if isinstance(respuesta, list):  # Resultado paginado
+                    pagina = _entero(params, "pagina", 1, minimo=1)  # Página pedida (desde 1)
+                    por_pagina = _entero(params, "por_pagina", POR_PAGINA)  # Tamaño de página (0 = todos)
+                    inicio = (pagina - 1) * por_pagina  # Primer producto de la página
+                    items = respuesta[inicio:inicio + por_pagina] if por_pagina else respuesta  # Corte (sin copiar si son todos)
+                    encabezado = {"total": len(respuesta), "pagina": pagina, "por_pagina": por_pagina}  # Datos para pedir las demás páginas
+                    if len(items) > LOTE_TRANSMISION:  # Página grande: se transmite en trozos sin armarla completa en memoria
+                        return await self._transmitir(writer, metodo, etag, seguir and trozos, trozos, encabezado, items)  # Streaming
+                    respuesta = dict(encabezado, productos=items)  # Página chica: respuesta completa
+                guardada = (200, _JSON(respuesta).encode())  # Serializada una sola vez por versión
+            except ErrorHTTP as e:  # Pedido inválido o SKU inexistente
+                guardada = (e.estado, _JSON({"error": str(e)}).encode())  # Error como JSON
+            if len(self._respuestas) >= MAX_RESPUESTAS:  # Cache lleno
+                self._respuestas.clear()  # Empezamos de nuevo (simple y acotado)
+            self._respuestas[destino] = guardada  # Guardamos
+
+        estado, cuerpo = guardada  # Respuesta
+        self._escribir(writer, estado, seguir, cuerpo if metodo == "GET" else None, etag if estado == 200 else None, len(cuerpo))  # HEAD: solo cabeceras
+        await writer.drain()  # Respeta el ritmo del cliente
+        return seguir  # La conexión sigue
+
+    def _consultar(self, ruta: str, params: Dict[str, str]) -> Any:  # Ruta → dict (respuesta completa) o lista de productos (se pagina)
+        if ruta == "/salud":  # Estado del servidor
+            return {"productos": len(self.catalogo), "version": self.catalogo.version}  # Tamaño y versión
+        if ruta == "/productos":  # Búsqueda por SKU/nombre/categoría (sin q = todos)
+            q = params.get("q", "")  # Texto
+            return self._resultado(("buscar", q), lambda: self.catalogo.buscar(q, por_relevancia=True))  # SKU exacto primero
+        if ruta.startswith("/productos/"):  # Un producto por SKU
+            sku = unquote(ruta[len("/productos/"):])  # SKU (puede venir codificado)
+            p = self.catalogo.obtener(sku)  # O(1)
+            if p is None:  # No existe
+                raise ErrorHTTP(404, f"No existe el SKU {sku}.")  # 404
+            return p  # Producto
+        if ruta == "/reportes/bajo-stock":  # Productos a reponer
+            umbral = _entero(params, "umbral", 5)  # Umbral de stock
+            return self._resultado(("bajo-stock", umbral), lambda: productos_bajo_stock(self.catalogo, umbral))  # Desde el índice por stock
+        if ruta == "/reportes/categorias":  # Conteo y valor por categoría
+            agregados = self.catalogo.agregados  # Mantenidos al día
+            return {"conteo": conteo_por_categoria(self.catalogo), "valor": agregados.valor_por_categoria(), "total": agregados.valorizacion.total}  # Sin recorrer el catálogo
+        raise ErrorHTTP(404, f"Ruta desconocida: {ruta}")  # 404
+
+    def _resultado(self, clave: tuple, calcular: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:  # Lista de resultados guardada por versión (las páginas siguientes no recalculan)
+        lista = self._resultados.get(clave)  # ¿Ya calculada?
+        if lista is None:  # Primera página de esta consulta
+            if len(self._resultados) >= MAX_RESULTADOS:  # Cache lleno
+                self._resultados.clear()  # Empezamos de nuevo
+            lista = self._resultados[clave] = calcular()  # Calculamos una vez
+        return lista  # Resultados
+
+    async def _transmitir(self, writer: asyncio.StreamWriter, metodo: str, etag: str, seguir: bool, trozos: bool, encabezado: Dict[str, Any], items: List[Dict[str, Any]]) -> bool:  # Página grande en trozos de LOTE_TRANSMISION productos
+        self._escribir(writer, 200, seguir, etag=etag, trozos=trozos)  # Sin Content-Length (HTTP/1.0: termina al cerrar)
+        if metodo == "HEAD":  # Solo cabeceras
+            await writer.drain()  # Enviamos
+            return seguir  # La conexión sigue
+
+        def enviar(datos: bytes) -> None:  # Un trozo (con su largo en hexadecimal si es chunked)
+            writer.write(b"%x\r\n%s\r\n" % (len(datos), datos) if trozos else datos)  # Formato chunked de HTTP/1.1
+
+        enviar((_JSON(encabezado)[:-1] + ',"productos":[').encode())  # {"total":..,"pagina":..,"por_pagina":..,"productos":[
+        for i in range(0, len(items), LOTE_TRANSMISION):  # Los dicts no se modifican en el lugar: la lista es una foto estable
+            lote = ",".join(map(_JSON, items[i:i + LOTE_TRANSMISION]))  # Un trozo de productos
+            enviar((("," if i else "") + lote).encode())  # Separador entre trozos
+            await writer.drain()  # Memoria acotada: esperamos que el cliente lea antes de seguir
+        enviar(b"]}")  # Cierre del JSON
+        if trozos:  # Fin del chunked
+            writer.write(b"0\r\n\r\n")  # Trozo vacío
+        await writer.drain()  # Enviamos
+        return seguir  # Sin chunked, la conexión termina aquí
+
+    def _escribir(self, writer: asyncio.StreamWriter, estado: int, seguir: bool, cuerpo: Optional[bytes] = None, etag: Optional[str] = None, largo: Optional[int] = None, trozos: bool = False) -> None:  # Cabeceras (+ cuerpo) en una sola escritura
+        lineas = [f"HTTP/1.1 {estado} {HTTPStatus(estado).phrase}", "Server: SGP", "Connection: " + ("keep-alive" if seguir else "close")]  # Estado y conexión
+        if etag is not None:  # Respuesta cacheable por el cliente
+            lineas += [f"ETag: {etag}", "Cache-Control: no-cache"]  # El cliente revalida con If-None-Match
+        if estado != 304:  # 304 no lleva cuerpo
+            lineas.append("Content-Type: application/json; charset=utf-8")  # JSON
+            if trozos:  # Streaming HTTP/1.1
+                lineas.append("Transfer-Encoding: chunked")  # Trozos con largo
+            elif largo is not None or cuerpo is not None:  # Cuerpo de largo conocido
+                lineas.append(f"Content-Length: {len(cuerpo) if largo is None else largo}")  # Largo
+        cabecera = ("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1")  # Cabecera completa
+        writer.write(cabecera + cuerpo if cuerpo else cabecera)  # Una sola llamada al socket
+
+
+def servir(ruta: str, host: str = "127.0.0.1", puerto: int = 8080, al_iniciar: Optional[Callable[[Tuple], None]] = None) -> Dict[str, Any]:  # Carga el catálogo y atiende hasta Ctrl+C; retorna estadísticas
+    lista, version = cargar_con_version(ruta)  # Productos y versión (para seguir los cambios de otras instancias)
+    catalogo = CatalogoProductos(lista)  # Catálogo indexado
+    diario = crear_persistencia(catalogo, ruta, version)  # Solo lee: trae lo que guardan las instancias de escritorio
+    servidor = ServidorCatalogo(catalogo, diario)  # API
+
+    async def principal():  # Bucle del servidor
+        tcp = await servidor.iniciar(host, puerto)  # Abrimos el puerto
+        if al_iniciar is not None:  # Aviso (ej. imprimir la dirección real si puerto=0)
+            al_iniciar(tcp.sockets[0].getsockname())  # (host, puerto)
+        try:  # Atendemos hasta que nos cancelen
+            await tcp.serve_forever()  # Para siempre
+        finally:  # Ctrl+C
+            await servidor.detener()  # Cierre ordenado
+
+    try:  # Ctrl+C termina el servidor
+        asyncio.run(principal())  # Bucle de eventos
+    except KeyboardInterrupt:  # Detención normal
+        pass  # Seguimos con el cierre
+    finally:  # Siempre
+        diario.cerrar()  # No hay nada propio que escribir; solo cierra ordenadamente
+    return {"datos": ruta, "productos": len(catalogo), "peticiones": servidor.peticiones, "no_modificadas": servidor.no_modificadas}  # Estadísticas
@@ -0,0 +1,85 @@
+from typing import List, Dict, Any, Sequence, Set, Optional  # Tipos para claridad
+
+
+class TablaVirtual:  # Muestra registros en un Treeview creando solo las filas cercanas a lo visible y actualizando por diferencias
+    def __init__(self, tree, columnas: Sequence[str], scrollbar=None, bloque: int = 300):  # Constructor
+        self.tree = tree  # Treeview de ttk donde se dibujan las filas
+        self.columnas = tuple(columnas)  # Claves del dict en el orden de las columnas
+        self.scrollbar = scrollbar  # Barra de scroll vertical (opcional)
+        self.bloque = bloque  # Cantidad de filas que se crean de una vez
+        self.registros: List[Dict[str, Any]] = []  # Vista completa (todas las filas, creadas o no); se reemplaza, nunca se modifica en el lugar
+        self._iids: List[str] = []  # iids de las filas creadas en el Treeview, en orden
+        self._valores: Dict[str, tuple] = {}  # iid → valores mostrados (para detectar cambios sin preguntar a Tk)
+        self._registros: Dict[str, Dict[str, Any]] = {}  # iid → producto de la vista (con sus tipos: sin leer de vuelta el texto de Tk)
+
+        tree.configure(yscrollcommand=self._al_desplazar)  # Nos enteramos de cada movimiento del scroll
+
+    # ------------------------- API -------------------------
+
+    def mostrar(self, registros: Sequence[Dict[str, Any]]) -> None:  # Muestra una nueva vista (solo toca las filas que cambiaron)
+        self.registros = list(registros)  # Guardamos la vista completa
+        objetivo = max(self.bloque, len(self._iids))  # Mantenemos las filas ya cargadas (no saltamos el scroll)
+        self._sincronizar(min(objetivo, len(self.registros)))  # Aplicamos diferencias
+
+    def cargar_mas(self) -> None:  # Crea el siguiente bloque de filas (al acercarse al final del scroll)
+        if len(self._iids) < len(self.registros):  # Si quedan filas sin crear
+            self._sincronizar(min(len(self._iids) + self.bloque, len(self.registros)))  # Un bloque más
+
+    def registro(self, iid: str) -> Optional[Dict[str, Any]]:  # Producto que muestra una fila creada (None si no existe)
+        return self._registros.get(iid)  # O(1), sin llamar a Tk
+
+    def registros_de(self, iids: Sequence[str]) -> List[Dict[str, Any]]:  # Productos de varias filas (ej. la selección), en ese orden
+        return [self._registros[iid] for iid in iids if iid in self._registros]  # Solo las que existen
+
+    @property
+    def filas_creadas(self) -> int:  # Cantidad de filas que existen realmente en el Treeview
+        return len(self._iids)  # Largo de la lista de iids
+
+    # ------------------------- INTERNOS -------------------------
+
+    def iid_de(self, p: Dict[str, Any]) -> str:  # iid de la fila de un producto (el SKU es único)
+        return str(p.get("sku", ""))  # Usamos el SKU como identificador de fila
+
+    def _fila(self, p: Dict[str, Any]) -> tuple:  # Valores de la fila en el orden de las columnas
+        return tuple(p.get(c, "") for c in self.columnas)  # Tupla (comparable) de valores
+
+    def _sincronizar(self, n: int) -> None:  # Deja en el Treeview exactamente las n primeras filas de la vista
+        nuevos = self.registros[:n]  # Registros que deben quedar creados
+        nuevos_iids = [self.iid_de(p) for p in nuevos]  # Sus iids en orden
+        conjunto = set(nuevos_iids)  # Para pertenencia O(1)
+
+        quitar = [iid for iid in self._iids if iid not in conjunto]  # Filas que ya no corresponden
+        if quitar:  # Si hay filas sobrantes
+            self.tree.delete(*quitar)  # Una sola llamada a Tk para todas
+            for iid in quitar:  # Limpiamos la memoria de valores
+                del self._valores[iid]  # Quitamos su entrada
+                del self._registros[iid]  # Y su producto
+
+        actuales = [iid for iid in self._iids if iid in conjunto]  # Filas que siguen, en el orden actual del Treeview
+        colocados: Set[str] = set()  # Filas ya ubicadas en su posición final
+        k = 0  # Puntero sobre "actuales"
+        for idx, (iid, p) in enumerate(zip(nuevos_iids, nuevos)):  # Recorremos la vista en orden
+            while k < len(actuales) and actuales[k] in colocados:  # Saltamos las que ya movimos antes
+                k += 1  # Avanzamos
+            valores = self._fila(p)  # Valores que debe mostrar la fila
+
+            if iid not in self._valores:  # Fila nueva
+                self.tree.insert("", idx, iid=iid, values=valores)  # La creamos en su posición
+            else:  # Fila existente
+                if k < len(actuales) and actuales[k] == iid:  # Ya está en su lugar
+                    k += 1  # Avanzamos el puntero
+                else:  # Está más abajo: hay que moverla
+                    self.tree.move(iid, "", idx)  # La movemos a su posición
+                if self._valores[iid] != valores:  # Si cambió algún valor
+                    self.tree.item(iid, values=valores)  # Actualizamos solo esa fila
+            self._valores[iid] = valores  # Recordamos lo que muestra
+            self._registros[iid] = p  # Y qué producto es
+            colocados.add(iid)  # Ya quedó ubicada
+
+        self._iids = nuevos_iids  # Nuevo orden de filas creadas
+
+    def _al_desplazar(self, primero: str, ultimo: str) -> None:  # Callback del scroll vertical del Treeview
+        if self.scrollbar is not None:  # Si hay scrollbar
+            self.scrollbar.set(primero, ultimo)  # La mantenemos sincronizada
+        if float(ultimo) > 0.9:  # Si se ve el último 10% de las filas creadas
+            self.cargar_mas()  # Creamos el siguiente bloque
@@ -0,0 +1,137 @@
+import queue  # Cola acotada para entregar resultados parciales al hilo de Tk
+import threading  # Evento de cancelación (seguro entre hilos)
+from concurrent.futures import ThreadPoolExecutor, Future  # Pool de hilos de trabajo
+from typing import Callable, Optional, Any, List  # Tipos para claridad
+
+
+class TareaCancelada(Exception):  # Se lanza dentro de la tarea cuando el usuario pidió cancelar
+    pass  # No necesita nada más
+
+
+class Tarea:  # Trabajo en segundo plano con progreso (hechos/total) y cancelación
+    def __init__(self, nombre: str, escribe_catalogo: bool = False):  # Constructor
+        self.nombre = nombre  # Nombre para mostrar ("Exportando Excel", etc.)
+        self.escribe_catalogo = escribe_catalogo  # True si al terminar modifica el catálogo (solo una a la vez)
+        self.hechos = 0  # Filas procesadas
+        self.total = 0  # Filas totales (0 = desconocido)
+        self.futuro: Optional[Future] = None  # Resultado del pool
+        self._cancelar = threading.Event()  # Bandera de cancelación (segura entre hilos)
+        self._confirmada = False  # True = ya no se puede cancelar (ver confirmar())
+        self._informado = (-1, -1)  # Último progreso entregado a la interfaz
+        self._parciales: "queue.Queue[Any]" = queue.Queue(maxsize=4)  # Resultados parciales (acotada: frena al productor si la interfaz va atrasada)
+
+    def cancelar(self) -> None:  # Pide cancelar (la tarea se detiene en su próximo aviso de progreso)
+        if not self._confirmada:  # Después de confirmar() ya no se puede
+            self._cancelar.set()  # Activamos la bandera
+
+    def confirmar(self) -> None:  # Lo llama la función de trabajo: desde aquí termina sí o sí (ej. aplicar un archivo ya validado completo)
+        if self._cancelar.is_set():  # Se alcanzó a cancelar antes
+            raise TareaCancelada()  # Cortamos: aún no se tocó nada
+        self._confirmada = True  # Los próximos cancelar() se ignoran
+
+    @property
+    def confirmada(self) -> bool:  # True si ya no se puede cancelar
+        return self._confirmada  # Estado
+
+    @property
+    def cancelada(self) -> bool:  # True si se pidió cancelar
+        return self._cancelar.is_set()  # Estado de la bandera
+
+    def avanzar(self, hechos: int, total: int = 0) -> None:  # Lo llama la función de trabajo (desde el hilo de trabajo)
+        self.hechos = hechos  # Guardamos avance (asignación atómica en Python)
+        if total:  # Si se conoce el total
+            self.total = total  # Lo guardamos
+        if self._cancelar.is_set():  # Si el usuario canceló
+            raise TareaCancelada()  # Cortamos el trabajo en este punto
+
+    def entregar(self, parcial: Any) -> None:  # Envía un resultado parcial (ej. un lote) al hilo de Tk
+        while True:  # Esperamos espacio en la cola sin dejar de atender la cancelación
+            if self._cancelar.is_set():  # Si el usuario canceló
+                raise TareaCancelada()  # Cortamos
+            try:  # Intentamos encolar
+                self._parciales.put(parcial, timeout=0.1)  # Espera corta
+                return  # Encolado
+            except queue.Full:  # Cola llena: la interfaz aún no consume
+                continue  # Reintentamos
+
+    def _recibir_parciales(self) -> List[Any]:  # Hilo de Tk: toma los parciales disponibles sin esperar
+        parciales = []  # Lista de parciales
+        while True:  # Vaciamos la cola
+            try:  # Sin bloquear
+                parciales.append(self._parciales.get_nowait())  # Tomamos uno
+            except queue.Empty:  # No quedan
+                return parciales  # Retornamos
+
+
+class PlanificadorTareas:  # Ejecuta tareas en hilos y entrega progreso/resultados al hilo de Tk mediante after()
+    def __init__(self, raiz, max_hilos: int = 2, intervalo_ms: int = 100):  # Constructor
+        self.raiz = raiz  # Ventana Tk (para usar after)
+        self.intervalo_ms = intervalo_ms  # Cada cuánto revisamos las tareas
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="sgp")  # Hilos de trabajo
+        self._activas: List[tuple] = []  # (tarea, al_terminar, al_fallar, al_progreso, al_parcial)
+        self._sondeando = False  # True si hay un after() programado
+
+    @property
+    def escritura(self) -> Optional[Tarea]:  # Tarea que está modificando el catálogo (None si no hay)
+        return next((t for t, *_ in self._activas if t.escribe_catalogo), None)  # Primera (y única) de escritura
+
+    @property
+    def escritura_en_curso(self) -> bool:  # True si hay una tarea que modificará el catálogo
+        return self.escritura is not None  # Hay una escritura activa
+
+    def lanzar(  # Inicia una tarea en segundo plano
+        self,
+        nombre: str,  # Nombre para mostrar
+        funcion: Callable[[Tarea], Any],  # Trabajo: recibe la tarea (para avanzar/cancelar) y retorna un resultado
+        al_terminar: Optional[Callable[[Any], None]] = None,  # Se llama en el hilo de Tk con el resultado
+        al_fallar: Optional[Callable[[BaseException], None]] = None,  # Se llama en el hilo de Tk con el error (o TareaCancelada)
+        al_progreso: Optional[Callable[[Tarea], None]] = None,  # Se llama en el hilo de Tk cuando cambia el avance
+        escribe_catalogo: bool = False,  # True = solo una tarea de escritura a la vez
+        al_parcial: Optional[Callable[[Any], None]] = None,  # Se llama en el hilo de Tk con cada tarea.entregar(...)
+    ) -> Optional[Tarea]:  # Retorna la tarea, o None si ya hay una escritura en curso
+        if escribe_catalogo and self.escritura_en_curso:  # Una sola escritura al catálogo a la vez
+            return None  # No se lanza
+
+        tarea = Tarea(nombre, escribe_catalogo)  # Creamos la tarea
+        tarea.futuro = self._pool.submit(funcion, tarea)  # La enviamos al pool
+        self._activas.append((tarea, al_terminar, al_fallar, al_progreso, al_parcial))  # La registramos
+        if not self._sondeando:  # Si no hay revisión programada
+            self._sondeando = True  # Marcamos
+            self.raiz.after(self.intervalo_ms, self._sondear)  # Programamos la primera revisión
+        return tarea  # Retornamos la tarea (para cancelar)
+
+    def cancelar_todas(self) -> None:  # Pide cancelar todas las tareas activas
+        for tarea, *_ in self._activas:  # Recorremos
+            tarea.cancelar()  # Pedimos cancelar
+
+    def cerrar(self) -> None:  # Cancela lo pendiente y libera los hilos (al cerrar la aplicación)
+        self.cancelar_todas()  # Cancelamos
+        self._pool.shutdown(wait=False, cancel_futures=True)  # No esperamos trabajos largos
+
+    def _sondear(self) -> None:  # Revisión periódica en el hilo de Tk (progreso y tareas terminadas)
+        pendientes, terminadas = [], []  # Tareas que siguen y tareas listas
+        for registro in self._activas:  # Recorremos las activas
+            tarea, _, _, al_progreso, al_parcial = registro  # Tarea y callbacks de avance
+            terminada = tarea.futuro.done()  # Se consulta antes de vaciar la cola (así no se pierde el último parcial)
+            for parcial in tarea._recibir_parciales():  # Resultados parciales disponibles
+                if al_parcial and not tarea.cancelada:  # Si hay callback y no se canceló
+                    al_parcial(parcial)  # Los entregamos en orden
+            avance = (tarea.hechos, tarea.total)  # Progreso actual
+            if al_progreso and avance != tarea._informado:  # Si cambió desde la última vez
+                tarea._informado = avance  # Lo recordamos
+                al_progreso(tarea)  # Avisamos a la interfaz
+            (terminadas if terminada else pendientes).append(registro)  # Clasificamos
+
+        self._activas = pendientes  # Primero actualizamos (un callback puede lanzar otra tarea)
+        for tarea, al_terminar, al_fallar, *_ in terminadas:  # Entregamos resultados
+            error = tarea.futuro.exception()  # Error (None si terminó bien)
+            if error is None:  # Terminó bien
+                if al_terminar:  # Si hay callback
+                    al_terminar(tarea.futuro.result())  # Entregamos el resultado
+            elif al_fallar:  # Falló o se canceló (TareaCancelada)
+                al_fallar(error)  # Entregamos el error
+
+        if self._activas:  # Si quedan tareas
+            self.raiz.after(self.intervalo_ms, self._sondear)  # Volvemos a revisar
+        else:  # Si no quedan
+            self._sondeando = False  # Dejamos de revisar
@@ -1,13 +1,25 @@
 import os  # Para trabajar con rutas y carpetas del sistema operativo
+import shutil  # Copia de un archivo ya exportado
 import tkinter as tk  # Librería base de interfaz gráfica
-from tkinter import ttk, messagebox, filedialog  # Componentes modernos (ttk) + mensajes + diálogos de archivo
+from tkinter import ttk, messagebox, filedialog, simpledialog  # Componentes modernos (ttk) + mensajes + diálogos de archivo y de un valor
 from datetime import datetime  # Para generar nombres de archivos con fecha/hora
 
-from .persistencia_json import cargar_productos, guardar_productos  # Funciones para cargar/guardar JSON
-from .gestion_datos import construir_set_skus, agregar_producto, actualizar_producto, eliminar_producto, buscar  # CRUD y búsqueda
+from .persistencia_json import cargar_con_version, crear_persistencia, preparar_ruta_datos  # Carga y guardado (JSON con diario o SQLite)
+from .gestion_datos import CatalogoProductos, agregar_producto, actualizar_producto, eliminar_productos  # CRUD
+from .gestion_datos import ajustar_precios, ajustar_stock, cambiar_activo, cambiar_categoria  # Cambios masivos (una pasada, un solo aviso)
 from .validaciones import validar_producto, CATEGORIAS  # Validación de datos + categorías permitidas
-from .funciones_utiles import valor_inventario_recursivo  # Función recursiva (requisito)
-from .exportaciones import exportar_excel, exportar_pdf, importar_excel  # Exportación e importación
+from .funciones_utiles import ValorizacionInventario, valor_inventario  # Valor de inventario (incremental e iterativo)
+from .tabla_virtual import TablaVirtual  # Treeview virtual (crea solo las filas cercanas a lo visible)
+from .indices_ordenados import CAMPOS_ORDENABLES  # Campos con índice ordenado (orden de columnas sin ordenar el catálogo)
+from .indice_busqueda import normalizar_consulta  # Misma normalización que el buscador (clave de la vista exportada)
+from .huellas import huella  # Huella del contenido (detecta un "Actualizar" que no cambia nada)
+from .tareas import PlanificadorTareas, TareaCancelada  # Trabajos en segundo plano (exportar/importar) con progreso
+from .autoguardado import AutoGuardado  # Escritura de cambios en segundo plano (junta ráfagas en una sola escritura)
+from .buscador import BuscadorIncremental  # Búsqueda mientras se escribe (pausa de teclado + resultados recientes)
+from .cache_exportaciones import CacheExportaciones  # Exportaciones repetidas de la misma vista: se copia el archivo anterior
+# exportaciones/importacion (openpyxl y reportlab) se importan recién al usarlas: la ventana abre sin pagar esa carga
+
+REVISAR_ARCHIVO_MS = 2000  # Cada cuánto se revisa si otra instancia cambió los datos (solo stat si nadie escribió)
 
 
 class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
@@ -16,16 +28,72 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
         self.title("Sistema de Gestión de Productos (Tkinter + JSON + Excel/PDF)")  # Título de la ventana
         self.geometry("1050x600")  # Tamaño inicial sugerido (más ancho para que se vea ordenado)
 
-        self.ruta_datos = os.path.join("data", "productos.json")  # Ruta del archivo JSON
-        self.productos = cargar_productos(self.ruta_datos)  # Carga lista de productos desde JSON
-        self.skus = construir_set_skus(self.productos)  # Construye set de SKUs para validar unicidad
+        self.ruta_datos = None  # Ruta del JSON (o de la base SQLite); se define al terminar la carga
+        self.productos = CatalogoProductos()  # Vacío hasta que termine la carga en segundo plano
+        self.skus = self.productos.skus  # Set vivo de SKUs (el catálogo lo mantiene al día)
+        self.valorizacion = ValorizacionInventario()  # Valor del inventario (se reemplaza al cargar)
+        self.diario = None  # Persistencia de cambios (se crea al cargar)
+        self.autoguardado = None  # Guardado automático en segundo plano (se crea al cargar)
+        self.buscador = None  # Búsqueda en vivo (se crea al cargar)
 
         self.modo = "crear"  # Estado del formulario: crear o editar
         self.sku_original = None  # Guarda SKU original cuando editamos
+        self.tareas = PlanificadorTareas(self)  # Exportaciones/importaciones fuera del hilo de la interfaz
+        self._tarea_visible = None  # Tarea cuyo progreso se muestra abajo
+        self._orden = None  # Orden de la tabla: (columna, descendente) o None = orden del catálogo
+        self._vista = None  # (versión del catálogo, búsqueda normalizada) de lo que muestra la tabla
+        self.cache_exportaciones = CacheExportaciones()  # Archivos ya exportados de esta sesión
 
         self._ui()  # Construye la interfaz gráfica
-        self._refrescar_tabla(self.productos)  # Muestra todos los productos en la tabla
-        self._actualizar_resumen()  # Muestra resumen inferior (cantidad y valor inventario)
+        self.protocol("WM_DELETE_WINDOW", self.on_cerrar)  # Al cerrar, dejamos el diario escrito
+        self.lbl_resumen.config(text="Cargando catálogo...")  # La ventana aparece de inmediato; los datos llegan después
+        self._lanzar_tarea(  # Lee el archivo y arma los índices fuera del hilo de la interfaz
+            "Cargando catálogo",  # Nombre
+            self._cargar_catalogo,  # Trabajo
+            self._catalogo_cargado,  # Al terminar
+            escribe_catalogo=True,  # Mientras carga no se permiten altas/cambios/bajas ni importaciones
+            al_fallar=lambda _: self.destroy(),  # Sin datos no se puede seguir (igual que antes, pero avisando el error)
+        )
+
+    def _cargar_catalogo(self, _tarea):  # Hilo de trabajo: ruta, catálogo y valorización (nadie más usa este catálogo todavía)
+        ruta = preparar_ruta_datos(os.path.join("data", "productos.json"))  # Ruta del JSON (o de la base SQLite si SGP_BACKEND=sqlite)
+        lista, version = cargar_con_version(ruta)  # Productos y versión de los datos (para detectar cambios de otras instancias)
+        productos = CatalogoProductos(lista)  # Catálogo indexado
+        valorizacion = ValorizacionInventario(productos)  # Valor del inventario calculado una sola vez
+        productos.suscribir(valorizacion)  # Desde aquí se ajusta solo en cada alta/cambio/baja
+        informe = None  # Informe de SKUs repetidos en los datos (casi nunca hay)
+        if productos.duplicados:  # El catálogo conserva la primera aparición de cada SKU
+            from .importacion import InformeErrores, rechazos_carga, ruta_informe_carga  # Import local: solo si hace falta
+            with InformeErrores(ruta_informe_carga(ruta)) as informe:  # Los descartados quedan completos en un CSV (no se pierden en silencio)
+                informe.agregar(rechazos_carga(productos))  # Una fila por producto descartado
+        return ruta, productos, valorizacion, version, informe  # Al hilo de la interfaz
+
+    def _catalogo_cargado(self, resultado):  # Hilo de la interfaz: instala el catálogo cargado y lo muestra
+        self.ruta_datos, self.productos, self.valorizacion, version, informe = resultado  # Reemplazamos el catálogo vacío
+        self.skus = self.productos.skus  # Set vivo de SKUs
+        self.diario = crear_persistencia(self.productos, self.ruta_datos, version)  # Cada cambio se anota (diario JSON o fila SQLite), sin reescribir todo
+        self.autoguardado = AutoGuardado(self, self.diario, self.productos, al_guardar=self._guardado)  # Escribe lo anotado en segundo plano, tras una breve calma
+        self.buscador = BuscadorIncremental(self, self.productos, self._mostrar_busqueda)  # Filtra mientras se escribe en "Buscar"
+        self.on_buscar()  # Muestra los productos (respeta lo que se haya escrito en "Buscar" mientras cargaba)
+        self.event_generate("<<CatalogoCargado>>")  # Aviso para quien lo necesite (ej. medición de arranque en main.py)
+        self.after(REVISAR_ARCHIVO_MS, self._revisar_archivo)  # Desde ahora seguimos los cambios de otras instancias
+        if informe is not None:  # Había SKUs repetidos en los datos
+            messagebox.showwarning(  # Aviso (el próximo guardado ya no los incluye)
+                "Datos",
+                f"Se descartaron {informe.cantidad} productos con SKU repetido (se conservó la primera aparición).\n"
+                f"Detalle completo en:\n{os.path.abspath(informe.ruta)}"
+            )
+
+    def _revisar_archivo(self):  # Trae lo que otras instancias guardaron (en segundo plano; solo los productos que cambiaron)
+        self.autoguardado.revisar()  # Casi siempre: tres stat y nada más
+        self.after(REVISAR_ARCHIVO_MS, self._revisar_archivo)  # Próxima revisión
+
+    def _guardado(self, conflictos, cambiados):  # Aviso del guardado automático: otra instancia cambió productos (y quizás antes que nosotros)
+        if cambiados:  # El catálogo, los índices y los totales ya están al día
+            self.on_buscar()  # Refresca la vista respetando la búsqueda actual
+        if conflictos:  # Ganó lo que ya estaba guardado
+            muestra = ", ".join(str(s) for s in conflictos[:10]) + (" ..." if len(conflictos) > 10 else "")  # Algunos SKUs
+            messagebox.showwarning("Conflicto", f"Otra instancia modificó antes estos productos y se conservó su versión:\n{muestra}")  # Aviso
 
     # ------------------------- CONSTRUCCIÓN UI -------------------------
 
@@ -38,6 +106,8 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
         self.var_buscar = tk.StringVar()  # Variable de texto para búsqueda
         ent_buscar = ttk.Entry(top, textvariable=self.var_buscar, width=40)  # Campo búsqueda
         ent_buscar.pack(side="left", padx=6)  # Posiciona campo
+        ent_buscar.bind("<Return>", lambda _e: self.on_buscar())  # Enter: sin esperar la pausa
+        self.var_buscar.trace_add("write", self._al_escribir_busqueda)  # Cada tecla filtra en vivo
 
         ttk.Button(top, text="Aplicar", command=self.on_buscar).pack(side="left")  # Botón aplicar búsqueda
         ttk.Button(top, text="Ver todo", command=self.on_ver_todo).pack(side="left", padx=6)  # Botón ver todo
@@ -92,6 +162,16 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
         ttk.Button(actions, text="Eliminar (selección)", command=self.on_eliminar).pack(fill="x", pady=4)  # Botón eliminar
         ttk.Button(actions, text="Limpiar", command=self.on_limpiar).pack(fill="x", pady=4)  # Botón limpiar
 
+        masivo = ttk.Menubutton(actions, text="Cambiar selección ▾")  # Cambios masivos (a las filas seleccionadas)
+        menu_masivo = tk.Menu(masivo, tearoff=False)  # Menú desplegable
+        menu_masivo.add_command(label="Ajustar precio (%)...", command=self.on_ajustar_precio)  # Precio ± porcentaje
+        menu_masivo.add_command(label="Ajustar stock...", command=self.on_ajustar_stock)  # Stock ± unidades
+        menu_masivo.add_command(label="Activar", command=lambda: self.on_cambiar_activo(True))  # Activo = Sí
+        menu_masivo.add_command(label="Desactivar", command=lambda: self.on_cambiar_activo(False))  # Activo = No
+        menu_masivo.add_command(label="Cambiar categoría...", command=self.on_cambiar_categoria)  # Otra categoría
+        masivo["menu"] = menu_masivo  # Vinculamos el menú
+        masivo.pack(fill="x", pady=4)  # Ocupa ancho
+
         # Separador
         ttk.Separator(form).pack(fill="x", pady=10)  # Línea separadora
 
@@ -108,16 +188,18 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
         table_box.pack(side="left", fill="both", expand=True)  # Ocupa el resto del espacio
 
         cols = ("sku", "nombre", "categoria", "precio", "stock", "activo", "creado_en")  # Columnas
-        self.tree = ttk.Treeview(table_box, columns=cols, show="headings")  # Treeview (tabla)
+        self.tree = ttk.Treeview(table_box, columns=cols, show="headings", selectmode="extended")  # Treeview (tabla; Ctrl/Shift + clic seleccionan varias filas)
 
         # Encabezados y tamaños de columna
-        self.tree.heading("sku", text="SKU")  # Encabezado SKU
-        self.tree.heading("nombre", text="NOMBRE")  # Encabezado Nombre
-        self.tree.heading("categoria", text="CATEGORÍA")  # Encabezado Categoría
-        self.tree.heading("precio", text="PRECIO")  # Encabezado Precio
-        self.tree.heading("stock", text="STOCK")  # Encabezado Stock
-        self.tree.heading("activo", text="ACTIVO")  # Encabezado Activo
-        self.tree.heading("creado_en", text="CREADO EN")  # Encabezado creado_en
+        self.tree.heading("sku", text="SKU", command=lambda: self.on_ordenar("sku"))  # Encabezado SKU (clic = ordenar)
+        self.tree.heading("nombre", text="NOMBRE", command=lambda: self.on_ordenar("nombre"))  # Encabezado Nombre (clic = ordenar)
+        self.tree.heading("categoria", text="CATEGORÍA", command=lambda: self.on_ordenar("categoria"))  # Encabezado Categoría (clic = ordenar)
+        self.tree.heading("precio", text="PRECIO", command=lambda: self.on_ordenar("precio"))  # Encabezado Precio (clic = ordenar)
+        self.tree.heading("stock", text="STOCK", command=lambda: self.on_ordenar("stock"))  # Encabezado Stock (clic = ordenar)
+        self.tree.heading("activo", text="ACTIVO", command=lambda: self.on_ordenar("activo"))  # Encabezado Activo (clic = ordenar)
+        self.tree.heading("creado_en", text="CREADO EN", command=lambda: self.on_ordenar("creado_en"))  # Encabezado creado_en (clic = ordenar)
+
+        self._titulos = {c: self.tree.heading(c, "text") for c in cols}  # Títulos originales (para poner la flecha de orden)
 
         # Config de columnas (ancho y alineación)
         self.tree.column("sku", width=90, anchor="w")  # Columna SKU
@@ -130,7 +212,7 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
 
         # Scroll vertical para tabla
         yscroll = ttk.Scrollbar(table_box, orient="vertical", command=self.tree.yview)  # Scroll
-        self.tree.configure(yscrollcommand=yscroll.set)  # Vinculamos scroll
+        self.tabla = TablaVirtual(self.tree, cols, scrollbar=yscroll)  # Vincula el scroll y carga más filas al bajar
 
         self.tree.pack(side="left", fill="both", expand=True)  # Tabla ocupa espacio
         yscroll.pack(side="right", fill="y")  # Scroll al lado
@@ -143,6 +225,15 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
         self.lbl_resumen = ttk.Label(bottom, text="Resumen: ...")  # Label resumen
         self.lbl_resumen.pack(side="left")  # A la izquierda
 
+        # Progreso de tareas en segundo plano (se muestra solo mientras hay una)
+        self.frm_progreso = ttk.Frame(bottom)  # Contenedor de progreso
+        self.lbl_progreso = ttk.Label(self.frm_progreso, text="")  # Texto "Exportando... 500/10000"
+        self.lbl_progreso.pack(side="left", padx=6)  # A la izquierda del contenedor
+        self.bar_progreso = ttk.Progressbar(self.frm_progreso, length=200, mode="determinate")  # Barra de progreso
+        self.bar_progreso.pack(side="left", padx=6)  # Al lado del texto
+        self.btn_cancelar = ttk.Button(self.frm_progreso, text="Cancelar", command=self.on_cancelar_tarea)  # Botón cancelar
+        self.btn_cancelar.pack(side="left")  # A la derecha de la barra
+
     # ------------------------- HELPERS DE CAMPOS (GRID) -------------------------
 
     def _fila_entry(self, parent, row, label, variable):  # Crea una fila label + entry usando grid
@@ -163,17 +254,34 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
 
     # ------------------------- ACCIONES -------------------------
 
-    def on_buscar(self):  # Acción buscar
-        filtrados = buscar(self.productos, self.var_buscar.get())  # Filtramos lista
+    def on_buscar(self):  # Acción buscar (botón "Aplicar", Enter o refresco tras un cambio)
+        if self.buscador is not None:  # Si el catálogo ya cargó
+            self.buscador.buscar_ya(self.var_buscar.get())  # Sin esperar la pausa de teclado
+
+    def _al_escribir_busqueda(self, *_):  # Cada cambio del texto de "Buscar"
+        if self.buscador is not None:  # Si el catálogo ya cargó
+            self.buscador.pedir(self.var_buscar.get())  # Se busca cuando el usuario hace una pausa
+
+    def _mostrar_busqueda(self, texto, filtrados):  # Resultado del buscador (None = sin filtro)
+        self._vista = (self.productos.version, normalizar_consulta(texto))  # El buscador entrega resultados de la versión actual
+        if filtrados is None:  # Búsqueda vacía
+            self._refrescar_tabla(self.productos)  # Muestra todo
+            self._actualizar_resumen()  # Resumen global (O(1))
+            return  # Listo
         self._refrescar_tabla(filtrados)  # Actualizamos tabla
         self._actualizar_resumen(filtrados)  # Actualizamos resumen
 
     def on_ver_todo(self):  # Acción ver todo
         self.var_buscar.set("")  # Limpia caja de búsqueda
+        if self.buscador is not None:  # Lo que pidió el cambio de texto ya no hace falta
+            self.buscador.cancelar()  # Mostramos todo ahora mismo
+        self._vista = (self.productos.version, "")  # Todo el catálogo, al día
         self._refrescar_tabla(self.productos)  # Muestra todo
         self._actualizar_resumen()  # Resumen global
 
     def on_guardar(self):  # Agregar o actualizar
+        if self._escritura_bloqueada():  # Si hay una importación en curso
+            return  # Sale
         ok, producto, errores = validar_producto(  # Validamos lo ingresado
             sku=self.var_sku.get(),  # SKU
             nombre=self.var_nombre.get(),  # Nombre
@@ -190,6 +298,12 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
             messagebox.showerror("Validación", "\n".join(errores))  # Muestra errores
             return  # Sale
 
+        actual = None if self.modo == "crear" else self.productos.obtener(self.sku_original)  # Producto que se está editando
+        if actual is not None and huella(actual) == huella(producto):  # Se apretó "Actualizar" sin cambiar nada
+            self.on_limpiar()  # Limpia formulario
+            messagebox.showinfo("OK", "Sin cambios.")  # Nada que guardar (ni índices ni disco)
+            return  # Sale
+
         if self.modo == "crear":  # Si estamos creando
             agregar_producto(self.productos, producto)  # Agrega
         else:  # Si estamos editando
@@ -197,32 +311,107 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
                 messagebox.showerror("Error", "No se pudo actualizar (SKU original no encontrado).")  # Error
                 return  # Sale
 
-        self.skus = construir_set_skus(self.productos)  # Reconstruye set de SKUs
-        guardar_productos(self.productos, self.ruta_datos)  # Guarda JSON
-
-        self.on_ver_todo()  # Refresca
+        self.on_ver_todo()  # Refresca (el guardado automático lo escribe en segundo plano)
         self.on_limpiar()  # Limpia formulario
         messagebox.showinfo("OK", "Guardado correctamente.")  # Mensaje éxito
 
-    def on_eliminar(self):  # Eliminar selección
+    def on_eliminar(self):  # Eliminar selección (una o varias filas)
+        if self._escritura_bloqueada():  # Si hay una importación en curso
+            return  # Sale
         sel = self.tree.selection()  # Obtiene selección
         if not sel:  # Si no hay
             messagebox.showwarning("Atención", "Selecciona un producto en la tabla.")  # Aviso
             return  # Sale
 
-        sku = self.tree.item(sel[0], "values")[0]  # Lee SKU de la fila
-        if not messagebox.askyesno("Confirmar", f"¿Eliminar SKU {sku}?"):  # Confirma
+        skus = [p["sku"] for p in self.tabla.registros_de(sel)]  # SKUs de las filas (tal cual, sin pasar por el texto de Tk)
+        pregunta = f"¿Eliminar SKU {skus[0]}?" if len(skus) == 1 else f"¿Eliminar {len(skus)} productos?"  # Texto según cantidad
+        if not messagebox.askyesno("Confirmar", pregunta):  # Confirma
             return  # Sale si no confirma
 
-        if eliminar_producto(self.productos, sku):  # Elimina del arreglo
-            self.skus = construir_set_skus(self.productos)  # Actualiza set
-            guardar_productos(self.productos, self.ruta_datos)  # Guarda
-            self.on_ver_todo()  # Refresca
+        eliminados = eliminar_productos(self.productos, skus)  # Una pasada y un solo aviso (índices, totales y guardado)
+        if eliminados:  # Si eliminó algo
+            self.on_buscar()  # Refresca la vista actual (una sola diferencia de la tabla)
             self.on_limpiar()  # Limpia
-            messagebox.showinfo("OK", "Eliminado.")  # Aviso
+            messagebox.showinfo("OK", "Eliminado." if eliminados == 1 else f"{eliminados} productos eliminados.")  # Aviso
         else:  # Si no encontró
             messagebox.showerror("Error", "No se encontró el producto.")  # Error
 
+    def on_ajustar_precio(self):  # Sube o baja el precio de la selección un porcentaje
+        objetivos = self._objetivos_masivos("Ajustar el precio de")  # Filas afectadas
+        if not objetivos:  # Nada que hacer
+            return  # Sale
+        porcentaje = simpledialog.askfloat("Ajustar precio", f"Porcentaje para {len(objetivos)} productos (ej. 10 o -5):", parent=self, minvalue=-100)  # Porcentaje
+        if porcentaje is not None:  # Si no canceló
+            self._aplicar_masivo(ajustar_precios, objetivos, porcentaje, "")  # Precio nunca queda negativo (mínimo -100%)
+
+    def on_ajustar_stock(self):  # Suma o resta unidades al stock de la selección
+        objetivos = self._objetivos_masivos("Ajustar el stock de")  # Filas afectadas
+        if not objetivos:  # Nada que hacer
+            return  # Sale
+        cantidad = simpledialog.askinteger("Ajustar stock", f"Unidades a sumar a {len(objetivos)} productos (negativo para restar):", parent=self)  # Cantidad
+        if cantidad is not None:  # Si no canceló
+            self._aplicar_masivo(ajustar_stock, objetivos, cantidad, "el stock quedaría negativo")  # Esos se omiten
+
+    def on_cambiar_activo(self, activo):  # Activa o desactiva la selección
+        objetivos = self._objetivos_masivos("Activar" if activo else "Desactivar")  # Filas afectadas
+        if objetivos:  # Si hay
+            self._aplicar_masivo(cambiar_activo, objetivos, activo, "")  # Sin omitidos posibles
+
+    def on_cambiar_categoria(self):  # Reasigna la categoría de la selección
+        objetivos = self._objetivos_masivos("Cambiar la categoría de")  # Filas afectadas
+        if not objetivos:  # Nada que hacer
+            return  # Sale
+        texto = simpledialog.askstring("Cambiar categoría", f"Nueva categoría para {len(objetivos)} productos ({', '.join(CATEGORIAS)}):", parent=self)  # Categoría
+        if texto is None:  # Canceló
+            return  # Sale
+        categoria = next((c for c in CATEGORIAS if c.casefold() == texto.strip().casefold()), None)  # Sin importar mayúsculas
+        if categoria is None:  # No está en la lista
+            messagebox.showerror("Validación", f"Categoría inválida. Usa: {', '.join(CATEGORIAS)}")  # Mismo mensaje que validar_producto
+            return  # Sale
+        self._aplicar_masivo(cambiar_categoria, objetivos, categoria, "")  # Sin omitidos posibles
+
+    def _objetivos_masivos(self, accion):  # Productos de un cambio masivo: la selección o, si no hay, toda la vista (con confirmación)
+        if self._escritura_bloqueada():  # Si hay una importación en curso
+            return []  # Nada
+        sel = self.tree.selection()  # Filas seleccionadas
+        if sel:  # Hay selección
+            return self.tabla.registros_de(sel)  # Sus productos
+        registros = self.tabla.registros  # Vista actual (incluye filas aún no creadas en la tabla)
+        if not registros:  # Vista vacía
+            messagebox.showwarning("Atención", "No hay productos en la tabla.")  # Aviso
+            return []  # Nada
+        if not messagebox.askyesno("Confirmar", f"No hay filas seleccionadas.\n¿{accion} los {len(registros)} productos de la vista?"):  # Confirma
+            return []  # Nada
+        return registros  # Toda la vista
+
+    def _aplicar_masivo(self, funcion, objetivos, valor, motivo):  # Aplica un cambio masivo, refresca una vez y muestra el resultado
+        cambiados, omitidos = funcion(self.productos, [p["sku"] for p in objetivos], valor)  # Una pasada y un solo aviso
+        self.on_buscar()  # Refresca la vista actual (una sola diferencia de la tabla; el guardado automático escribe todo junto)
+        self.on_limpiar()  # El formulario ya no corresponde a la selección
+        resumen = f"{cambiados} productos actualizados."  # Resumen
+        if omitidos:  # Algunos no admitían el cambio
+            muestra = ", ".join(str(s) for s in omitidos[:10]) + (" ..." if len(omitidos) > 10 else "")  # Primeros SKUs
+            resumen += f"\n{len(omitidos)} omitidos ({motivo}): {muestra}"  # Detalle
+        messagebox.showinfo("OK", resumen)  # Aviso
+
+    def on_ordenar(self, columna):  # Clic en un encabezado: ascendente, y con otro clic descendente
+        descendente = self._orden == (columna, False)  # Segundo clic en la misma columna
+        self._orden = (columna, descendente)  # Nuevo orden
+        for c, titulo in self._titulos.items():  # Flecha solo en la columna ordenada
+            self.tree.heading(c, text=titulo + ((" ▼" if descendente else " ▲") if c == columna else ""))  # Título
+        self._refrescar_tabla(self.tabla.registros)  # Misma vista, nuevo orden
+
+    def on_cerrar(self):  # Cierre de la ventana
+        if self.autoguardado is not None:  # Si el catálogo llegó a cargarse
+            try:  # Esperamos el bloqueo de los datos
+                self.autoguardado.cerrar()  # Espera la escritura en curso, escribe lo pendiente y espera una compactación
+            except TimeoutError as e:  # Otra instancia no suelta los datos
+                messagebox.showerror("Datos ocupados", f"{e}\nIntenta cerrar de nuevo en unos segundos.")  # No cerramos: se perderían cambios
+                return  # La ventana sigue abierta
+        self.tareas.cerrar()  # Cancela exportaciones/importaciones en curso
+        self.cache_exportaciones.cerrar()  # Borra los archivos guardados de esta sesión
+        self.destroy()  # Cierra la aplicación
+
     def on_limpiar(self):  # Limpia formulario
         self.modo = "crear"  # Cambia a crear
         self.sku_original = None  # Resetea SKU original
@@ -239,20 +428,22 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
         sel = self.tree.selection()  # Selección
         if not sel:  # Si no hay
             return  # Sale
+        if len(sel) > 1:  # Varias filas: son para eliminar o cambiar en masa, no para editar
+            self.on_limpiar()  # El formulario no muestra ninguna
+            return  # Sale
 
-        values = self.tree.item(sel[0], "values")  # Obtiene valores de la fila
+        p = self.tabla.registro(sel[0])  # Producto de la fila (dict con sus tipos: no se reinterpreta el texto de Tk)
 
         self.modo = "editar"  # Cambia a editar
-        self.sku_original = values[0]  # Guarda SKU original
+        self.sku_original = p["sku"]  # Guarda SKU original
         self.btn_guardar.config(text="Actualizar")  # Botón dice Actualizar
 
-        self.var_sku.set(values[0])  # Carga SKU
-        self.var_nombre.set(values[1])  # Carga nombre
-        self.var_categoria.set(values[2])  # Carga categoría
-        self.var_precio.set(values[3])  # Carga precio
-        self.var_stock.set(values[4])  # Carga stock
-
-        self.var_activo.set(str(values[5]).lower() in ("true", "1", "si", "sí", "yes"))  # Interpreta activo
+        self.var_sku.set(p["sku"])  # Carga SKU
+        self.var_nombre.set(p.get("nombre", ""))  # Carga nombre
+        self.var_categoria.set(p.get("categoria", ""))  # Carga categoría
+        self.var_precio.set(p.get("precio", ""))  # Carga precio
+        self.var_stock.set(p.get("stock", ""))  # Carga stock
+        self.var_activo.set(bool(p.get("activo", True)))  # Booleano tal cual
 
     def on_exportar_excel(self):  # Exportar lo visible
         registros = self._registros_visibles()  # Registros visibles
@@ -269,9 +460,12 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
         if not ruta:  # Si canceló
             return  # Sale
 
+        def trabajo(t):  # Hilo de trabajo
+            from .exportaciones import exportar_excel  # Import diferido: openpyxl se carga la primera vez, fuera del hilo de la interfaz
+            return exportar_excel(registros, ruta, progreso=t.avanzar)  # Exporta
+
         os.makedirs(os.path.dirname(ruta), exist_ok=True)  # Crea carpeta si falta
-        exportar_excel(registros, ruta)  # Exporta
-        messagebox.showinfo("OK", f"Exportado a Excel:\n{ruta}")  # Aviso
+        self._lanzar_exportacion("Exportando Excel", ruta, ("excel",), trabajo, f"Exportado a Excel:\n{ruta}")  # En segundo plano (o copia de la misma vista)
 
     def on_exportar_pdf(self):  # Exportar PDF
         registros = self._registros_visibles()  # Registros visibles
@@ -288,134 +482,194 @@ class App(tk.Tk):  # Clase principal de la aplicación (hereda de Tk)
         if not ruta:  # Si canceló
             return  # Sale
 
+        agrupar = messagebox.askyesno("Exportar PDF", "¿Agrupar el reporte por categoría?")  # Diseño del reporte
+        procesos = max(1, (os.cpu_count() or 1) - 1)  # Deja un núcleo libre para la interfaz (sin pypdf se hace secuencial)
+        def trabajo(t):  # Hilo de trabajo
+            from .exportaciones import exportar_pdf  # Import diferido: reportlab se carga la primera vez, fuera del hilo de la interfaz
+            return exportar_pdf(registros, ruta, progreso=t.avanzar, agrupar_por_categoria=agrupar, procesos=procesos)  # Exporta
+
         os.makedirs(os.path.dirname(ruta), exist_ok=True)  # Crea carpeta
-        exportar_pdf(registros, ruta)  # Exporta
-        messagebox.showinfo("OK", f"Exportado a PDF:\n{ruta}")  # Aviso
+        self._lanzar_exportacion("Exportando PDF", ruta, ("pdf", agrupar), trabajo, f"Exportado a PDF:\n{ruta}")  # En segundo plano (o copia de la misma vista)
+
+    def _lanzar_exportacion(self, nombre, ruta, formato, exportar, aviso):  # Exporta en segundo plano; si la misma vista ya se exportó, copia ese archivo
+        cache = self.cache_exportaciones  # Archivos ya exportados
+        version = self.productos.version  # Versión que se exporta
+        clave = None if self._vista is None or self._vista[0] != version else (self._vista[1], self._orden) + formato  # Búsqueda, orden y formato (None = tabla aún sin refrescar)
+        guardado = None if clave is None else cache.buscar(version, clave)  # ¿Ya se exportó igual?
+        copia = None if clave is None or guardado is not None else cache.ruta_nueva(os.path.splitext(ruta)[1])  # Dónde queda la copia para la próxima vez
+
+        def trabajo(t):  # Hilo de trabajo
+            if guardado is not None:  # Nada cambió desde la última vez
+                shutil.copyfile(guardado, ruta)  # Copia en vez de volver a generar
+                return None  # Listo
+            exportar(t)  # Genera el archivo
+            if copia is not None:  # Se puede guardar
+                shutil.copyfile(ruta, copia)  # Copia para la próxima vez
+
+        def terminado(_):  # Hilo de la interfaz
+            if copia is not None:  # Exportación nueva
+                cache.guardar(version, clave, copia)  # Entra al LRU (se descarta si el catálogo cambió entretanto)
+            messagebox.showinfo("OK", aviso + ("\n(sin cambios desde la última exportación)" if guardado is not None else ""))  # Aviso
+
+        self._lanzar_tarea(nombre, trabajo, terminado)  # En segundo plano (la ventana sigue respondiendo)
 
     def on_importar_excel(self):  # Importar Excel
+        if self._escritura_bloqueada():  # Solo una importación a la vez
+            return  # Sale
+
         ruta = filedialog.askopenfilename(  # Selecciona archivo
-            filetypes=[("Excel", "*.xlsx")],  # Solo xlsx
+            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv *.csv.gz"), ("NDJSON", "*.ndjson *.jsonl *.ndjson.gz *.jsonl.gz")],  # Excel o archivos planos (gzip se detecta solo)
             initialdir=os.getcwd()  # Carpeta inicial
         )
         if not ruta:  # Si canceló
             return  # Sale
 
-        try:  # Intentamos leer
-            registros = importar_excel(ruta)  # Lee excel a lista de dicts
-        except Exception as e:  # Si falla
-            messagebox.showerror("Error", f"No se pudo leer el Excel.\n{e}")  # Muestra error
-            return  # Sale
-
-        if not registros:  # Si no hay registros
-            messagebox.showwarning("Atención", "El Excel no contiene registros.")  # Aviso
-            return  # Sale
-
         sobrescribir = messagebox.askyesno(  # Pregunta política
             "Importación",
             "¿Deseas SOBRESCRIBIR productos cuando el SKU ya exista?\n"
             "Sí = actualiza existentes | No = solo agrega nuevos"
         )
 
-        importados = 0  # Contador nuevos
-        actualizados = 0  # Contador actualizados
-        rechazados = 0  # Contador rechazados
-        razones = []  # Motivos de rechazo
-
-        self.skus = construir_set_skus(self.productos)  # Reconstruye set
-
-        for fila_excel, r in enumerate(registros, start=2):  # Recorre filas (start=2 porque fila 1 es encabezado)
-            sku = str(r.get("sku", "")).strip()  # Lee SKU
-            nombre = str(r.get("nombre", "")).strip()  # Lee nombre
-            categoria = str(r.get("categoria", "")).strip()  # Lee categoría
-            precio = str(r.get("precio", "")).strip()  # Lee precio
-            stock = str(r.get("stock", "")).strip()  # Lee stock
-
-            activo_raw = r.get("activo", True)  # Lee activo
-            if isinstance(activo_raw, str):  # Si viene como texto
-                activo = activo_raw.strip().lower() in ("1", "true", "si", "sí", "yes")  # Convierte a bool
-            else:  # Si viene como número/bool
-                activo = bool(activo_raw)  # Convierte a bool
-
-            sku_original = sku if sku in self.skus else None  # Define sku_original si ya existe
-            modo = "editar" if sku_original else "crear"  # Define modo
-
-            ok, producto, errores = validar_producto(  # Reusa validación
-                sku=sku, nombre=nombre, categoria=categoria,
-                precio=precio, stock=stock, activo=activo,
-                skus_existentes=self.skus, modo=modo, sku_original=sku_original
-            )
+        skus = set(self.skus)  # Copia de los SKUs actuales para validar en el hilo de trabajo
+        self._importacion = {"nuevos": 0, "actualizados": 0, "sin_cambios": 0, "fallidos": []}  # Avance de la importación (hilo de la interfaz)
+        self._lanzar_tarea(  # Lee y valida todo en segundo plano; recién entonces se aplica al catálogo, lote a lote, en el hilo de la interfaz
+            "Importando Excel",  # Nombre
+            lambda t: self._preparar_importacion(ruta, skus, sobrescribir, t),  # Trabajo (no toca el catálogo)
+            self._terminar_importacion,  # Al terminar
+            escribe_catalogo=True,  # Bloquea otras escrituras mientras dura
+            al_parcial=self._aplicar_lote_importado,  # Cada lote validado (solo después de validar el archivo completo)
+            nota_fallo="No se aplicó ningún cambio al catálogo.",  # Todo o nada: se cancela o falla solo antes de aplicar
+        )
 
-            if not ok:  # Si inválido
-                rechazados += 1  # Suma rechazados
-                razones.append(f"Fila {fila_excel}: " + "; ".join(errores))  # Guarda motivo
-                continue  # Sigue
-
-            if sku in self.skus and not sobrescribir:  # Si existe y no se sobrescribe
-                rechazados += 1  # Rechaza
-                razones.append(f"Fila {fila_excel}: SKU {sku} ya existe (no se sobrescribe).")  # Motivo
-                continue  # Sigue
-
-            if sku in self.skus:  # Si existe y se sobrescribe
-                if actualizar_producto(self.productos, sku, producto):  # Actualiza
-                    actualizados += 1  # Suma actualizados
-                else:  # Si falla
-                    rechazados += 1  # Rechaza
-                    razones.append(f"Fila {fila_excel}: no se pudo actualizar SKU {sku}.")  # Motivo
-            else:  # Si no existe
-                agregar_producto(self.productos, producto)  # Agrega nuevo
-                importados += 1  # Suma importados
-                self.skus.add(sku)  # Agrega al set
-
-        guardar_productos(self.productos, self.ruta_datos)  # Guarda JSON
-        self.on_ver_todo()  # Refresca tabla completa
+    def _preparar_importacion(self, ruta, skus, sobrescribir, tarea):  # Hilo de trabajo: lee y valida por lotes (sin tocar el catálogo)
+        from .importacion import validar_en_disco, InformeErrores, ruta_informe  # Import diferido (openpyxl), fuera del hilo de la interfaz
+        with InformeErrores(ruta_informe(ruta)) as informe:  # Rechazos directo a un CSV junto al Excel
+            validados = validar_en_disco(ruta, skus, sobrescribir, informe, progreso=tarea.avanzar)  # Lotes válidos a un temporal: si se cancela o el archivo falla a mitad, no se aplica nada
+        with validados:  # El temporal se borra al terminar
+            tarea.confirmar()  # Archivo completo y válido: desde aquí se aplica entero (ya no se puede cancelar)
+            tarea.nombre = "Aplicando importación"  # Segunda etapa en la barra de progreso
+            hechas = 0  # Filas aplicadas
+            for operaciones in validados:  # Lote a lote desde el disco (la ventana sigue respondiendo entre lotes)
+                tarea.entregar(operaciones)  # Al hilo de la interfaz (espera si va atrasado)
+                hechas += len(operaciones)  # Avance
+                tarea.avanzar(hechas, validados.cantidad)  # Barra de la segunda etapa
+        return informe  # Para el resumen final
+
+    def _aplicar_lote_importado(self, operaciones):  # Hilo de la interfaz: aplica un lote validado al catálogo
+        from .importacion import aplicar_lote  # Ya importado por el hilo de trabajo (aquí no cuesta nada)
+        nuevos, actualizados, sin_cambios, fallidos = aplicar_lote(self.productos, operaciones)  # Alta/cambio en bloque (las filas iguales al catálogo se saltan)
+        self._importacion["nuevos"] += nuevos  # Acumulamos
+        self._importacion["actualizados"] += actualizados  # Acumulamos
+        self._importacion["sin_cambios"] += sin_cambios  # Acumulamos
+        self._importacion["fallidos"].extend(fallidos)  # Casi nunca ocurre (las escrituras están bloqueadas)
+
+    def _terminar_importacion(self, informe):  # Hilo de la interfaz: cierre de la importación
+        informe.agregar(self._importacion["fallidos"])  # Completa el informe con lo que no se pudo aplicar
+        informe.cerrar()  # Cerramos el archivo
+        self.on_ver_todo()  # Refresca tabla completa (el guardado automático escribe los cambios)
         self._actualizar_resumen()  # Refresca resumen
 
+        nuevos = self._importacion["nuevos"]  # Contador nuevos
+        actualizados = self._importacion["actualizados"]  # Contador actualizados
+        sin_cambios = self._importacion["sin_cambios"]  # Contador sin cambios
+
+        if not (nuevos or actualizados or sin_cambios or informe.cantidad):  # Si no hay registros
+            messagebox.showwarning("Atención", "El Excel no contiene registros.")  # Aviso
+            return  # Sale
+
         resumen = (  # Mensaje final
             f"Importación finalizada:\n"
-            f"- Nuevos: {importados}\n"
+            f"- Nuevos: {nuevos}\n"
             f"- Actualizados: {actualizados}\n"
-            f"- Rechazados: {rechazados}"
+            f"- Sin cambios: {sin_cambios}\n"
+            f"- Rechazados: {informe.cantidad}"
         )
 
-        if razones:  # Si hay razones
-            resumen += "\n\nEjemplos de errores:\n" + "\n".join(razones[:10])  # Muestra máx 10
+        if informe.cantidad:  # Si hay rechazos
+            resumen += f"\n\nDetalle de errores por fila en:\n{informe.ruta}"  # El detalle completo queda en el CSV
 
         messagebox.showinfo("Resultado", resumen)  # Muestra resultado
 
+    # ------------------------- TAREAS EN SEGUNDO PLANO -------------------------
+
+    def _lanzar_tarea(self, nombre, funcion, al_terminar, escribe_catalogo=False, al_parcial=None, al_fallar=None, nota_fallo=""):  # Lanza una tarea y muestra su progreso
+        tarea = self.tareas.lanzar(  # Enviamos al planificador
+            nombre, funcion,
+            al_terminar=lambda r: (self._ocultar_progreso(tarea), al_terminar(r)),  # Oculta progreso y entrega resultado
+            al_fallar=lambda e: (self._tarea_fallida(tarea, e, nota_fallo), al_fallar and al_fallar(e)),  # Oculta progreso, informa y limpia
+            al_progreso=self._mostrar_progreso,  # Actualiza barra
+            escribe_catalogo=escribe_catalogo,  # Escritor único
+            al_parcial=al_parcial,  # Resultados parciales (lotes)
+        )
+        if tarea is None:  # Ya había una escritura en curso
+            messagebox.showwarning("Atención", f"Espera a que termine: {self.tareas.escritura.nombre}.")  # Aviso (carga o importación)
+            return  # Sale
+        self._mostrar_progreso(tarea)  # Mostramos la barra desde ya
+
+    def _escritura_bloqueada(self):  # True (y avisa) si hay una tarea escribiendo el catálogo
+        if self.tareas.escritura_en_curso:  # Solo una escritura al catálogo a la vez
+            messagebox.showwarning("Atención", f"Espera a que termine: {self.tareas.escritura.nombre}.")  # Aviso (carga o importación)
+            return True  # Bloqueado
+        return False  # Libre
+
+    def _mostrar_progreso(self, tarea):  # Muestra nombre y avance de una tarea en la barra inferior
+        self._tarea_visible = tarea  # La última que informa es la visible
+        if not self.frm_progreso.winfo_ismapped():  # Si el contenedor está oculto
+            self.frm_progreso.pack(side="right")  # Lo mostramos a la derecha
+        self.btn_cancelar.config(state="disabled" if tarea.confirmada else "normal")  # Una tarea confirmada ya no se puede cancelar
+        if tarea.total:  # Total conocido
+            self.bar_progreso.stop()  # Por si estaba animada
+            self.bar_progreso.config(mode="determinate", maximum=tarea.total, value=tarea.hechos)  # Barra proporcional
+            self.lbl_progreso.config(text=f"{tarea.nombre}... {tarea.hechos:,}/{tarea.total:,}")  # Texto con cifras
+        else:  # Total desconocido (ej. la carga del catálogo)
+            if str(self.bar_progreso.cget("mode")) != "indeterminate":  # Si no está animada
+                self.bar_progreso.config(mode="indeterminate")  # Barra que va y viene
+                self.bar_progreso.start(15)  # Animación (la maneja Tk)
+            self.lbl_progreso.config(text=f"{tarea.nombre}...")  # Solo el nombre
+
+    def _ocultar_progreso(self, tarea):  # Oculta la barra si esa tarea era la visible
+        if tarea is self._tarea_visible:  # Solo si es la que se muestra
+            self._tarea_visible = None  # Ya no hay tarea visible
+            self.bar_progreso.stop()  # Detiene la animación (si la había)
+            self.bar_progreso.config(mode="determinate", value=0)  # Lista para la próxima tarea
+            self.frm_progreso.pack_forget()  # Ocultamos el contenedor
+
+    def _tarea_fallida(self, tarea, error, nota=""):  # Una tarea terminó con error o fue cancelada (nota: qué pasó con los datos)
+        self._ocultar_progreso(tarea)  # Ocultamos progreso
+        extra = f"\n{nota}" if nota else ""  # Ej. "No se aplicó ningún cambio al catálogo."
+        if isinstance(error, TareaCancelada):  # Cancelada por el usuario
+            messagebox.showinfo("Cancelado", f"{tarea.nombre}: cancelado.{extra}")  # Aviso
+        else:  # Error real
+            messagebox.showerror("Error", f"{tarea.nombre}: falló.\n{error}{extra}")  # Mensaje de error
+
+    def on_cancelar_tarea(self):  # Botón "Cancelar" de la barra de progreso
+        if self._tarea_visible is not None:  # Si hay una tarea visible
+            self._tarea_visible.cancelar()  # Pedimos cancelar (se detiene en su próximo aviso de progreso)
+
     # ------------------------- TABLA Y RESUMEN -------------------------
 
     def _refrescar_tabla(self, registros):  # Actualiza la tabla con registros
-        for item in self.tree.get_children():  # Recorre filas actuales
-            self.tree.delete(item)  # Borra filas
-
-        for p in registros:  # Inserta registros nuevos
-            self.tree.insert("", "end", values=(  # Inserta una fila
-                p.get("sku", ""),  # SKU
-                p.get("nombre", ""),  # Nombre
-                p.get("categoria", ""),  # Categoría
-                p.get("precio", ""),  # Precio
-                p.get("stock", ""),  # Stock
-                p.get("activo", ""),  # Activo
-                p.get("creado_en", ""),  # Creado en
-            ))
-
-    def _registros_visibles(self):  # Obtiene registros visibles en la tabla
-        registros = []  # Lista de dicts
-        for iid in self.tree.get_children():  # Recorre filas
-            v = self.tree.item(iid, "values")  # Obtiene values
-            registros.append({  # Construye dict
-                "sku": v[0],  # SKU
-                "nombre": v[1],  # Nombre
-                "categoria": v[2],  # Categoría
-                "precio": v[3],  # Precio
-                "stock": v[4],  # Stock
-                "activo": v[5],  # Activo
-                "creado_en": v[6],  # Creado en
-            })
-        return registros  # Retorna lista
+        self.tabla.mostrar(self._ordenar(registros))  # Solo crea/actualiza/borra las filas que cambiaron (y solo las cercanas a lo visible)
+
+    def _ordenar(self, registros):  # Aplica el orden elegido en los encabezados
+        if self._orden is None:  # Sin orden elegido
+            return registros  # Orden del catálogo
+        columna, descendente = self._orden  # Columna y sentido
+        valor = CAMPOS_ORDENABLES.get(columna)  # Conversión del campo (si tiene índice)
+        if valor is not None and len(registros) == len(self.productos):  # Vista completa de un campo indexado
+            return self.productos.indice_ordenado(columna).productos(descendente)  # Ya está ordenado: solo se recorre
+        if valor is None:  # Columna de texto (o activo)
+            valor = lambda p: str(p.get(columna, "")).casefold()  # Orden alfabético sin mayúsculas
+        return sorted(registros, key=lambda p: (valor(p), str(p.get("sku", ""))), reverse=descendente)  # Un filtro: se ordena solo ese subconjunto
+
+    def _registros_visibles(self):  # Obtiene los registros de la vista actual (incluye filas aún no creadas en la tabla)
+        return self.tabla.registros  # La misma lista, sin copiar: la tabla la reemplaza en cada vista y los productos no se modifican en el lugar
 
     def _actualizar_resumen(self, registros=None):  # Actualiza resumen inferior
-        regs = registros if registros is not None else self.productos  # Usa filtrados o todos
-        total = len(regs)  # Número de productos
-        valor = valor_inventario_recursivo(regs)  # Valor inventario con recursión
+        if registros is None:  # Resumen global
+            total = len(self.productos)  # Número de productos
+            valor = self.valorizacion.total  # Total mantenido al día (O(1))
+        else:  # Resumen de un filtro
+            total = len(registros)  # Número de productos filtrados
+            valor = valor_inventario(registros)  # Suma iterativa (sin límite de recursión)
         self.lbl_resumen.config(text=f"Resumen: {total} productos | Valor inventario: {valor:,.0f}")  # Muestra resumen
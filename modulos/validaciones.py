@@ -1,11 +1,15 @@
 import re  # Importamos re para validar patrones (por ejemplo SKU)
 from datetime import datetime  # Importamos datetime para guardar fecha/hora de creación
-from typing import Dict, Any, Tuple, List, Optional  # Tipos para documentar entradas y salidas
+from typing import Dict, Any, Tuple, List, Optional, Sequence  # Tipos para documentar entradas y salidas
 
-from .datos_basicos import normalizar_texto, to_int_seguro, to_float_seguro  # Importamos helpers de limpieza y conversión
+from .datos_basicos import normalizar_texto, to_int_seguro, to_float_seguro, to_bool_seguro  # Importamos helpers de limpieza y conversión
 
 CATEGORIAS = ("Aseo", "Alimentos", "Ferretería", "Otro")  # Tupla inmutable (cumple requisito de estructura de datos)
 
+_PATRON_SKU = re.compile(r"[A-Za-z0-9_-]{2,30}")  # Patrón de SKU compilado una sola vez (lo usa validar_lote)
+_CATEGORIAS_SET = frozenset(CATEGORIAS)  # Mismas categorías en un set (pertenencia O(1))
+_MSG_CATEGORIA = f"Categoría inválida. Usa: {', '.join(CATEGORIAS)}"  # Mensaje armado una sola vez
+
 def validar_producto(  # Función que valida campos y arma el diccionario del producto
     sku: str,  # SKU ingresado
     nombre: str,  # Nombre ingresado
@@ -69,3 +73,88 @@ def validar_producto(  # Función que valida campos y arma el diccionario del pr
     }  # Fin del dict producto
 
     return (len(errores) == 0), producto, errores  # Retornamos OK si no hay errores, y además el dict y lista de errores
+
+
+def _texto(v: Any) -> str:  # Celda/valor → texto limpio (None → "")
+    return "" if v is None else str(v).strip()  # Acepta números (un SKU 123 de Excel) además de textos
+
+def _precio(v: Any) -> Optional[float]:  # Igual que to_float_seguro, sin pasar por texto cuando ya es número
+    t = type(v)  # Tipo exacto (bool no cuenta como número)
+    if t is float or t is int:  # Número de Excel
+        return float(v)  # Directo
+    return to_float_seguro(v)  # Texto u otro
+
+def _stock(v: Any) -> Optional[int]:  # Igual que to_int_seguro, sin pasar por texto cuando ya es entero
+    if type(v) is int:  # Entero de Excel (bool no cuenta)
+        return v  # Directo
+    return to_int_seguro(v)  # Texto u otro
+
+def _errores_fila(sku: str, nombre: str, categoria: str, precio: Optional[float], stock: Optional[int], repetido_en: Optional[int], existe: bool) -> List[str]:  # Mensajes de una fila inválida (mismo orden que validar_producto)
+    e: List[str] = []  # Errores de la fila
+    if not sku:  # SKU vacío
+        e.append("SKU es obligatorio.")  # Error
+    elif not _PATRON_SKU.fullmatch(sku):  # Formato
+        e.append("SKU inválido (usa letras/números/_/- y largo 2 a 30).")  # Error
+    if not nombre:  # Nombre vacío
+        e.append("Nombre es obligatorio.")  # Error
+    elif len(nombre) < 2:  # Muy corto
+        e.append("Nombre debe tener al menos 2 caracteres.")  # Error
+    if categoria not in _CATEGORIAS_SET:  # Categoría fuera de la lista
+        e.append(_MSG_CATEGORIA)  # Error
+    if precio is None:  # No numérico
+        e.append("Precio debe ser numérico.")  # Error
+    elif precio < 0:  # Negativo
+        e.append("Precio no puede ser negativo.")  # Error
+    if stock is None:  # No entero
+        e.append("Stock debe ser numérico (entero).")  # Error
+    elif stock < 0:  # Negativo
+        e.append("Stock no puede ser negativo.")  # Error
+    if repetido_en is not None:  # Repetido dentro del archivo/lote
+        e.append(f"SKU repetido (ya aparece en la fila {repetido_en}).")  # Error
+    elif existe:  # Ya está en el catálogo (y no se permite)
+        e.append("SKU ya existe, debe ser único.")  # Error
+    return e  # Lista de mensajes
+
+def validar_lote(  # Valida un lote completo en columnas (mismas reglas que validar_producto, mucho más rápido)
+    columnas: Dict[str, Sequence[Any]],  # "sku", "nombre", "categoria", "precio", "stock" y opcional "activo": una lista por campo
+    skus_existentes: set,  # SKUs que ya están en el catálogo
+    permitir_existentes: bool = False,  # True = un SKU existente es válido (se actualizará); False = error de unicidad
+    filas: Optional[Sequence[int]] = None,  # Identificador de cada fila (ej. número de fila del Excel); por defecto 0..n-1
+    vistos: Optional[Dict[str, int]] = None,  # SKU → fila donde apareció (se completa; sirve para detectar repetidos entre lotes)
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]:  # ([(fila, producto)], [{"fila", "sku", "errores"}])
+    # Limpieza y conversión por columna: el caso común (texto, o número ya tipado de Excel) se resuelve sin llamar funciones
+    skus = [v.strip() if type(v) is str else _texto(v) for v in columnas["sku"]]  # Columna SKU limpia
+    nombres = [v.strip() if type(v) is str else _texto(v) for v in columnas["nombre"]]  # Columna nombre limpia
+    categorias = [v.strip() if type(v) is str else _texto(v) for v in columnas["categoria"]]  # Columna categoría limpia
+    precios = [v if type(v) is float else _precio(v) for v in columnas["precio"]]  # Columna precio convertida
+    stocks = [v if type(v) is int else _stock(v) for v in columnas["stock"]]  # Columna stock convertida
+    n = len(skus)  # Tamaño del lote
+    activos = [v if type(v) is bool else to_bool_seguro(v) for v in columnas["activo"]] if "activo" in columnas else [True] * n  # Sin columna: activos
+    filas = range(n) if filas is None else filas  # Identificadores de fila
+    vistos = {} if vistos is None else vistos  # SKUs ya vistos (en este lote o en lotes anteriores)
+    existentes = set() if permitir_existentes else skus_existentes  # Si se permiten, no hace falta mirarlos
+    creado_en = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # Una sola marca de tiempo para todo el lote
+    patron = _PATRON_SKU.fullmatch  # Método local (evita buscar el atributo en cada fila)
+    categorias_ok = _CATEGORIAS_SET  # Variable local (más rápida que la global)
+
+    validos: List[Tuple[int, Dict[str, Any]]] = []  # Productos válidos
+    errores: List[Dict[str, Any]] = []  # Errores por fila
+    for fila, sku, nombre, categoria, precio, stock, activo in zip(filas, skus, nombres, categorias, precios, stocks, activos):  # Una pasada por fila
+        if (  # Camino rápido: una sola condición para la fila válida (la gran mayoría)
+            patron(sku) and len(nombre) >= 2 and categoria in categorias_ok
+            and precio is not None and not precio < 0 and stock is not None and stock >= 0
+            and sku not in vistos and sku not in existentes
+        ):
+            vistos[sku] = fila  # Recordamos dónde apareció
+            validos.append((fila, {  # Mismo dict que validar_producto
+                "sku": sku,
+                "nombre": nombre,
+                "categoria": categoria,
+                "precio": precio,
+                "stock": stock,
+                "activo": activo,
+                "creado_en": creado_en,
+            }))
+        else:  # Fila inválida: recién aquí se arman los mensajes
+            errores.append({"fila": fila, "sku": sku, "errores": _errores_fila(sku, nombre, categoria, precio, stock, vistos.get(sku), sku in existentes)})  # Error estructurado
+    return validos, errores  # Válidos y errores por fila
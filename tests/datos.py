@@ -0,0 +1,49 @@
+import random  # Datos y cambios aleatorios reproducibles
+from typing import List, Dict, Any  # Tipos para claridad
+
+from modulos.validaciones import CATEGORIAS  # Categorías válidas
+
+_PALABRAS = ("puerta", "manzana", "tornillo", "jabón", "cloro", "arroz", "martillo", "clavo", "Ñandú", "MDF")  # Vocabulario (con acentos y mayúsculas)
+
+
+def producto(sku: str, **cambios: Any) -> Dict[str, Any]:  # Producto válido con valores por defecto
+    p = {"sku": sku, "nombre": f"producto {sku}", "categoria": "Otro", "precio": 100.0, "stock": 5, "activo": True, "creado_en": "2026-01-01 10:00:00"}  # Forma de productos.json
+    p.update(cambios)  # Campos pedidos
+    return p  # Producto
+
+
+def productos_aleatorios(n: int, rnd: random.Random, desde: int = 0) -> List[Dict[str, Any]]:  # n productos válidos distintos
+    return [  # Misma forma que productos.json
+        producto(
+            f"SKU{i:05d}",  # SKU único
+            nombre=f"{rnd.choice(_PALABRAS)} {rnd.choice(_PALABRAS)} {i}",  # Nombre de 3 palabras
+            categoria=rnd.choice(CATEGORIAS),  # Categoría válida
+            precio=round(rnd.uniform(0, 5000), 2),  # Precio con centavos
+            stock=rnd.randint(0, 50),  # Stock
+            activo=rnd.random() < 0.9,  # 90% activos
+            creado_en=f"2026-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} {rnd.randint(0, 23):02d}:00:00",  # Fecha
+        )
+        for i in range(desde, desde + n)
+    ]
+
+
+def mutar(catalogo, rnd: random.Random, pasos: int, siguiente: int = 100000) -> None:  # Altas, cambios y bajas al azar sobre un catálogo
+    for _ in range(pasos):  # Cada paso
+        skus = list(catalogo.skus)  # SKUs vivos
+        accion = rnd.random()  # Qué hacemos
+        if accion < 0.3 or not skus:  # Alta
+            catalogo.agregar(productos_aleatorios(1, rnd, siguiente)[0])  # Producto nuevo
+            siguiente += 1  # Próximo SKU
+        elif accion < 0.7:  # Cambio de otro campo (mismo SKU)
+            sku = rnd.choice(skus)  # Elegido
+            nuevo = productos_aleatorios(1, rnd, siguiente)[0]  # Valores al azar
+            nuevo["sku"] = sku  # Mismo SKU
+            catalogo.actualizar(sku, nuevo)  # Reemplazo
+            siguiente += 1  # Nombre distinto la próxima vez
+        elif accion < 0.8:  # Cambio de SKU
+            sku = rnd.choice(skus)  # Elegido
+            nuevo = dict(catalogo.obtener(sku), sku=f"SKU{siguiente:05d}")  # SKU nuevo
+            catalogo.actualizar(sku, nuevo)  # Reemplazo
+            siguiente += 1  # Próximo SKU
+        else:  # Baja
+            catalogo.eliminar(rnd.choice(skus))  # Por SKU
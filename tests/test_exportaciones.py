@@ -0,0 +1,60 @@
+import random  # Textos al azar
+
+import pytest  # Parametrización
+from reportlab.pdfbase.pdfmetrics import stringWidth  # Ancho real en Helvetica
+
+from modulos.exportaciones import ANCHOS_PDF, _recortar, exportar_excel, exportar_csv, exportar_ndjson  # Anchos fijos, recorte de celdas y exportaciones
+from modulos.gestion_datos import CatalogoProductos  # Catálogo destino de la importación
+from modulos.importacion import importar_excel_en_catalogo  # Importación completa (Excel, CSV o NDJSON)
+from tests.datos import producto, productos_aleatorios  # Datos de prueba
+
+
+def _cabe(texto, ancho):  # ¿El texto entra en la celda (Helvetica 8, 2 puntos de relleno por lado)?
+    return stringWidth(texto, "Helvetica", 8) <= ancho - 4  # Medición de reportlab
+
+
+@pytest.mark.parametrize("letra", ["W", "@", "M", "i"])
+def test_recortar_texto_de_un_solo_caracter(letra):  # Nombres de puras "W" o "@" también se cortan
+    ancho = ANCHOS_PDF[1]  # Columna del nombre
+    for n in range(1, 120):  # Largo creciente
+        texto = letra * n  # Texto
+        recortado = _recortar(texto, ancho)  # Celda
+        assert _cabe(recortado, ancho)  # Nunca se sale de la columna
+        if _cabe(texto, ancho):  # Cabía completo
+            assert recortado == texto  # Sin cambios
+        else:  # No cabía
+            assert recortado.endswith("…") and texto.startswith(recortado[:-1])  # Prefijo con puntos suspensivos
+            assert not _cabe(texto[:len(recortado)] + "…", ancho)  # El prefijo es el más largo posible
+
+
+def test_recortar_textos_al_azar():  # Mixto (acentos, mayúsculas, signos) en todas las columnas
+    rnd = random.Random(8)  # Semilla
+    alfabeto = "abcWXYZ@#ñÑáé 0123456789.-_/"  # Anchos muy distintos
+    for _ in range(2000):  # Muchos casos
+        ancho = rnd.choice(ANCHOS_PDF)  # Columna
+        texto = "".join(rnd.choice(alfabeto) for _ in range(rnd.randint(0, 60)))  # Texto
+        recortado = _recortar(texto, ancho)  # Celda
+        assert _cabe(recortado, ancho)  # Cabe
+        assert recortado == texto if _cabe(texto, ancho) else recortado.endswith("…")  # Solo se corta lo que no cabe
+
+
+def _sin_fecha(productos, digitos=None):  # Productos sin creado_en (la importación pone la fecha de la carga); digitos = precisión del precio en el archivo
+    return [{k: (float(f"{v:.{digitos}g}") if digitos and k == "precio" else v) for k, v in p.items() if k != "creado_en"} for p in productos]  # Resto de los campos
+
+
+@pytest.mark.parametrize("exportar, archivo", [(exportar_excel, "p.xlsx"), (exportar_csv, "p.csv"), (exportar_csv, "p.csv.gz"), (exportar_ndjson, "p.ndjson"), (exportar_ndjson, "p.ndjson.gz")])
+def test_exportar_e_importar_sin_perdida(tmp_path, exportar, archivo):  # Lo exportado se vuelve a importar igual (valores y tipos)
+    productos = productos_aleatorios(300, random.Random(19)) + [  # Comunes y difíciles
+        producto("C1", nombre='coma, "comillas" y; punto y coma', precio=0.1 + 0.2),  # Separadores y un float sin representación corta
+        producto("C2", nombre="Ñandú áéí\tTab", precio=1e-7, stock=0, activo=False),  # Acentos, tabulación, exponente e inactivo
+        producto("123", nombre="  espacios  ".strip(), categoria="Ferretería", precio=123456789.125, stock=10**9),  # SKU numérico y números grandes
+    ]
+    ruta = str(tmp_path / archivo)  # Archivo de salida
+    assert exportar(productos, ruta) == len(productos)  # Todas las filas
+    catalogo = CatalogoProductos()  # Catálogo vacío
+    resumen = importar_excel_en_catalogo(ruta, catalogo, False, tam_lote=64)  # Varios lotes
+    assert (resumen["nuevos"], resumen["rechazados"]) == (len(productos), 0)  # Todo entra
+    importados = catalogo.como_lista()  # Resultado
+    digitos = 16 if archivo.endswith(".xlsx") else None  # openpyxl escribe los números con 16 cifras significativas; CSV y NDJSON, exactos
+    assert _sin_fecha(importados) == _sin_fecha(productos, digitos)  # Mismos valores y orden
+    assert all(type(a["precio"]) is float and type(a["stock"]) is int and type(a["activo"]) is bool for a in importados)  # Mismos tipos
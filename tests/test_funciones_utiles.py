@@ -0,0 +1,40 @@
+import math  # isclose
+import random  # Cambios aleatorios
+
+from modulos.funciones_utiles import ValorizacionInventario, valor_inventario, valor_inventario_recursivo  # Incremental, fsum y referencia recursiva
+from modulos.gestion_datos import CatalogoProductos  # Catálogo con observadores
+from tests.datos import productos_aleatorios, mutar  # Datos de prueba
+
+
+def _por_categoria(productos):  # Valor por categoría calculado de cero
+    grupos = {}  # Categoría → productos
+    for p in productos:  # Recorrido completo
+        grupos.setdefault(p["categoria"], []).append(p)  # Agrupamos
+    return {cat: valor_inventario(ps) for cat, ps in grupos.items()}  # fsum por grupo
+
+
+def test_valorizacion_igual_a_recorrido_tras_cambios():  # El total mantenido al día coincide con sumar de cero
+    rnd = random.Random(3)  # Semilla
+    catalogo = CatalogoProductos(productos_aleatorios(300, rnd))  # Catálogo
+    valorizacion = ValorizacionInventario(catalogo)  # Valor inicial
+    catalogo.suscribir(valorizacion)  # Se mantiene con cada cambio
+    for _ in range(5):  # Varias rondas
+        mutar(catalogo, rnd, 400)  # Altas, cambios y bajas
+        lista = catalogo.como_lista()  # Estado actual
+        assert valorizacion.total == valor_inventario(lista)  # Igual a fsum (sin error acumulado)
+        assert math.isclose(valorizacion.total, valor_inventario_recursivo(lista))  # Y a la referencia recursiva (unos cientos de productos)
+        por_cat = valorizacion.por_categoria  # Valores por categoría
+        for cat, valor in _por_categoria(lista).items():  # Cada categoría con productos
+            assert por_cat[cat] == valor  # Igual a fsum
+
+
+def test_valorizacion_vuelve_a_cero():  # Tras muchas altas, cambios y bajas, borrar todo deja el total en 0 exacto
+    rnd = random.Random(5)  # Semilla
+    catalogo = CatalogoProductos()  # Vacío
+    valorizacion = ValorizacionInventario()  # Sin productos
+    catalogo.suscribir(valorizacion)  # Se mantiene con cada cambio
+    mutar(catalogo, rnd, 20000)  # Muchos cambios
+    for sku in list(catalogo.skus):  # Borramos todo
+        catalogo.eliminar(sku)  # Uno a uno
+    assert valorizacion.total == 0.0  # Sin deriva
+    assert all(v == 0.0 for v in valorizacion.por_categoria.values())  # Tampoco por categoría
@@ -0,0 +1,112 @@
+import random  # Cambios aleatorios
+
+from modulos.gestion_datos import (  # API del catálogo
+    CatalogoProductos, agregar_producto, actualizar_producto, eliminar_producto, index_por_sku, construir_set_skus,
+    ajustar_precios, ajustar_stock, cambiar_categoria, eliminar_productos,
+)
+from modulos.funciones_utiles import ValorizacionInventario, valor_inventario  # Observador de la valorización y referencia fsum
+from tests.datos import producto, productos_aleatorios, mutar  # Datos de prueba
+
+
+def test_crud_basico():  # Alta, consulta, cambio y baja por SKU
+    catalogo = CatalogoProductos([producto("A1"), producto("B1")])  # Dos productos
+    assert len(catalogo) == 2 and "A1" in catalogo and catalogo.obtener("B1")["sku"] == "B1"  # Lectura
+    assert not catalogo.agregar(producto("A1"))  # SKU repetido: no se agrega
+    assert catalogo.actualizar("A1", producto("A2", nombre="nuevo"))  # Cambio de SKU
+    assert "A1" not in catalogo and catalogo.obtener("A2")["nombre"] == "nuevo"  # Índice al día
+    assert catalogo.eliminar("B1") and not catalogo.eliminar("B1")  # Baja (la segunda no encuentra nada)
+    assert [p["sku"] for p in catalogo] == ["A2"]  # Quedó uno
+
+
+def test_orden_y_posiciones_con_huecos():  # Las bajas dejan huecos que se compactan sin cambiar el orden
+    catalogo = CatalogoProductos(productos_aleatorios(3000, random.Random(1)))  # Bastantes para compactar (más de 1024 huecos)
+    lista = catalogo.como_lista()  # Referencia como lista
+    for sku in [p["sku"] for p in lista[::2]] + [p["sku"] for p in lista[1::4]]:  # Bajas salteadas
+        catalogo.eliminar(sku)  # Catálogo
+        eliminar_producto(lista, sku)  # Lista (pop)
+    assert catalogo.como_lista() == lista  # Mismo orden
+    for i in (0, 1, len(lista) // 2, len(lista) - 1):  # Algunas posiciones
+        assert catalogo[i] is lista[i] and catalogo.posicion(lista[i]["sku"]) == i  # Posición visible = índice de la lista
+    assert index_por_sku(catalogo, "no existe") == -1  # Sin resultado
+
+
+def test_catalogo_igual_a_lista_tras_cambios_aleatorios():  # La API funcional da lo mismo con lista o con catálogo
+    rnd = random.Random(7)  # Semilla
+    base = productos_aleatorios(200, rnd)  # Datos
+    lista, catalogo = list(base), CatalogoProductos(base)  # Mismo contenido
+    for i in range(2000):  # Cambios al azar
+        sku = rnd.choice(lista)["sku"] if lista else None  # Un SKU existente
+        accion = rnd.random()  # Qué hacemos
+        if accion < 0.3 or sku is None:  # Alta
+            p = productos_aleatorios(1, rnd, 1000 + i)[0]  # Nuevo
+            agregar_producto(lista, p)  # Lista
+            agregar_producto(catalogo, p)  # Catálogo
+        elif accion < 0.7:  # Cambio (conserva creado_en)
+            nuevo = dict(productos_aleatorios(1, rnd, 1000 + i)[0], sku=sku)  # Otros valores
+            assert actualizar_producto(lista, sku, dict(nuevo)) == actualizar_producto(catalogo, sku, dict(nuevo))  # Mismo resultado
+        else:  # Baja
+            assert eliminar_producto(lista, sku) == eliminar_producto(catalogo, sku)  # Mismo resultado
+    assert catalogo.como_lista() == lista  # Mismo contenido y orden
+    assert construir_set_skus(catalogo) == construir_set_skus(lista)  # Mismos SKUs
+
+
+def test_version_sube_con_cada_cambio():  # Otros componentes detectan cambios por la versión
+    catalogo = CatalogoProductos()  # Vacío
+    antes = catalogo.version  # Versión inicial
+    mutar(catalogo, random.Random(3), 50)  # 50 cambios
+    assert catalogo.version > antes  # Cambió
+
+
+def test_duplicados_al_cargar_se_informan():  # Un SKU repetido en los datos se descarta, pero queda anotado
+    primero, repetido = producto("A1", nombre="primero"), producto("A1", nombre="repetido")  # Mismo SKU
+    catalogo = CatalogoProductos([primero, producto("B1"), repetido])  # Carga
+    assert len(catalogo) == 2 and catalogo.obtener("A1") is primero  # Gana la primera aparición
+    assert catalogo.duplicados == [(2, repetido)]  # Posición en la lista cargada y producto completo
+
+
+def _con_observadores(productos):  # Catálogo con los observadores de la interfaz (búsqueda, agregados, índices ordenados, valorización, huellas)
+    catalogo = CatalogoProductos(productos)  # Catálogo
+    valorizacion = ValorizacionInventario(catalogo)  # Valor incremental
+    catalogo.suscribir(valorizacion)  # Al día
+    catalogo.buscar("x")  # Índice de búsqueda
+    catalogo.agregados  # Agregados e índice por stock
+    for campo in ("precio", "creado_en"):  # Resto de índices ordenados
+        catalogo.indice_ordenado(campo)  # Se crea y se suscribe
+    catalogo.huellas  # Huellas
+    return catalogo, valorizacion  # Listo
+
+
+def _estado(catalogo, valorizacion):  # Todo lo que mantienen los observadores
+    indice = catalogo.indice_busqueda  # Índice de trigramas
+    return (
+        catalogo.como_lista(), indice.textos, indice._trigramas, indice._categorias,  # Catálogo e índice de búsqueda
+        catalogo.agregados.conteo_por_categoria(), {c: catalogo.indice_ordenado(c).productos() for c in ("precio", "stock", "creado_en")},  # Agregados e índices ordenados
+        [catalogo.huellas.get(s) for s in catalogo.skus],  # Huellas
+    )
+
+
+def test_cambios_masivos_igual_a_uno_por_uno():  # Los avisos en lote dejan a cada observador igual que los avisos sueltos
+    rnd = random.Random(23)  # Semilla
+    base = productos_aleatorios(1200, rnd)  # Datos
+    masivo, val_masivo = _con_observadores([dict(p) for p in base])  # Con *_varios
+    suelto, val_suelto = _con_observadores([dict(p) for p in base])  # Referencia: un actualizar/eliminar por producto
+    for ronda in range(3):  # Varias rondas
+        skus = rnd.sample(list(masivo.skus), 600)  # Selección grande (caminos de reconstrucción)
+        operaciones = [  # (función masiva, argumento, campos que cambian)
+            (ajustar_precios, 10, lambda p: {"precio": round(float(p["precio"]) * 1.1, 2)}),  # +10%
+            (ajustar_stock, -3, lambda p: {"stock": p["stock"] - 3} if p["stock"] >= 3 else None),  # Resta (omite negativos)
+            (cambiar_categoria, "Aseo", lambda p: {"categoria": "Aseo"}),  # Mueve conteos y valores entre categorías
+        ]
+        for funcion, arg, campos in operaciones:  # Cada cambio masivo
+            elegidos = skus[:400]  # Parte de la selección
+            funcion(masivo, elegidos, arg)  # Un solo aviso
+            for sku in elegidos:  # Referencia
+                cambio = campos(suelto.obtener(sku))  # Campos nuevos
+                if cambio is not None:  # Admitido
+                    suelto.actualizar(sku, {**suelto.obtener(sku), **cambio})  # Un aviso por producto
+        eliminar_productos(masivo, skus[400:])  # Bajas en lote
+        for sku in skus[400:]:  # Referencia
+            suelto.eliminar(sku)  # Una por una
+        assert _estado(masivo, val_masivo) == _estado(suelto, val_suelto)  # Mismo estado en cada observador
+        assert val_masivo.total == valor_inventario(masivo)  # Valorización exacta
+        assert val_masivo.por_categoria == {c: valor_inventario(p for p in masivo if p["categoria"] == c) for c in val_masivo.por_categoria}  # Por categoría también
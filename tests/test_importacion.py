@@ -0,0 +1,58 @@
+import json  # Archivos NDJSON de prueba
+import tempfile  # Carpeta de los temporales
+
+import pytest  # tmp_path, monkeypatch y raises
+
+from modulos.gestion_datos import CatalogoProductos  # Catálogo destino
+from modulos.importacion import LotesEnDisco, importar_excel_en_catalogo  # Lotes en disco y flujo completo
+from tests.datos import producto  # Datos de prueba
+
+
+def _escribir_ndjson(ruta, filas, final=""):  # Un producto por línea (final = texto extra al terminar)
+    with open(ruta, "w", encoding="utf-8") as f:  # Archivo plano
+        for fila in filas:  # Cada fila
+            f.write(json.dumps(fila, ensure_ascii=False) + "\n")  # Una línea
+        f.write(final)  # Por ejemplo, una línea dañada
+
+
+@pytest.fixture
+def temporales(tmp_path, monkeypatch):  # Los temporales de la importación van a una carpeta propia (para ver que se borran)
+    carpeta = tmp_path / "tmp"  # Carpeta
+    carpeta.mkdir()  # Creada
+    monkeypatch.setattr(tempfile, "tempdir", str(carpeta))  # mkstemp usa esta carpeta
+    return carpeta  # Para revisarla
+
+
+def test_lotes_en_disco_conservan_orden_y_valores(temporales):  # Lo que se guarda es lo que se relee
+    lotes = [[(2, "A", producto("A", precio=0.1 + 0.2, nombre="Ñandú"), True)], [(3, "B", producto("B"), False), (4, "C", producto("C", activo=False), True)]]  # Floats, acentos y bools
+    with LotesEnDisco() as disco:  # Temporal
+        for lote in lotes:  # Cada lote
+            disco.agregar(lote)  # Al disco
+        assert list(disco) == lotes and disco.cantidad == 3  # Mismas tuplas en el mismo orden
+    assert not list(temporales.iterdir())  # Borrado al salir
+
+
+def test_importar_aplica_todo(tmp_path, temporales):  # Archivo válido (con un rechazo): se aplica entero
+    ruta = str(tmp_path / "carga.ndjson")  # Archivo a importar
+    filas = [{"sku": f"N{i:04d}", "nombre": "nuevo", "categoria": "Aseo", "precio": 10, "stock": 2} for i in range(25)]  # Altas
+    filas.append({"sku": "AA", "nombre": "cambiado", "categoria": "Otro", "precio": 1, "stock": 1})  # Actualización
+    filas.append({"sku": "mal sku", "nombre": "x", "categoria": "?", "precio": -1, "stock": 0})  # Rechazo
+    _escribir_ndjson(ruta, filas)  # Archivo
+    catalogo = CatalogoProductos([producto("AA")])  # Catálogo previo
+    resumen = importar_excel_en_catalogo(ruta, catalogo, True, tam_lote=10)  # Varios lotes
+    assert (resumen["nuevos"], resumen["actualizados"], resumen["rechazados"]) == (25, 1, 1)  # Contadores
+    assert len(catalogo) == 26 and catalogo.obtener("AA")["nombre"] == "cambiado"  # Aplicado
+    assert catalogo.obtener("AA")["creado_en"] == producto("AA")["creado_en"]  # La actualización conserva creado_en
+    assert not list(temporales.iterdir())  # Sin temporales
+
+
+def test_importar_es_todo_o_nada(tmp_path, temporales):  # Un archivo que falla a mitad no deja cambios a medias
+    ruta = str(tmp_path / "carga.ndjson")  # Archivo a importar
+    filas = [{"sku": f"N{i:04d}", "nombre": "nuevo", "categoria": "Aseo", "precio": 10, "stock": 2} for i in range(25)]  # Filas válidas
+    _escribir_ndjson(ruta, filas, final="{dañada\n")  # Línea ilegible al final
+    catalogo = CatalogoProductos([producto("A")])  # Catálogo previo
+    version = catalogo.version  # Versión antes de importar
+    with pytest.raises(ValueError):  # La lectura falla
+        importar_excel_en_catalogo(ruta, catalogo, True, tam_lote=10)  # Los primeros lotes ya estaban validados
+    assert catalogo.version == version and catalogo.como_lista() == [producto("A")]  # Nada aplicado
+    assert not list(temporales.iterdir())  # Temporal borrado
@@ -0,0 +1,27 @@
+import random  # Cambios aleatorios
+
+import pytest  # Parametrización
+
+from modulos.gestion_datos import CatalogoProductos, buscar  # Búsqueda indexada y lineal
+from tests.datos import productos_aleatorios, mutar  # Datos de prueba
+
+CONSULTAS = ("", "a", "SK", "sku0001", "SKU00042", "torn", "TORNILLO", "jabón", "ñandú", "mdf 1", "o 1", "ferre", "aseo", "zzz", "clavo clavo")  # Cortas, largas, categorías, acentos y sin resultado
+
+
+@pytest.mark.parametrize("semilla", [1, 2, 3])
+def test_buscar_indexado_igual_a_recorrido_lineal(semilla):  # Mismos productos y mismo orden que gestion_datos.buscar sobre una lista
+    rnd = random.Random(semilla)  # Semilla
+    catalogo = CatalogoProductos(productos_aleatorios(400, rnd))  # Catálogo
+    catalogo.buscar("x")  # Crea el índice antes de los cambios (así se prueba la mantención incremental)
+    for _ in range(5):  # Varias rondas
+        mutar(catalogo, rnd, 300)  # Altas, cambios (incluso de SKU) y bajas
+        lista = catalogo.como_lista()  # Referencia lineal
+        for q in CONSULTAS:  # Cada consulta
+            assert catalogo.buscar(q) == buscar(lista, q), q  # Igual resultado
+
+
+def test_relevancia_conserva_los_mismos_resultados():  # Ordenar por relevancia solo reordena
+    catalogo = CatalogoProductos(productos_aleatorios(300, random.Random(9)))  # Catálogo
+    resultado = catalogo.buscar("sku0001", por_relevancia=True)  # Con relevancia
+    assert sorted(p["sku"] for p in resultado) == sorted(p["sku"] for p in catalogo.buscar("sku0001"))  # Mismos productos
+    assert resultado[0]["sku"] == "SKU00010"  # El prefijo exacto más corto va primero (sort estable)
@@ -0,0 +1,51 @@
+import random  # Cambios aleatorios
+
+from modulos.gestion_datos import CatalogoProductos, ajustar_precios, eliminar_productos  # Catálogo con observadores y cambios masivos
+from modulos.indices_ordenados import CAMPOS_ORDENABLES, IndiceOrdenado  # Índice ordenado
+from tests.datos import producto, productos_aleatorios, mutar  # Datos de prueba
+
+
+def _ordenados(catalogo, campo):  # Referencia: sort completo por (valor, SKU)
+    valor = CAMPOS_ORDENABLES[campo]  # Conversión del campo
+    return sorted(catalogo, key=lambda p: (valor(p), p["sku"]))  # Mismo desempate que el índice
+
+
+def _comparar(catalogo, campo, rnd):  # El índice coincide con el sort completo
+    indice = catalogo.indice_ordenado(campo)  # Índice vivo
+    esperado = _ordenados(catalogo, campo)  # Referencia
+    valor = CAMPOS_ORDENABLES[campo]  # Conversión del campo
+    assert indice.productos() == esperado  # Todo, ascendente
+    assert indice.productos(descendente=True) == esperado[::-1]  # Todo, descendente
+    for k in (0, 1, 7, len(esperado) + 3):  # Primeros k
+        assert indice.primeros(k) == esperado[:k]  # Menores
+        assert indice.primeros(k, descendente=True) == esperado[::-1][:k]  # Mayores
+    for _ in range(20):  # Rangos al azar
+        a, b = sorted(valor(rnd.choice(esperado)) for _ in range(2))  # Límites tomados de valores reales
+        assert indice.rango(a, b) == [p for p in esperado if a <= valor(p) <= b]  # Inclusivo
+        assert indice.rango(desde=a) == [p for p in esperado if a <= valor(p)]  # Sin tope
+        assert indice.rango(hasta=b) == [p for p in esperado if valor(p) <= b]  # Sin piso
+
+
+def test_rango_y_primeros_igual_a_sort():  # Índices vivos == sort completo tras altas, cambios, cambios de SKU y bajas
+    rnd = random.Random(16)  # Semilla
+    catalogo = CatalogoProductos(productos_aleatorios(3000, rnd))  # Catálogo (varios bloques con carga 1000)
+    for campo in CAMPOS_ORDENABLES:  # Los tres índices
+        catalogo.indice_ordenado(campo)  # Se crean y se suscriben
+    for ronda in range(4):  # Varias rondas
+        mutar(catalogo, rnd, 1500, 100000 + ronda * 10000)  # Cambios sueltos
+        skus = rnd.sample(list(catalogo.skus), 600)  # Selección grande (camino de reconstrucción)
+        ajustar_precios(catalogo, skus[:400], rnd.choice((-10, 0, 15)))  # Cambios masivos (0% = mismo valor, solo cambia el dict)
+        eliminar_productos(catalogo, skus[400:])  # Bajas masivas
+        for campo in CAMPOS_ORDENABLES:  # Cada índice
+            _comparar(catalogo, campo, rnd)  # Igual al sort
+
+
+def test_dict_modificado_en_el_lugar():  # Un dict cambiado en el lugar antes de avisar no rompe la baja ni el cambio
+    a, b = producto("AA", stock=1), producto("BB", stock=2)  # Productos
+    indice = IndiceOrdenado("stock", [a, b])  # Índice
+    a["stock"] = 9  # Cambio en el lugar (sin avisar)
+    indice.al_actualizar(a, a)  # Aviso con el mismo dict
+    assert indice.productos() == [b, a] and indice.rango(hasta=2) == [b]  # Se movió
+    b["stock"] = 50  # Otro cambio en el lugar
+    indice.al_eliminar(b)  # Baja con el dict ya cambiado
+    assert indice.productos() == [a] and len(indice) == 1  # Quitado igual
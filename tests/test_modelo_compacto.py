@@ -0,0 +1,51 @@
+import random  # Datos aleatorios
+
+from modulos.modelo_compacto import Producto, ColumnasProductos  # Registro con slots y almacén por columnas
+from modulos.funciones_utiles import ValorizacionInventario  # Valor del inventario de referencia
+from modulos.reportes import productos_bajo_stock, conteo_por_categoria  # Reportes de referencia
+from tests.datos import producto, productos_aleatorios  # Datos de prueba
+
+
+def _raros():  # Productos que no caben exactos en las columnas
+    return [
+        producto("AA", precio=10),  # Precio entero (debe volver como int)
+        producto("AB", creado_en="ayer"),  # Fecha con otro formato
+        producto("AC", extra=1),  # Clave extra
+        {"sku": "AD", "nombre": "sin fecha", "categoria": "Otro", "precio": 1.5, "stock": 2, "activo": True},  # Sin creado_en
+        producto("AE", categoria="Juguetes"),  # Categoría fuera de CATEGORIAS
+        producto("AF", stock=1 << 70),  # Stock fuera de 64 bits
+        producto("AG", creado_en="２０２６-01-01 10:00:00"),  # Dígitos no ASCII
+    ]
+
+
+def test_columnas_sin_perdida():  # Ida y vuelta a dicts devuelve exactamente lo cargado (valores, tipos y orden de claves)
+    rnd = random.Random(12)  # Semilla
+    productos = productos_aleatorios(500, rnd) + _raros() + productos_aleatorios(100, rnd, 500)  # Mezcla
+    columnas = ColumnasProductos(productos)  # Carga por tramos
+    assert len(columnas) == len(productos)  # Mismo tamaño
+    for original, copia in zip(productos, columnas.a_dicts()):  # Producto a producto
+        assert copia == original  # Mismos valores
+        assert list(copia) == list(original)  # Mismas claves en el mismo orden
+        assert [type(v) for v in copia.values()] == [type(v) for v in original.values()]  # Mismos tipos
+    uno_a_uno = ColumnasProductos()  # Misma carga con agregar
+    for p in productos:  # Uno a uno
+        uno_a_uno.agregar(p)  # Agregamos
+    assert uno_a_uno.a_dicts() == columnas.a_dicts()  # extender == agregar
+
+
+def test_producto_sin_perdida():  # Producto.desde_dict / a_dict conservan faltantes y extras
+    for original in productos_aleatorios(50, random.Random(4)) + _raros():  # Comunes y raros
+        assert Producto.desde_dict(original).a_dict() == original  # Ida y vuelta
+
+
+def test_reportes_iguales_a_dicts():  # Reportes sobre columnas == reportes sobre la lista de dicts
+    rnd = random.Random(8)  # Semilla
+    productos = productos_aleatorios(2000, rnd) + _raros()  # Con y sin camino rápido
+    columnas = ColumnasProductos(productos)  # Por columnas
+    referencia = ValorizacionInventario(productos)  # Valor de referencia
+    assert columnas.valor_inventario() == referencia.total  # Mismo total
+    assert columnas.valor_por_categoria() == referencia.por_categoria  # Mismos valores (y mismo orden)
+    assert list(columnas.valor_por_categoria()) == list(referencia.por_categoria)  # Orden de primera aparición
+    for umbral in (0, 5, 30):  # Varios umbrales
+        assert columnas.bajo_stock(umbral) == [p["sku"] for p in productos_bajo_stock(productos, umbral)]  # Mismos SKUs en orden
+    assert list(columnas.conteo_por_categoria().items()) == list(conteo_por_categoria(productos).items())  # Mismo conteo y orden
@@ -0,0 +1,91 @@
+import random  # Cambios aleatorios
+
+import pytest  # tmp_path y raises
+
+from modulos.gestion_datos import CatalogoProductos, ajustar_precios, eliminar_productos  # Catálogo con observadores y cambios masivos
+from modulos.persistencia_json import DiarioCambios, cargar_productos, guardar_productos, ruta_diario  # Foto + diario
+from tests.datos import producto, productos_aleatorios, mutar  # Datos de prueba
+
+
+def _abrir(ruta):  # Catálogo cargado del disco con su diario (como al iniciar la aplicación)
+    return DiarioCambios(CatalogoProductos(cargar_productos(ruta)), ruta)  # El diario se suscribe solo
+
+
+def test_diario_reproduce_los_cambios(tmp_path):  # Foto + diario reconstruyen el catálogo exacto
+    ruta = str(tmp_path / "productos.json")  # Archivo de prueba
+    rnd = random.Random(4)  # Semilla
+    guardar_productos(productos_aleatorios(200, rnd), ruta)  # Foto inicial
+    diario = _abrir(ruta)  # Instancia
+    for _ in range(4):  # Varias sincronizaciones
+        mutar(diario.catalogo, rnd, 150)  # Altas, cambios (incluso de SKU) y bajas
+        diario.sincronizar()  # Al diario
+    assert cargar_productos(ruta) == diario.catalogo.como_lista()  # Mismo contenido y orden
+
+
+def test_compactar_conserva_el_estado(tmp_path):  # La foto nueva incluye todo el diario y lo reemplaza
+    ruta = str(tmp_path / "productos.json")  # Archivo de prueba
+    rnd = random.Random(6)  # Semilla
+    guardar_productos(productos_aleatorios(100, rnd), ruta)  # Foto inicial
+    diario = _abrir(ruta)  # Instancia
+    mutar(diario.catalogo, rnd, 300)  # Cambios
+    diario.compactar()  # Foto completa (en este hilo)
+    assert cargar_productos(ruta) == diario.catalogo.como_lista()  # Nada se perdió
+    mutar(diario.catalogo, rnd, 50)  # Cambios después de compactar
+    diario.cerrar()  # Se escriben al diario nuevo
+    assert cargar_productos(ruta) == diario.catalogo.como_lista()  # Foto + diario nuevo
+
+
+def test_escritura_fallida_no_pierde_ni_repite_cambios(tmp_path, monkeypatch):  # Un error de disco deja el lote pendiente y no avanza la versión
+    ruta = str(tmp_path / "productos.json")  # Archivo de prueba
+    guardar_productos([producto("A"), producto("B")], ruta)  # Foto inicial
+    uno, otro = _abrir(ruta), _abrir(ruta)  # Dos instancias sobre los mismos archivos
+    otro.catalogo.actualizar("B", producto("B", stock=9))  # La otra escribe primero
+    otro.sincronizar()  # Al diario
+
+    uno.catalogo.agregar(producto("C"))  # Cambio propio
+    escribir = DiarioCambios._escribir_lote  # Escritura real
+
+    def falla(self, lote):  # Disco lleno en el primer intento
+        raise OSError("disco lleno")  # Antes de escribir nada
+
+    monkeypatch.setattr(DiarioCambios, "_escribir_lote", falla)  # Solo para el primer intento
+    version = uno.version  # Versión antes de fallar
+    with pytest.raises(OSError):  # El error llega al llamador
+        uno.sincronizar()  # Falla
+    assert uno.version == version and uno.hay_pendientes  # Nada avanzó y el lote sigue pendiente
+    assert uno.catalogo.obtener("B")["stock"] == 5  # Lo remoto leído no llegó al catálogo
+
+    monkeypatch.setattr(DiarioCambios, "_escribir_lote", escribir)  # El disco vuelve
+    assert uno.sincronizar() == []  # Reintento sin conflictos
+    assert uno.catalogo.obtener("B")["stock"] == 9  # Lo remoto se releyó y aplicó
+    esperado = [producto("A"), producto("B", stock=9), producto("C")]  # Estado final
+    assert cargar_productos(ruta) == esperado and uno.catalogo.como_lista() == esperado  # Sin líneas repetidas ni perdidas
+    with open(ruta_diario(ruta), encoding="utf-8") as f:  # Diario
+        versiones = [linea.split(",")[0] for linea in f]  # "{"v":N" de cada línea
+    assert len(versiones) == len(set(versiones))  # Cada versión aparece una vez
+
+
+def test_conflicto_entre_dos_instancias(tmp_path):  # Dos instancias cambian el mismo producto: gana lo guardado primero
+    ruta = str(tmp_path / "productos.json")  # Archivo de prueba
+    guardar_productos([producto("AA"), producto("BB")], ruta)  # Foto inicial
+    uno, otro = _abrir(ruta), _abrir(ruta)  # Dos instancias sobre los mismos archivos
+    uno.catalogo.actualizar("AA", producto("AA", stock=1))  # Cambio de la primera
+    otro.catalogo.actualizar("AA", producto("AA", stock=2))  # Mismo producto en la segunda
+    otro.catalogo.agregar(producto("CC"))  # Y un cambio sin conflicto
+    assert uno.sincronizar() == []  # La primera guarda sin problemas
+    assert otro.sincronizar() == ["AA"]  # La segunda se entera del conflicto
+    esperado = [producto("AA", stock=1), producto("BB"), producto("CC")]  # Gana lo guardado; lo demás se conserva
+    assert otro.catalogo.como_lista() == esperado and cargar_productos(ruta) == esperado  # Catálogo y disco iguales
+    assert uno.revisar() == ["CC"] and uno.catalogo.como_lista() == esperado  # La primera recibe el alta de la segunda
+
+
+def test_cambios_masivos_llegan_al_diario(tmp_path):  # Los avisos en lote anotan las mismas líneas que los sueltos
+    ruta = str(tmp_path / "productos.json")  # Archivo de prueba
+    rnd = random.Random(9)  # Semilla
+    guardar_productos(productos_aleatorios(300, rnd), ruta)  # Foto inicial
+    diario = _abrir(ruta)  # Instancia
+    skus = rnd.sample(list(diario.catalogo.skus), 200)  # Selección
+    ajustar_precios(diario.catalogo, skus[:120], -5)  # Un aviso
+    eliminar_productos(diario.catalogo, skus[120:])  # Otro aviso
+    assert diario.sincronizar() == []  # Al diario
+    assert cargar_productos(ruta) == diario.catalogo.como_lista()  # Foto + diario reconstruyen el catálogo
@@ -0,0 +1,50 @@
+from modulos.gestion_datos import CatalogoProductos, ajustar_stock, eliminar_productos  # Catálogo con observadores y cambios masivos
+from modulos.persistencia_sqlite import SincronizadorSQLite, cargar_productos, guardar_productos  # Base SQLite
+from tests.datos import producto  # Datos de prueba
+
+
+def _abrir(ruta):  # Catálogo cargado de la base con su sincronizador
+    return SincronizadorSQLite(CatalogoProductos(cargar_productos(ruta)), ruta)  # Se suscribe solo
+
+
+def test_cambios_llegan_a_la_base(tmp_path):  # Alta, cambio (incluso de SKU) y baja, en orden
+    ruta = str(tmp_path / "productos.db")  # Base de prueba
+    guardar_productos([producto("A"), producto("B"), producto("C")], ruta)  # Contenido inicial
+    sinc = _abrir(ruta)  # Instancia
+    sinc.catalogo.actualizar("A", producto("Z", stock=1))  # Cambio de SKU (conserva la posición)
+    sinc.catalogo.eliminar("B")  # Baja
+    sinc.catalogo.agregar(producto("D"))  # Alta
+    assert sinc.sincronizar() == []  # Sin conflictos
+    assert cargar_productos(ruta) == sinc.catalogo.como_lista() == [producto("Z", stock=1), producto("C"), producto("D")]  # Mismo orden
+    sinc.cerrar()  # Libera la base
+
+
+def test_cambio_de_sku_tomado_por_otra_instancia_es_conflicto(tmp_path):  # El UPDATE choca con el UNIQUE: no lanza, se informa y gana lo guardado
+    ruta = str(tmp_path / "productos.db")  # Base de prueba
+    guardar_productos([producto("A"), producto("B")], ruta)  # Contenido inicial
+    uno, otro = _abrir(ruta), _abrir(ruta)  # Dos instancias
+    otro.catalogo.agregar(producto("C", nombre="de la otra"))  # La otra guarda C primero
+    otro.sincronizar()  # COMMIT
+
+    assert uno.catalogo.actualizar("A", producto("C", stock=7))  # En nuestro catálogo C no existe: el cambio se acepta
+    uno.catalogo.actualizar("C", producto("C", stock=8))  # Otro cambio del mismo producto antes de sincronizar
+    uno.catalogo.actualizar("B", producto("B", stock=2))  # Cambio sin conflicto en la misma transacción
+    assert uno.hay_pendientes  # Queda algo por confirmar
+    assert uno.sincronizar() == ["C"]  # Conflicto informado
+    assert uno.catalogo.como_lista() == [producto("A"), producto("B", stock=2)]  # A vuelve con sus datos guardados y en su lugar
+    assert cargar_productos(ruta) == [producto("A"), producto("B", stock=2), producto("C", nombre="de la otra")]  # El resto se guardó; C de la otra intacto
+    assert not uno.hay_pendientes  # Resuelto
+    uno.cerrar()  # Libera la base
+    otro.cerrar()  # Libera la base
+
+
+def test_cambios_masivos_llegan_a_la_base(tmp_path):  # UPDATE y DELETE en lote (executemany)
+    ruta = str(tmp_path / "productos.db")  # Base de prueba
+    guardar_productos([producto(f"P{i:03d}") for i in range(50)], ruta)  # Contenido inicial
+    sinc = _abrir(ruta)  # Instancia
+    ajustar_stock(sinc.catalogo, [f"P{i:03d}" for i in range(0, 50, 2)], 3)  # Un aviso con 25 cambios
+    eliminar_productos(sinc.catalogo, [f"P{i:03d}" for i in range(1, 50, 4)])  # Un aviso con 13 bajas
+    assert sinc.sincronizar() == []  # Sin conflictos
+    assert cargar_productos(ruta) == sinc.catalogo.como_lista()  # Base y catálogo iguales
+    assert sinc.catalogo.obtener("P000")["stock"] == 8 and "P001" not in sinc.catalogo  # Cambios aplicados
+    sinc.cerrar()  # Libera la base
@@ -0,0 +1,44 @@
+import random  # Filas al azar
+
+from modulos.validaciones import validar_lote, validar_producto  # Por lote (importación) y por producto (formulario)
+
+_NOMBRES = ("", " ", "a", "ab", "  Jabón líquido  ", "Ñ", "MDF 15 mm")  # Vacíos, cortos y válidos
+_CATEGORIAS = ("Aseo", " Otro ", "Ferretería", "ferretería", "", "Juguetes")  # Válidas (con espacios) e inválidas
+_PRECIOS = ("10", " 1,5 ", "0", "-3", "abc", "", "2.75", 7, 3.5, None)  # Texto (con coma decimal), números y vacíos
+_STOCKS = ("5", " 0 ", "-1", "2.5", "x", "", 12, None)  # Texto, enteros y vacíos
+
+
+def _sku(i, rnd):  # SKU único por fila (válido o inválido)
+    return rnd.choice((f"SKU-{i}", f" sku_{i} ", f"S {i}", f"{i}" * 31, f"E{i % 20}", ""))  # Válidos, con espacio, largos, existentes y vacío
+
+
+def test_validar_lote_igual_a_validar_producto():  # Mismos productos válidos y mismos mensajes, fila a fila
+    rnd = random.Random(11)  # Semilla
+    existentes = {f"E{i}" for i in range(10)}  # Parte de los "E.." ya están en el catálogo
+    filas = [(_sku(i, rnd), rnd.choice(_NOMBRES), rnd.choice(_CATEGORIAS), rnd.choice(_PRECIOS), rnd.choice(_STOCKS), rnd.random() < 0.5) for i in range(3000)]  # Filas
+    unicas, vistos = [], set()  # Sin SKUs repetidos (validar_producto no ve las demás filas)
+    for f in filas:  # Cada fila
+        if f[0].strip() not in vistos:  # Primera vez
+            vistos.add(f[0].strip())  # Visto
+            unicas.append(f)  # Se compara
+    columnas = {c: [f[i] for f in unicas] for i, c in enumerate(("sku", "nombre", "categoria", "precio", "stock", "activo"))}  # Lote en columnas
+    validos, errores = validar_lote(columnas, existentes)  # Lote completo
+    por_fila = {fila: p for fila, p in validos}  # Fila → producto
+    errores_fila = {e["fila"]: e["errores"] for e in errores}  # Fila → mensajes
+    assert len(por_fila) + len(errores_fila) == len(unicas)  # Cada fila en un solo lado
+    for i, f in enumerate(unicas):  # Comparamos fila a fila
+        ok, producto, mensajes = validar_producto(*f, existentes)  # Formulario
+        if ok:  # Válida
+            assert {**por_fila[i], "creado_en": None} == {**producto, "creado_en": None}, f  # Mismo dict (salvo la hora)
+        else:  # Inválida
+            assert errores_fila[i] == mensajes, f  # Mismos mensajes en el mismo orden
+
+
+def test_validar_lote_detecta_repetidos_entre_lotes():  # vistos se comparte entre lotes del mismo archivo
+    vistos = {}  # SKU → fila
+    columnas = lambda skus: {"sku": skus, "nombre": ["ab"] * len(skus), "categoria": ["Aseo"] * len(skus), "precio": [1.0] * len(skus), "stock": [1] * len(skus)}  # Lote mínimo
+    validos, errores = validar_lote(columnas(["AA", "BB"]), set(), filas=[2, 3], vistos=vistos)  # Primer lote
+    assert [f for f, _ in validos] == [2, 3] and not errores  # Ambos válidos
+    validos, errores = validar_lote(columnas(["CC", "AA"]), set(), filas=[4, 5], vistos=vistos)  # Segundo lote
+    assert [f for f, _ in validos] == [4]  # Solo CC
+    assert errores == [{"fila": 5, "sku": "AA", "errores": ["SKU repetido (ya aparece en la fila 2)."]}]  # AA ya estaba